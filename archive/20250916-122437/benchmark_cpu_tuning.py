@@ -0,0 +1,222 @@
+"""
+Varredura de threads, afinidade e hints de CPU para encontrar a melhor configuração
+
+Para cada combinação de workers por máquina, threads intra-op, threads
+inter-op e (no OpenVINO) PERFORMANCE_HINT/streams, sobe os workers em
+processos próprios, com os núcleos divididos entre eles como no
+job_scheduler.py, e mede:
+
+- latência: segundos por imagem de cada worker
+- vazão: imagens por segundo somando todos os workers
+
+Ao final mostra a melhor configuração para latência (um job por vez) e
+para vazão (vários jobs por máquina), com os parâmetros de linha de comando
+correspondentes.
+
+Uso:
+  python benchmark_cpu_tuning.py
+  python benchmark_cpu_tuning.py --workers 1 2 4 --threads auto 4 --hints LATENCY THROUGHPUT
+  python benchmark_cpu_tuning.py --no-openvino --images 3 --steps 10
+"""
+
+import argparse
+import itertools
+import logging
+import multiprocessing as mp
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from config import Config
+from cpu_tuning import available_cpus, openvino_config, partition_cpus, resolve_affinity
+
+logger = logging.getLogger(__name__)
+
+def run_worker(options: Dict[str, Any], cpu_ids: List[int], barrier, result_queue):
+    """
+    Processo de um worker: aplica a configuração, carrega o modelo e gera as imagens
+
+    O barrier sincroniza o início da medida entre os workers, para que a
+    carga do modelo fique fora do tempo medido.
+    """
+    from cpu_tuning import apply_cpu_tuning
+    logging.basicConfig(level=logging.WARNING, format=Config.LOG_FORMAT)
+    try:
+        cpu = apply_cpu_tuning(options["threads"], options["interop_threads"], cpu_ids)
+
+        from stable_diffusion_pipeline import StableDiffusionVideoGenerator
+        generator = StableDiffusionVideoGenerator(
+            model_id=options["model"],
+            use_openvino=options["use_openvino"],
+            openvino_cache_dir=options["openvino_cache_dir"],
+            static_shape=(options["width"], options["height"]),
+            ov_config=openvino_config(options["hint"], options["streams"], cpu["intra_op_threads"])
+        )
+
+        def generate(index: int):
+            frames = generator.iter_video_frames(
+                initial_prompt=options["prompt"],
+                frame_prompts=[],
+                num_frames=1,
+                width=options["width"],
+                height=options["height"],
+                num_inference_steps=options["steps"],
+                seed=index
+            )
+            next(frames)
+
+        # Aquecimento fora da medida
+        generate(0)
+        barrier.wait()
+
+        start = time.perf_counter()
+        for index in range(options["images"]):
+            generate(index + 1)
+        elapsed = time.perf_counter() - start
+
+        generator.cleanup()
+        result_queue.put({"elapsed": elapsed, "threads": cpu["intra_op_threads"],
+                          "backend": "OpenVINO" if generator.is_openvino else "PyTorch"})
+    except Exception as e:
+        barrier.abort()
+        result_queue.put({"error": str(e)})
+
+def measure(options: Dict[str, Any], num_workers: int, cpus: List[int]) -> Optional[Dict[str, Any]]:
+    """
+    Mede uma configuração com num_workers processos simultâneos
+
+    Returns:
+        {"latency", "throughput", "threads", "backend"} ou None se falhar
+    """
+    context = mp.get_context("spawn")
+    barrier = context.Barrier(num_workers)
+    result_queue = context.Queue()
+    processes = [
+        context.Process(target=run_worker, args=(options, cpu_ids, barrier, result_queue))
+        for cpu_ids in partition_cpus(num_workers, cpus)
+    ]
+    for process in processes:
+        process.start()
+    results = [result_queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    errors = [result["error"] for result in results if "error" in result]
+    if errors:
+        logger.error(f"Configuração falhou: {errors[0]}")
+        return None
+
+    wall = max(result["elapsed"] for result in results)
+    return {
+        "latency": float(np.mean([result["elapsed"] for result in results])) / options["images"],
+        "throughput": num_workers * options["images"] / wall,
+        "threads": results[0]["threads"],
+        "backend": results[0]["backend"]
+    }
+
+def command_line(case: Dict[str, Any], use_openvino: bool) -> str:
+    """Parâmetros equivalentes de main.py / job_scheduler.py serve"""
+    parts = []
+    if case["workers"] > 1:
+        parts.append(f"--workers {case['workers']}")
+    parts.append(f"--threads {case['threads']}" if case["workers"] == 1
+                 else f"--threads-per-worker {case['threads']}")
+    if case["interop_threads"]:
+        parts.append(f"--interop-threads {case['interop_threads']}")
+    if use_openvino:
+        parts.append(f"--ov-hint {case['hint']}")
+        if case["streams"]:
+            parts.append(f"--ov-streams {case['streams']}")
+    return " ".join(parts)
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Varredura de configurações de CPU para inferência")
+    parser.add_argument("--model", type=str, default=Config.DEFAULT_MODEL, help="ID do modelo Stable Diffusion")
+    parser.add_argument("--no-openvino", action="store_true", help="Usar o pipeline PyTorch")
+    parser.add_argument("--openvino-cache-dir", type=str, default=Config.OPENVINO_CACHE_DIR,
+                        help="Cache do modelo OpenVINO exportado")
+    parser.add_argument("--prompt", type=str, default="a photograph of a lighthouse at dawn", help="Prompt")
+    parser.add_argument("--width", type=int, default=Config.DEFAULT_WIDTH, help="Largura das imagens")
+    parser.add_argument("--height", type=int, default=Config.DEFAULT_HEIGHT, help="Altura das imagens")
+    parser.add_argument("--steps", type=int, default=Config.DEFAULT_STEPS, help="Passos de inferência")
+    parser.add_argument("--images", type=int, default=2, help="Imagens medidas por worker")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2], help="Workers por máquina a testar")
+    parser.add_argument("--threads", type=str, nargs="+", default=["auto"],
+                        help="Threads intra-op por worker ('auto' = núcleos do bloco do worker)")
+    parser.add_argument("--interop-threads", type=int, nargs="+", default=[1], help="Threads inter-op a testar")
+    parser.add_argument("--hints", type=str, nargs="+", default=["LATENCY", "THROUGHPUT"],
+                        choices=["LATENCY", "THROUGHPUT"], help="PERFORMANCE_HINT do OpenVINO a testar")
+    parser.add_argument("--streams", type=int, nargs="+", default=[0],
+                        help="Streams do OpenVINO a testar (0 = escolhido pelo hint)")
+    parser.add_argument("--cpu-affinity", type=str, default=Config.CPU_AFFINITY,
+                        help="Núcleos usados na varredura: 'numa:N' ou lista de CPUs")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    use_openvino = not args.no_openvino
+    cpus = resolve_affinity(args.cpu_affinity) or available_cpus()
+    hints = args.hints if use_openvino else [None]
+    streams = args.streams if use_openvino else [0]
+
+    cases = []
+    for workers, threads, interop, hint, stream in itertools.product(
+            args.workers, args.threads, args.interop_threads, hints, streams):
+        if workers > len(cpus):
+            continue
+        block = len(partition_cpus(workers, cpus)[0])
+        cases.append({
+            "workers": workers,
+            "threads": block if threads == "auto" else int(threads),
+            "interop_threads": interop,
+            "hint": hint,
+            "streams": stream or None
+        })
+
+    print(f"{len(cpus)} núcleos, {args.width}x{args.height}, {args.steps} passos, "
+          f"{args.images} imagens por worker, {len(cases)} configurações")
+    print(f"{'workers':>7} {'threads':>7} {'inter-op':>8} {'hint':>10} {'streams':>7} "
+          f"{'s/imagem':>9} {'imagens/s':>10}")
+
+    results = []
+    for case in cases:
+        options = {
+            "model": args.model,
+            "use_openvino": use_openvino,
+            "openvino_cache_dir": args.openvino_cache_dir,
+            "prompt": args.prompt,
+            "width": args.width,
+            "height": args.height,
+            "steps": args.steps,
+            "images": args.images,
+            "threads": case["threads"],
+            "interop_threads": case["interop_threads"],
+            "hint": case["hint"],
+            "streams": case["streams"]
+        }
+        result = measure(options, case["workers"], cpus)
+        if result is None:
+            continue
+        results.append((case, result))
+        print(f"{case['workers']:>7} {case['threads']:>7} {case['interop_threads']:>8} "
+              f"{case['hint'] or '-':>10} {case['streams'] or 'auto':>7} "
+              f"{result['latency']:>9.2f} {result['throughput']:>10.3f}")
+
+    if not results:
+        logger.error("Nenhuma configuração concluída")
+        raise SystemExit(1)
+
+    best_latency = min(results, key=lambda item: item[1]["latency"])
+    best_throughput = max(results, key=lambda item: item[1]["throughput"])
+    print(f"\nMelhor latência ({best_latency[1]['latency']:.2f} s/imagem): "
+          f"{command_line(best_latency[0], use_openvino)}")
+    print(f"Melhor vazão ({best_throughput[1]['throughput']:.3f} imagens/s): "
+          f"{command_line(best_throughput[0], use_openvino)}")
+
+if __name__ == "__main__":
+    main()
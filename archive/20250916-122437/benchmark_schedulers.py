@@ -0,0 +1,130 @@
+"""
+Benchmark dos samplers: passos x latência x estabilidade entre frames
+
+Gera o mesmo vídeo curto (prompt, seed e strength fixos) com cada
+combinação sampler:passos e mede:
+
+- segundos por frame e speedup em relação ao primeiro caso
+- estabilidade: SSIM médio entre frames consecutivos (1.0 = sem mudança)
+  e diferença absoluta média entre frames consecutivos (cintilação, 0-255)
+
+Com poucos passos o vídeo fica mais rápido; a estabilidade mostra se a
+retroalimentação img2img continua coerente ou começa a cintilar.
+
+Uso:
+  python benchmark_schedulers.py
+  python benchmark_schedulers.py --cases dpmpp_2m:20 dpmpp_2m_karras:10 unipc:8 lcm:4 --frames 12
+  python benchmark_schedulers.py --model stabilityai/sd-turbo --cases turbo:1 turbo:2 turbo:4
+"""
+
+import argparse
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from benchmark_quantization import ssim
+from config import Config
+from schedulers import SCHEDULERS, recommended_settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASES = ["dpmpp_2m:20", "dpmpp_2m_karras:10", "unipc:10", "euler_a:20", "lcm:4"]
+
+def parse_case(text: str) -> Tuple[str, int, Optional[float]]:
+    """Converte 'sampler:passos[:guidance]' em (sampler, passos, guidance)"""
+    parts = text.split(":")
+    if len(parts) not in (2, 3) or parts[0] not in SCHEDULERS:
+        raise ValueError(f"Caso inválido: {text} (use sampler:passos[:guidance], samplers: {list(SCHEDULERS)})")
+    guidance = float(parts[2]) if len(parts) == 3 else None
+    return parts[0], int(parts[1]), guidance
+
+def run_case(generator, scheduler: str, steps: int, guidance: float, args) -> Dict[str, Any]:
+    """Gera o vídeo do benchmark com um sampler e mede latência e estabilidade"""
+    generator.set_scheduler(scheduler, args.lcm_lora)
+
+    frame_latencies: List[float] = []
+
+    def on_event(event):
+        if event["type"] == "frame":
+            frame_latencies.append(event["frame_latency"])
+
+    start = time.perf_counter()
+    frames = [np.array(frame.convert("RGB")) for frame in generator.iter_video_frames(
+        initial_prompt=args.prompt,
+        frame_prompts=[],
+        num_frames=args.frames,
+        width=args.width,
+        height=args.height,
+        strength=args.strength,
+        num_inference_steps=steps,
+        guidance_scale=guidance,
+        seed=args.seed,
+        progress_callback=on_event
+    )]
+    elapsed = time.perf_counter() - start
+
+    pairs = list(zip(frames, frames[1:]))
+    return {
+        "seconds_per_frame": elapsed / len(frames),
+        # Frames img2img (o primeiro é txt2img com todos os passos)
+        "img2img_latency": float(np.mean(frame_latencies[1:])) if len(frame_latencies) > 1 else float("nan"),
+        "stability": float(np.mean([ssim(a, b) for a, b in pairs])) if pairs else float("nan"),
+        "flicker": float(np.mean([np.abs(a.astype(np.int16) - b).mean() for a, b in pairs])) if pairs else 0.0
+    }
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark dos samplers: passos x latência x estabilidade")
+    parser.add_argument("--model", type=str, default=Config.DEFAULT_MODEL, help="ID do modelo Stable Diffusion")
+    parser.add_argument("--no-openvino", action="store_true", help="Usar o pipeline PyTorch")
+    parser.add_argument("--lcm-lora", type=str, default=Config.LCM_LORA, help="LoRA do sampler lcm")
+    parser.add_argument("--cases", type=str, nargs="+", default=DEFAULT_CASES,
+                        help="Casos sampler:passos[:guidance] (o primeiro é a referência do speedup)")
+    parser.add_argument("--prompt", type=str, default="a cozy cabin in a snowy forest, cinematic lighting",
+                        help="Prompt")
+    parser.add_argument("--frames", type=int, default=8, help="Frames por vídeo")
+    parser.add_argument("--width", type=int, default=Config.DEFAULT_WIDTH, help="Largura dos frames")
+    parser.add_argument("--height", type=int, default=Config.DEFAULT_HEIGHT, help="Altura dos frames")
+    parser.add_argument("--strength", type=float, default=0.5, help="Força do img2img entre frames")
+    parser.add_argument("--guidance", type=float, default=Config.DEFAULT_GUIDANCE,
+                        help="Orientação dos samplers sem valor recomendado")
+    parser.add_argument("--seed", type=int, default=42, help="Seed fixa")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.WARNING, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+    cases = [parse_case(case) for case in args.cases]
+
+    from stable_diffusion_pipeline import StableDiffusionVideoGenerator
+    generator = StableDiffusionVideoGenerator(model_id=args.model, use_openvino=not args.no_openvino)
+
+    # Aquecimento (alocações preguiçosas ficam fora da medida)
+    list(generator.iter_video_frames(args.prompt, [], num_frames=1, width=args.width, height=args.height,
+                                     num_inference_steps=2, seed=args.seed))
+
+    print(f"{args.frames} frames {args.width}x{args.height}, strength {args.strength}, seed {args.seed}")
+    print(f"{'sampler':<16} {'passos':>6} {'guidance':>8} {'s/frame':>8} {'img2img':>8} {'speedup':>8} "
+          f"{'SSIM seq':>9} {'cintilação':>11}")
+
+    baseline = None
+    for scheduler, steps, guidance in cases:
+        if guidance is None:
+            guidance = recommended_settings(scheduler).get("guidance", args.guidance)
+        try:
+            result = run_case(generator, scheduler, steps, guidance, args)
+        except Exception as e:
+            print(f"{scheduler:<16} {steps:>6} {guidance:>8.1f}  falhou: {e}")
+            continue
+        baseline = baseline or result["seconds_per_frame"]
+        print(f"{scheduler:<16} {steps:>6} {guidance:>8.1f} {result['seconds_per_frame']:>8.2f} "
+              f"{result['img2img_latency']:>8.2f} {baseline / result['seconds_per_frame']:>7.2f}x "
+              f"{result['stability']:>9.4f} {result['flicker']:>11.2f}")
+
+    generator.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Benchmark dos escritores de vídeo OpenCV: serial vs pipeline
+
+Compara o caminho serial (conversão PIL -> BGR e VideoWriter.write na mesma
+thread) com o PipelinedOpenCVWriter (conversão num pool de threads e uma
+thread de escrita em ordem), em frames por segundo.
+
+Com --producer-ms o benchmark simula o tempo de geração de cada frame
+(ex: a difusão), mostrando quanto da codificação fica escondido atrás dela.
+
+Uso:
+  python benchmark_video_writers.py --frames 120 --width 512 --height 512
+  python benchmark_video_writers.py --workers 1 2 4 --producer-ms 50
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from config import Config
+from video_creator import PipelinedOpenCVWriter, _frame_to_bgr
+
+logger = logging.getLogger(__name__)
+
+def make_frames(count: int, width: int, height: int, seed: int = 0) -> List[Image.Image]:
+    """Frames sintéticos: gradiente em movimento com ruído (difíceis de comprimir)"""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    frames = []
+    for i in range(count):
+        base = (x[None, :, None] + i * 4) % 256
+        noise = rng.normal(0, 12, (height, width, 3))
+        array = np.clip(base + noise, 0, 255).astype(np.uint8)
+        frames.append(Image.fromarray(array))
+    return frames
+
+def write_serial(frames: List[Image.Image], output_path: str, fps: int, producer_delay: float):
+    """Caminho serial original: converte e escreve cada frame na mesma thread"""
+    width, height = frames[0].size
+    out = cv2.VideoWriter(output_path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+    for frame in frames:
+        if producer_delay:
+            time.sleep(producer_delay)
+        out.write(_frame_to_bgr(frame, (width, height)))
+    out.release()
+
+def write_pipelined(workers: int) -> Callable:
+    """Escrita com PipelinedOpenCVWriter usando o número de threads dado"""
+    def run(frames: List[Image.Image], output_path: str, fps: int, producer_delay: float):
+        writer = PipelinedOpenCVWriter(output_path, fps=fps, workers=workers)
+        for frame in frames:
+            if producer_delay:
+                time.sleep(producer_delay)
+            writer.write(frame)
+        if not writer.close():
+            raise RuntimeError("Falha no PipelinedOpenCVWriter")
+    return run
+
+def measure(run: Callable, frames: List[Image.Image], fps: int, producer_delay: float, repeat: int) -> float:
+    """Melhor tempo (s) entre as repetições"""
+    best = float("inf")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "bench.mp4")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(frames, output_path, fps, producer_delay)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Benchmark dos escritores de vídeo OpenCV")
+    parser.add_argument("--frames", type=int, default=120, help="Número de frames")
+    parser.add_argument("--width", type=int, default=512, help="Largura dos frames")
+    parser.add_argument("--height", type=int, default=512, help="Altura dos frames")
+    parser.add_argument("--fps", type=int, default=24, help="FPS do vídeo")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Números de threads de conversão a testar")
+    parser.add_argument("--producer-ms", type=float, default=0.0,
+                        help="Tempo simulado de geração de cada frame (ms)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições (vale o melhor tempo)")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    frames = make_frames(args.frames, args.width, args.height)
+    producer_delay = args.producer_ms / 1000.0
+
+    cases = [("serial", write_serial)]
+    cases += [(f"pipeline ({workers} threads)", write_pipelined(workers)) for workers in args.workers]
+
+    print(f"{args.frames} frames {args.width}x{args.height}, geração simulada {args.producer_ms:.0f} ms/frame")
+    print(f"{'escritor':<24} {'tempo (s)':>10} {'frames/s':>10} {'speedup':>8}")
+
+    baseline = None
+    for name, run in cases:
+        elapsed = measure(run, frames, args.fps, producer_delay, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:<24} {elapsed:>10.2f} {args.frames / elapsed:>10.1f} {baseline / elapsed:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
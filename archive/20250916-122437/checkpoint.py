@@ -0,0 +1,176 @@
+"""
+Checkpoints da cadeia de geração de vídeo
+
+A geração é uma cadeia determinística: cada keyframe depende apenas do
+keyframe anterior (latentes ou imagem), da seed do frame (seed + índice) e
+do scheduler. Após cada keyframe o estado é gravado no diretório do job:
+
+  state.json            parâmetros (hash), scheduler e keyframes disponíveis
+  keyframe_00042.pt     latentes ou imagem do keyframe 42 + estado do RNG
+
+Uma execução interrompida retoma do último keyframe anterior ao primeiro
+frame que falta, produzindo exatamente os mesmos frames.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+import numpy as np
+import torch
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato dos arquivos mudar
+CHECKPOINT_FORMAT_VERSION = 1
+
+def params_hash(params: Dict[str, Any]) -> str:
+    """Hash estável dos parâmetros que determinam a cadeia de frames"""
+    payload = json.dumps(params, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def image_digest(image: Optional[Image.Image]) -> Optional[str]:
+    """Hash dos pixels de uma imagem (ex: init_image)"""
+    if image is None:
+        return None
+    return hashlib.sha256(image.convert("RGB").tobytes()).hexdigest()
+
+class GenerationCheckpoint:
+    """
+    Estado persistido da cadeia de keyframes de um job
+
+    Mantém os últimos `history` keyframes, para retomar mesmo quando o
+    consumidor (ex: SegmentedVideoWriter) só persistiu frames um pouco
+    anteriores ao último keyframe gerado.
+    """
+
+    STATE_NAME = "state.json"
+
+    def __init__(self, directory: str, history: int = 32):
+        """
+        Args:
+            directory: Diretório do checkpoint (um por job)
+            history: Número de keyframes mantidos em disco
+        """
+        self.directory = directory
+        self.history = max(1, history)
+        self.state_path = os.path.join(directory, self.STATE_NAME)
+        os.makedirs(directory, exist_ok=True)
+
+    def _keyframe_path(self, frame_index: int) -> str:
+        return os.path.join(self.directory, f"keyframe_{frame_index:05d}.pt")
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        """Conteúdo de state.json (None se não houver checkpoint)"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if state.get("version") != CHECKPOINT_FORMAT_VERSION:
+            logger.warning("Checkpoint em formato antigo ignorado")
+            return None
+        return state
+
+    def _save_state(self, state: Dict[str, Any]):
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(temp_path, self.state_path)
+
+    def begin(self, params_digest: str, scheduler_config: Dict[str, Any], resume: bool):
+        """
+        Prepara o diretório para uma execução
+
+        Args:
+            params_digest: Hash dos parâmetros do job
+            scheduler_config: Configuração do scheduler (com _class_name)
+            resume: Se False, descarta checkpoints anteriores
+        """
+        state = self.load_state() if resume else None
+        if state is not None and state["params"] != params_digest:
+            raise ValueError("Checkpoint incompatível: os parâmetros do job mudaram")
+
+        if state is None:
+            self.clear()
+            os.makedirs(self.directory, exist_ok=True)
+            state = {
+                "version": CHECKPOINT_FORMAT_VERSION,
+                "params": params_digest,
+                "scheduler": scheduler_config,
+                "keyframes": []
+            }
+            self._save_state(state)
+
+    def save_keyframe(self,
+                      frame_index: int,
+                      chain_state: Union[torch.Tensor, Image.Image],
+                      seed: Optional[int]):
+        """
+        Grava o estado da cadeia após gerar um keyframe
+
+        Args:
+            frame_index: Índice do keyframe no vídeo
+            chain_state: Latentes (modo latente) ou imagem PIL do keyframe
+            seed: Seed usada no keyframe
+        """
+        data = {
+            "frame_index": frame_index,
+            "seed": seed,
+            # Estado global do RNG (usado quando não há seed fixa)
+            "rng_state": torch.get_rng_state()
+        }
+        if isinstance(chain_state, torch.Tensor):
+            data["latents"] = chain_state.detach().cpu()
+        else:
+            data["image"] = torch.from_numpy(np.array(chain_state.convert("RGB")))
+
+        path = self._keyframe_path(frame_index)
+        temp_path = f"{path}.tmp"
+        torch.save(data, temp_path)
+        os.replace(temp_path, path)
+
+        state = self.load_state()
+        keyframes: List[int] = sorted(set(state["keyframes"] + [frame_index]))
+        for old in keyframes[:-self.history]:
+            try:
+                os.remove(self._keyframe_path(old))
+            except OSError:
+                pass
+        state["keyframes"] = keyframes[-self.history:]
+        self._save_state(state)
+
+    def load_keyframe(self, before_frame: int) -> Optional[Dict[str, Any]]:
+        """
+        Último keyframe gravado com índice menor que before_frame
+
+        Returns:
+            {"frame_index", "seed", "rng_state", "latents" ou "image" (PIL)}
+            ou None se não houver
+        """
+        state = self.load_state()
+        if state is None:
+            return None
+
+        for frame_index in sorted(state["keyframes"], reverse=True):
+            if frame_index >= before_frame:
+                continue
+            try:
+                data = torch.load(self._keyframe_path(frame_index))
+            except Exception as e:
+                logger.warning(f"Checkpoint do keyframe {frame_index} ilegível: {e}")
+                continue
+            if "image" in data:
+                data["image"] = Image.fromarray(data["image"].numpy())
+            return data
+
+        return None
+
+    def clear(self):
+        """Remove o checkpoint (ex: após o vídeo ser concluído)"""
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -18,17 +18,47 @@ class Config:
     DEFAULT_STEPS = 20
     DEFAULT_GUIDANCE = 7.5
     DEFAULT_STRENGTH = 0.7
+    # Passos reais por frame img2img (None: strength * DEFAULT_STEPS; ver step_plan.py)
+    EFFECTIVE_STEPS = None
+    # Imagens por passada da UNet em generate_images_batch
+    MAX_BATCH_SIZE = 4
+    
+    # Resoluções compiladas com forma estática no OpenVINO (largura, altura)
+    RESOLUTION_BUCKETS = [(256, 256), (512, 512), (768, 512), (512, 768), (768, 768)]
+    BUCKET_FIT = "crop"
+    # Quantização dos pesos (None ou "int8")
+    QUANTIZATION = None
+    # Sampler (ver schedulers.py) e LoRA do sampler 'lcm' (None: LCM-LoRA do SD 1.5)
+    SCHEDULER = "dpmpp_2m"
+    LCM_LORA = None
+    
+    # Configurações de CPU (None mantém o padrão do torch/OpenVINO)
+    INTRA_OP_THREADS = None
+    INTER_OP_THREADS = None
+    OV_PERFORMANCE_HINT = "LATENCY"
+    OV_NUM_STREAMS = None
+    # Afinidade: None, "numa:N" ou lista de CPUs ("0-7,16-23")
+    CPU_AFFINITY = None
     
     # Configurações de vídeo
     DEFAULT_FPS = 24
     DEFAULT_QUALITY = 8
-    DEFAULT_METHOD = "imageio"
+    DEFAULT_METHOD = "auto"
+    SEGMENT_FRAMES = 0
     
     # Configurações de diretórios
     FRAMES_DIR = "frames"
     OUTPUT_DIR = "output"
     TEMP_DIR = "temp"
     
+    # Configurações de cache
+    EMBEDDING_CACHE_DIR = "cache/embeddings"
+    EMBEDDING_CACHE_SIZE_MB = 512
+    ENCODER_CALIBRATION_FILE = "cache/encoder_calibration.json"
+    FRAME_CACHE_DIR = "cache/frames"
+    FRAME_CACHE_SIZE_MB = 4096
+    OPENVINO_CACHE_DIR = "cache/openvino"
+    
     # Configurações de logging
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -44,12 +74,31 @@ class Config:
             "steps": cls.DEFAULT_STEPS,
             "guidance": cls.DEFAULT_GUIDANCE,
             "strength": cls.DEFAULT_STRENGTH,
+            "effective_steps": cls.EFFECTIVE_STEPS,
+            "max_batch_size": cls.MAX_BATCH_SIZE,
+            "resolution_buckets": cls.RESOLUTION_BUCKETS,
+            "bucket_fit": cls.BUCKET_FIT,
+            "quantization": cls.QUANTIZATION,
+            "scheduler": cls.SCHEDULER,
+            "lcm_lora": cls.LCM_LORA,
+            "intra_op_threads": cls.INTRA_OP_THREADS,
+            "inter_op_threads": cls.INTER_OP_THREADS,
+            "ov_performance_hint": cls.OV_PERFORMANCE_HINT,
+            "ov_num_streams": cls.OV_NUM_STREAMS,
+            "cpu_affinity": cls.CPU_AFFINITY,
             "fps": cls.DEFAULT_FPS,
             "quality": cls.DEFAULT_QUALITY,
             "method": cls.DEFAULT_METHOD,
+            "segment_frames": cls.SEGMENT_FRAMES,
             "frames_dir": cls.FRAMES_DIR,
             "output_dir": cls.OUTPUT_DIR,
             "temp_dir": cls.TEMP_DIR,
+            "embedding_cache_dir": cls.EMBEDDING_CACHE_DIR,
+            "embedding_cache_size_mb": cls.EMBEDDING_CACHE_SIZE_MB,
+            "encoder_calibration_file": cls.ENCODER_CALIBRATION_FILE,
+            "frame_cache_dir": cls.FRAME_CACHE_DIR,
+            "frame_cache_size_mb": cls.FRAME_CACHE_SIZE_MB,
+            "openvino_cache_dir": cls.OPENVINO_CACHE_DIR,
             "log_level": cls.LOG_LEVEL,
             "log_format": cls.LOG_FORMAT
         }
@@ -92,8 +141,11 @@ class Config:
 
 # Configurações pré-definidas para diferentes tipos de vídeo
 PRESET_CONFIGS = {
+    # LCM com LCM-LoRA: 4 passos em vez de 20-30 (requer peft)
     "fast": {
-        "steps": 10,
+        "scheduler": "lcm",
+        "steps": 4,
+        "guidance": 1.0,
         "strength": 0.5,
         "fps": 30,
         "quality": 6
@@ -107,6 +159,7 @@ PRESET_CONFIGS = {
     },
     
     "high_quality": {
+        "scheduler": "dpmpp_2m_karras",
         "steps": 30,
         "strength": 0.6,
         "fps": 24,
@@ -126,6 +179,16 @@ PRESET_CONFIGS = {
         "strength": 0.6,
         "fps": 12,
         "quality": 8
+    },
+    
+    # Apenas com modelos Turbo (ex: --model stabilityai/sd-turbo)
+    "turbo": {
+        "scheduler": "turbo",
+        "steps": 2,
+        "guidance": 0.0,
+        "strength": 0.5,
+        "fps": 24,
+        "quality": 8
     }
 }
 
@@ -0,0 +1,85 @@
+"""
+Fixtures compartilhadas dos testes
+
+FakeGenerator roda a cadeia de frames de StableDiffusionVideoGenerator
+(iter_video_frames: cache de frames, checkpoint, keyframes, interpolação)
+sem modelo: as "difusões" são latentes determinísticos derivados do prompt,
+da seed e do frame anterior, e cada chamada fica registrada.
+"""
+
+import json
+import zlib
+
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+
+from frame_cache import FrameCache
+from stable_diffusion_pipeline import StableDiffusionVideoGenerator
+
+class FakeGenerator(StableDiffusionVideoGenerator):
+    """Gerador sem modelo para testar a cadeia de frames"""
+
+    def __init__(self, frame_cache_dir=None):
+        self.model_id = "fake-model"
+        self.quantization = None
+        self.lora = None
+        self.is_openvino = False
+        self.resolution_buckets = []
+        self.bucket_fit = "crop"
+        self.frame_cache = FrameCache(frame_cache_dir) if frame_cache_dir else None
+        self._progress = None
+        # (método, prompt, seed) de cada difusão
+        self.calls = []
+
+    def scheduler_config(self):
+        return {"_class_name": "FakeScheduler"}
+
+    def _restore_scheduler(self, config):
+        pass
+
+    def _diffuse(self, method, previous, prompt, seed, width=64, height=64):
+        self.calls.append((method, prompt, seed))
+        digest = zlib.crc32(json.dumps(prompt, sort_keys=True).encode("utf-8"))
+        generator = torch.Generator().manual_seed(digest + seed) if seed is not None else None
+        noise = torch.randn((1, 4, height // 8, width // 8), generator=generator)
+        return noise if previous is None else 0.5 * previous + 0.5 * noise
+
+    def generate_initial_latents(self, prompt, negative_prompt="", width=512, height=512,
+                                 num_inference_steps=20, guidance_scale=7.5, seed=None):
+        return self._diffuse("txt2img", None, prompt, seed, width, height)
+
+    def generate_next_latents(self, previous_latents, prompt, negative_prompt="", strength=0.7,
+                              num_inference_steps=20, guidance_scale=7.5, seed=None):
+        if isinstance(previous_latents, Image.Image):
+            previous_latents = self.encode_image(previous_latents)
+        return self._diffuse("img2img", previous_latents, prompt, seed)
+
+    def generate_initial_image(self, prompt, negative_prompt="", width=512, height=512,
+                               num_inference_steps=20, guidance_scale=7.5, seed=None):
+        return self.decode_latents(self.generate_initial_latents(prompt, negative_prompt, width, height,
+                                                                 num_inference_steps, guidance_scale, seed))
+
+    def generate_next_frame(self, previous_image, prompt, negative_prompt="", strength=0.7,
+                            num_inference_steps=20, guidance_scale=7.5, seed=None):
+        return self.decode_latents(self.generate_next_latents(previous_image, prompt, negative_prompt, strength,
+                                                              num_inference_steps, guidance_scale, seed))
+
+    @staticmethod
+    def encode_image(image):
+        array = np.asarray(image.convert("RGB"), dtype=np.float32)[::8, ::8] / 127.5 - 1.0
+        latents = torch.from_numpy(array).permute(2, 0, 1).unsqueeze(0)
+        return torch.cat([latents, latents[:, :1]], dim=1)
+
+    def decode_latents(self, latents):
+        pixels = ((latents[0, :3].clamp(-1, 1) + 1) * 127.5).round().to(torch.uint8)
+        image = Image.fromarray(pixels.permute(1, 2, 0).numpy())
+        return image.resize((image.width * 8, image.height * 8), Image.NEAREST)
+
+@pytest.fixture
+def fake_generator(tmp_path):
+    """Fábrica de FakeGenerator (frame_cache=True usa um cache em tmp_path)"""
+    def make(frame_cache=False):
+        return FakeGenerator(str(tmp_path / "frame_cache") if frame_cache else None)
+    return make
@@ -0,0 +1,204 @@
+"""
+Ajuste de threads e afinidade de núcleos para inferência em CPU
+
+Sem ajuste, o torch e o OpenVINO usam todos os núcleos visíveis: vários
+jobs na mesma máquina disputam os mesmos núcleos (oversubscription), e um
+pool grande de threads num processo que só tem alguns núcleos perde tempo
+em sincronização. Este módulo reúne:
+
+- threads intra-op (paralelismo dentro de cada operador) e inter-op
+  (operadores independentes em paralelo) do torch
+- afinidade de núcleos do processo: lista de CPUs ('0-7,16-23') ou um nó
+  NUMA inteiro ('numa:1')
+- configuração de compilação do OpenVINO: PERFORMANCE_HINT (LATENCY ou
+  THROUGHPUT), NUM_STREAMS e INFERENCE_NUM_THREADS
+- divisão dos núcleos entre workers, respeitando os nós NUMA
+
+Para achar a melhor combinação numa máquina: benchmark_cpu_tuning.py.
+"""
+
+import glob
+import os
+import re
+from typing import Any, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+PERFORMANCE_HINTS = ("LATENCY", "THROUGHPUT")
+
+def parse_cpu_list(text: str) -> List[int]:
+    """Converte uma lista de CPUs no formato do Linux ('0-3,8,10-11') em índices"""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        match = re.fullmatch(r"(\d+)(?:-(\d+))?", part.strip())
+        if not match:
+            raise ValueError(f"Lista de CPUs inválida: {text} (use ex: 0-3,8,10-11)")
+        first = int(match.group(1))
+        last = int(match.group(2) or first)
+        if last < first:
+            raise ValueError(f"Intervalo de CPUs invertido: {part.strip()} (use ex: 0-3)")
+        cpus.extend(range(first, last + 1))
+    return sorted(set(cpus))
+
+def available_cpus() -> List[int]:
+    """Núcleos que o processo atual pode usar"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def numa_nodes() -> Dict[int, List[int]]:
+    """
+    Núcleos de cada nó NUMA (Linux, via /sys)
+
+    Returns:
+        {nó: [núcleos]}; um único nó com todos os núcleos quando a
+        topologia não está disponível
+    """
+    nodes = {}
+    for path in glob.glob("/sys/devices/system/node/node[0-9]*/cpulist"):
+        node = int(re.search(r"node(\d+)", path).group(1))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cpus = parse_cpu_list(f.read())
+        except (OSError, ValueError):
+            continue
+        if cpus:
+            nodes[node] = cpus
+    return nodes or {0: list(range(os.cpu_count() or 1))}
+
+def resolve_affinity(spec: Optional[str]) -> Optional[List[int]]:
+    """
+    Converte uma especificação de afinidade em lista de núcleos
+
+    Args:
+        spec: None/'none' (sem afinidade), 'numa:N' (todos os núcleos do nó
+            N) ou uma lista de CPUs ('0-7,16-23')
+
+    Returns:
+        Núcleos ou None
+    """
+    if not spec or spec.lower() == "none":
+        return None
+
+    if spec.lower().startswith("numa:"):
+        node = int(spec.split(":", 1)[1])
+        nodes = numa_nodes()
+        if node not in nodes:
+            raise ValueError(f"Nó NUMA {node} não existe. Disponíveis: {sorted(nodes)}")
+        return nodes[node]
+
+    return parse_cpu_list(spec)
+
+def partition_cpus(num_workers: int, cpus: Optional[List[int]] = None) -> List[List[int]]:
+    """
+    Divide os núcleos disponíveis em blocos contíguos, um por worker
+
+    Núcleos vizinhos costumam estar no mesmo socket/nó NUMA, então blocos
+    contíguos evitam que um worker se espalhe entre sockets. Com vários nós
+    NUMA e pelo menos um worker por nó, os workers são distribuídos entre os
+    nós e nenhum bloco cruza a fronteira de um nó.
+
+    Args:
+        num_workers: Número de workers
+        cpus: Núcleos disponíveis (padrão: afinidade do processo atual)
+
+    Returns:
+        Lista com a lista de núcleos de cada worker
+    """
+    if cpus is None:
+        cpus = available_cpus()
+
+    num_workers = max(1, num_workers)
+    allowed = set(cpus)
+    nodes = [node_cpus for node_cpus in
+             ([cpu for cpu in node if cpu in allowed] for node in numa_nodes().values()) if node_cpus]
+
+    if len(nodes) > 1 and num_workers >= len(nodes):
+        blocks = []
+        for index, node_cpus in enumerate(nodes):
+            # Workers restantes vão para os primeiros nós
+            node_workers = num_workers // len(nodes) + (1 if index < num_workers % len(nodes) else 0)
+            blocks.extend(partition_cpus(node_workers, node_cpus) if node_workers else [])
+        return blocks
+
+    chunk = max(1, len(cpus) // num_workers)
+    return [cpus[i * chunk:(i + 1) * chunk] or cpus for i in range(num_workers)]
+
+def apply_cpu_tuning(intra_op_threads: Optional[int] = None,
+                     inter_op_threads: Optional[int] = None,
+                     cpu_ids: Optional[List[int]] = None) -> Dict[str, Any]:
+    """
+    Aplica afinidade e número de threads ao processo atual
+
+    Deve ser chamada no início do processo, antes da primeira inferência
+    (o pool inter-op do torch só pode ser definido uma vez).
+
+    Args:
+        intra_op_threads: Threads por operador (None: um por núcleo da afinidade)
+        inter_op_threads: Threads para operadores independentes (None: padrão do torch)
+        cpu_ids: Núcleos aos quais fixar o processo (None: não altera)
+
+    Returns:
+        Configuração efetiva: {"cpus", "intra_op_threads", "inter_op_threads"}
+    """
+    if cpu_ids:
+        if hasattr(os, "sched_setaffinity"):
+            try:
+                os.sched_setaffinity(0, cpu_ids)
+            except OSError as e:
+                logger.warning(f"Não foi possível fixar afinidade de núcleos: {e}")
+        else:
+            logger.warning("Afinidade de núcleos não suportada nesta plataforma")
+
+    cpus = available_cpus()
+    intra_op_threads = intra_op_threads or len(cpus)
+
+    # Bibliotecas OpenMP/MKL carregadas depois desta chamada respeitam o limite
+    os.environ["OMP_NUM_THREADS"] = str(intra_op_threads)
+    os.environ["MKL_NUM_THREADS"] = str(intra_op_threads)
+
+    import torch
+    torch.set_num_threads(intra_op_threads)
+    if inter_op_threads:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            # Já definido (ou já usado) neste processo
+            logger.debug("Threads inter-op já definidas neste processo")
+
+    return {
+        "cpus": cpus,
+        "intra_op_threads": intra_op_threads,
+        "inter_op_threads": torch.get_num_interop_threads()
+    }
+
+def openvino_config(performance_hint: Optional[str] = None,
+                    num_streams: Optional[int] = None,
+                    inference_threads: Optional[int] = None) -> Dict[str, str]:
+    """
+    Propriedades de compilação do OpenVINO (ov_config do optimum-intel)
+
+    Args:
+        performance_hint: 'LATENCY' (um pedido por vez o mais rápido
+            possível) ou 'THROUGHPUT' (vários pedidos simultâneos)
+        num_streams: Streams de inferência (None: escolhido pelo hint)
+        inference_threads: Threads do plugin de CPU (None: todos os núcleos
+            da afinidade)
+
+    Returns:
+        Dicionário de propriedades (valores como string)
+    """
+    config = {}
+    if performance_hint:
+        hint = performance_hint.upper()
+        if hint not in PERFORMANCE_HINTS:
+            raise ValueError(f"PERFORMANCE_HINT inválido: {performance_hint}. Disponíveis: {PERFORMANCE_HINTS}")
+        config["PERFORMANCE_HINT"] = hint
+    if num_streams:
+        config["NUM_STREAMS"] = str(num_streams)
+    if inference_threads:
+        config["INFERENCE_NUM_THREADS"] = str(inference_threads)
+    return config
@@ -0,0 +1,281 @@
+"""
+Seleção automática do codificador de vídeo (método 'auto')
+
+Na primeira vez que uma resolução/qualidade é usada nesta máquina, um clipe
+sintético curto é codificado com cada candidato (OpenCV, imageio e FFmpeg
+com presets do libx264), medindo velocidade (frames/s), qualidade (PSNR
+em relação aos frames originais) e bitrate. As medidas ficam em cache num
+JSON por máquina; a escolha é o candidato mais rápido que atinge o PSNR
+mínimo da qualidade pedida (e, opcionalmente, um bitrate máximo).
+
+Uso (calibrar/inspecionar manualmente):
+  python encoder_selection.py --width 512 --height 512 --quality 8
+  python encoder_selection.py --width 768 --height 768 --force
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import imageio
+import numpy as np
+from PIL import Image
+
+from config import Config
+from video_creator import StreamingVideoWriter
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato do cache ou os candidatos mudarem
+CALIBRATION_VERSION = 1
+
+# Candidatos, do mais simples ao mais eficiente em compressão
+ENCODER_CANDIDATES = [
+    {"name": "opencv", "method": "opencv"},
+    {"name": "imageio", "method": "imageio"},
+    {"name": "ffmpeg-ultrafast", "method": "ffmpeg", "preset": "ultrafast"},
+    {"name": "ffmpeg-veryfast", "method": "ffmpeg", "preset": "veryfast"},
+    {"name": "ffmpeg-medium", "method": "ffmpeg", "preset": "medium"}
+]
+
+CALIBRATION_FRAMES = 24
+
+# Sem bitrate máximo explícito, aceitar até este múltiplo do candidato mais
+# econômico que atinge a qualidade (evita trocar poucos ms por arquivos 3x maiores)
+DEFAULT_BITRATE_FACTOR = 2.0
+
+# Serializa calibrações concorrentes no mesmo processo
+_calibration_lock = threading.Lock()
+
+def min_psnr_for_quality(quality: int) -> float:
+    """PSNR mínimo (dB) exigido para uma qualidade 1-10 (10 -> 40 dB, 8 -> 36 dB)"""
+    return 20.0 + 2.0 * max(1, min(10, quality))
+
+def host_id() -> str:
+    """Identifica a máquina (a calibração de outra máquina não vale aqui)"""
+    return f"{platform.node()}|{platform.machine()}|{os.cpu_count()}"
+
+def make_calibration_frames(width: int, height: int, count: int = CALIBRATION_FRAMES) -> List[Image.Image]:
+    """
+    Clipe sintético com textura e movimento suaves, parecido com frames do SD
+
+    Gradientes e formas em movimento com ruído leve: nem trivial de
+    comprimir (como uma cor sólida) nem ruído puro.
+    """
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    frames = []
+    for i in range(count):
+        shift = i * 3.0
+        red = 128 + 100 * np.sin((x + shift) / 37.0)
+        green = 128 + 100 * np.cos((y - shift) / 53.0)
+        blue = 128 + 80 * np.sin((x + y + 2 * shift) / 71.0)
+        image = np.stack([red, green, blue], axis=-1)
+        image += rng.normal(0, 1.5, image.shape)
+        frames.append(Image.fromarray(np.clip(image, 0, 255).astype(np.uint8)))
+    return frames
+
+def _psnr(reference: List[np.ndarray], decoded: List[np.ndarray]) -> float:
+    """PSNR médio (dB) entre duas sequências de frames"""
+    count = min(len(reference), len(decoded))
+    if count == 0:
+        return 0.0
+    mse = np.mean([
+        np.mean((reference[i].astype(np.float32) - decoded[i].astype(np.float32)) ** 2)
+        for i in range(count)
+    ])
+    return float("inf") if mse == 0 else float(10 * np.log10(255.0 ** 2 / mse))
+
+def measure_candidate(candidate: Dict[str, Any],
+                      frames: List[Image.Image],
+                      fps: int,
+                      quality: int) -> Dict[str, Any]:
+    """
+    Codifica o clipe de calibração com um candidato e mede o resultado
+
+    Returns:
+        {"fps": frames/s de codificação, "psnr": dB, "bitrate_kbps": kbps}
+        ou {"error": mensagem} se o candidato falhar nesta máquina
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, "calibration.mp4")
+        try:
+            start = time.perf_counter()
+            with StreamingVideoWriter(output_path, fps=fps, quality=quality,
+                                      method=candidate["method"],
+                                      preset=candidate.get("preset", "medium")) as writer:
+                for frame in frames:
+                    writer.write(frame)
+            success = writer.close()
+            elapsed = time.perf_counter() - start
+
+            if not success or not os.path.exists(output_path):
+                return {"error": "falha na codificação"}
+
+            decoded = [np.asarray(frame) for frame in imageio.mimread(output_path, memtest=False)]
+            reference = [np.asarray(frame) for frame in frames]
+            duration = len(frames) / fps
+
+            return {
+                "fps": round(len(frames) / elapsed, 1),
+                "psnr": round(_psnr(reference, decoded), 2),
+                "bitrate_kbps": round(os.path.getsize(output_path) * 8 / 1000 / duration, 1)
+            }
+        except Exception as e:
+            return {"error": str(e)}
+
+class EncoderCalibration:
+    """
+    Cache por máquina das medidas de cada codificador, por resolução/qualidade
+
+    O arquivo guarda as medidas (não apenas a escolha), então mudar o
+    bitrate máximo não exige recalibrar.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None):
+        """
+        Args:
+            cache_path: Arquivo JSON do cache (padrão: Config.ENCODER_CALIBRATION_FILE)
+        """
+        self.cache_path = cache_path or Config.ENCODER_CALIBRATION_FILE
+
+    @staticmethod
+    def make_key(width: int, height: int, fps: int, quality: int) -> str:
+        return f"{width}x{height}@{fps}fps/q{quality}"
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get("version") != CALIBRATION_VERSION or data.get("host") != host_id():
+            return {}
+        return data.get("entries", {})
+
+    def _save(self, entries: Dict[str, Any]):
+        directory = os.path.dirname(self.cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": CALIBRATION_VERSION, "host": host_id(), "entries": entries}, f, indent=2)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar calibração de codificadores: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def calibrate(self, width: int, height: int, fps: int, quality: int,
+                  force: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Medidas de todos os candidatos para a resolução/qualidade dadas
+
+        Args:
+            force: Recalibrar mesmo se já houver medidas em cache
+
+        Returns:
+            Dicionário nome do candidato -> medidas
+        """
+        key = self.make_key(width, height, fps, quality)
+
+        with _calibration_lock:
+            entries = self._load()
+            if key in entries and not force:
+                return entries[key]
+
+            logger.info(f"Calibrando codificadores para {key} (uma vez por máquina)...")
+            frames = make_calibration_frames(width, height)
+            results = {}
+            for candidate in ENCODER_CANDIDATES:
+                results[candidate["name"]] = measure_candidate(candidate, frames, fps, quality)
+                logger.info(f"  {candidate['name']}: {results[candidate['name']]}")
+
+            # Recarregar antes de salvar para não perder calibrações de outros processos
+            entries = self._load()
+            entries[key] = results
+            self._save(entries)
+            return results
+
+    def select(self, width: int, height: int, fps: int, quality: int,
+               max_bitrate_kbps: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Escolhe o candidato mais rápido que atende à qualidade e ao bitrate
+
+        O bitrate máximo padrão é DEFAULT_BITRATE_FACTOR vezes o do candidato
+        mais econômico que atinge a qualidade. Se nenhum atingir a qualidade,
+        usa o de maior PSNR.
+
+        Returns:
+            Candidato escolhido com as medidas ({"name", "method", "preset"?, "fps", "psnr", ...})
+        """
+        results = self.calibrate(width, height, fps, quality)
+        min_psnr = min_psnr_for_quality(quality)
+
+        measured = [dict(candidate, **results[candidate["name"]])
+                    for candidate in ENCODER_CANDIDATES
+                    if "error" not in results.get(candidate["name"], {"error": None})]
+        if not measured:
+            logger.warning("Nenhum codificador funcionou na calibração, usando imageio")
+            return {"name": "imageio", "method": "imageio"}
+
+        eligible = [c for c in measured if c["psnr"] >= min_psnr]
+        if eligible and max_bitrate_kbps is None:
+            max_bitrate_kbps = DEFAULT_BITRATE_FACTOR * min(c["bitrate_kbps"] for c in eligible)
+        if max_bitrate_kbps is not None:
+            eligible = [c for c in eligible if c["bitrate_kbps"] <= max_bitrate_kbps]
+
+        if eligible:
+            choice = max(eligible, key=lambda c: c["fps"])
+        else:
+            choice = max(measured, key=lambda c: c["psnr"])
+            logger.warning(f"Nenhum codificador atinge {min_psnr:.0f} dB; usando o de maior PSNR")
+
+        logger.info(f"Codificador escolhido: {choice['name']} "
+                    f"({choice['fps']} frames/s, {choice['psnr']} dB, {choice['bitrate_kbps']} kbps)")
+        return choice
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Calibração dos codificadores de vídeo desta máquina")
+    parser.add_argument("--width", type=int, default=Config.DEFAULT_WIDTH, help="Largura dos frames")
+    parser.add_argument("--height", type=int, default=Config.DEFAULT_HEIGHT, help="Altura dos frames")
+    parser.add_argument("--fps", type=int, default=Config.DEFAULT_FPS, help="FPS do vídeo")
+    parser.add_argument("--quality", type=int, default=Config.DEFAULT_QUALITY, help="Qualidade do vídeo (1-10)")
+    parser.add_argument("--max-bitrate", type=float, default=None,
+                        help=f"Bitrate máximo aceito em kbps (padrão: {DEFAULT_BITRATE_FACTOR}x o mais econômico)")
+    parser.add_argument("--cache", type=str, default=Config.ENCODER_CALIBRATION_FILE, help="Arquivo de calibração")
+    parser.add_argument("--force", action="store_true", help="Recalibrar mesmo com cache")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    calibration = EncoderCalibration(args.cache)
+    results = calibration.calibrate(args.width, args.height, args.fps, args.quality, force=args.force)
+
+    print(f"{args.width}x{args.height}, {args.fps} fps, qualidade {args.quality} "
+          f"(PSNR mínimo {min_psnr_for_quality(args.quality):.0f} dB)")
+    print(f"{'codificador':<18} {'frames/s':>9} {'PSNR (dB)':>10} {'kbps':>9}")
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<18} erro: {result['error']}")
+        else:
+            print(f"{name:<18} {result['fps']:>9.1f} {result['psnr']:>10.2f} {result['bitrate_kbps']:>9.1f}")
+
+    choice = calibration.select(args.width, args.height, args.fps, args.quality, args.max_bitrate)
+    print(f"Escolha: {choice['name']}")
+
+if __name__ == "__main__":
+    main()
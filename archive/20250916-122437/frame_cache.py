@@ -0,0 +1,256 @@
+"""
+Cache em disco de frames gerados e vídeos codificados, endereçado por conteúdo
+
+A chave de uma entrada é o hash dos parâmetros que determinam o resultado
+(hash dos pixels da imagem de entrada, model_id, scheduler, prompts,
+strength, passos, guidance, seed...). Como a geração com seed fixa é
+determinística, pedidos idênticos reaproveitam o resultado em vez de
+recalculá-lo.
+
+Os frames são guardados por segmento de keyframe: o segmento j contém os
+frames depois do keyframe j-1 até o keyframe j (inclusive) e, no modo
+latente, os latentes do keyframe j. A chave do segmento j encadeia a do
+segmento j-1 com o índice e o prompt do keyframe j (ver chain_keys), então
+as chaves de um job formam um caminho numa trie: jobs que só diferem nos
+prompts finais compartilham os segmentos iniciais.
+
+  frames/<chave>/00000.png ...   frames de um segmento (PNG, sem perdas)
+  frames/<chave>/latents.pt      latentes do keyframe (modo latente)
+  videos/<chave>.mp4             vídeo já codificado
+
+As entradas são gravadas num diretório/arquivo temporário e renomeadas ao
+final (nunca há entrada pela metade). Quando o cache passa do tamanho
+máximo, as entradas usadas há mais tempo são removidas.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+import logging
+
+import torch
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato das entradas mudar
+CACHE_FORMAT_VERSION = 2
+
+class FrameCache:
+    """
+    Cache LRU em disco de frames e vídeos, compartilhável entre processos
+
+    O uso de uma entrada atualiza seu mtime; a remoção segue do mtime mais
+    antigo para o mais recente.
+    """
+
+    def __init__(self, cache_dir: str, max_disk_mb: int = 4096):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir: Diretório do cache
+            max_disk_mb: Tamanho máximo do cache em disco (MB)
+        """
+        self.cache_dir = cache_dir
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self.frames_dir = os.path.join(cache_dir, "frames")
+        self.videos_dir = os.path.join(cache_dir, "videos")
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.frames_dir, exist_ok=True)
+        os.makedirs(self.videos_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(params: Dict[str, Any]) -> str:
+        """Gera a chave (hash) de uma entrada a partir dos seus parâmetros"""
+        payload = json.dumps({"version": CACHE_FORMAT_VERSION, "params": params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def chain_keys(cls, base_params: Dict[str, Any], keyframes: Sequence[int],
+                   prompts: Sequence[str]) -> List[str]:
+        """
+        Chaves encadeadas dos segmentos de keyframe de um job
+
+        Args:
+            base_params: Parâmetros comuns a todos os frames (modelo, seed, ...)
+            keyframes: Índices dos keyframes
+            prompts: Prompt usado em cada keyframe
+
+        Returns:
+            Uma chave por keyframe; a chave j depende de todo o prefixo até j
+        """
+        keys = []
+        parent = cls.make_key(base_params)
+        for frame_index, prompt in zip(keyframes, prompts):
+            parent = cls.make_key({"parent": parent, "frame": frame_index, "prompt": prompt})
+            keys.append(parent)
+        return keys
+
+    def _frames_path(self, key: str) -> str:
+        return os.path.join(self.frames_dir, key)
+
+    def _video_path(self, key: str) -> str:
+        return os.path.join(self.videos_dir, f"{key}.mp4")
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def has_segment(self, key: str) -> bool:
+        """Se o segmento está em cache (sem contar como uso)"""
+        return os.path.isdir(self._frames_path(key))
+
+    def prefix_length(self, keys: Sequence[str]) -> int:
+        """Número de segmentos iniciais de keys disponíveis em sequência"""
+        for count, key in enumerate(keys):
+            if not self.has_segment(key):
+                return count
+        return len(keys)
+
+    def get_segment(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Carrega um segmento de keyframe
+
+        Returns:
+            {"frames": [imagens PIL], "latents": tensor ou None} ou None se
+            não estiver em cache
+        """
+        path = self._frames_path(key)
+        try:
+            names = sorted(name for name in os.listdir(path) if name.endswith(".png"))
+            frames = []
+            for name in names:
+                with Image.open(os.path.join(path, name)) as image:
+                    frames.append(image.convert("RGB"))
+            latents_path = os.path.join(path, "latents.pt")
+            latents = torch.load(latents_path) if os.path.exists(latents_path) else None
+            # Atualizar mtime para a política LRU
+            os.utime(path, None)
+        except Exception as e:
+            # Removido pela política LRU durante a leitura, ou corrompido
+            logger.debug(f"Segmento {key[:12]} indisponível: {e}")
+            self._count(False)
+            return None
+
+        if not frames:
+            self._count(False)
+            return None
+
+        self._count(True)
+        return {"frames": frames, "latents": latents}
+
+    def put_segment(self, key: str, frames: List[Image.Image],
+                    latents: Optional[torch.Tensor] = None) -> bool:
+        """
+        Grava um segmento de keyframe
+
+        Args:
+            key: Chave do segmento (ver chain_keys)
+            frames: Frames depois do keyframe anterior até este (inclusive)
+            latents: Latentes do keyframe (modo latente)
+        """
+        target = self._frames_path(key)
+        if os.path.isdir(target):
+            return True
+
+        temp_dir = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(temp_dir, exist_ok=True)
+            for index, frame in enumerate(frames):
+                # Compressão rápida; PNG continua sem perdas
+                frame.save(os.path.join(temp_dir, f"{index:05d}.png"), compress_level=1)
+            if latents is not None:
+                torch.save(latents.detach().cpu(), os.path.join(temp_dir, "latents.pt"))
+            os.replace(temp_dir, target)
+        except OSError as e:
+            if not os.path.isdir(target):
+                logger.warning(f"Erro ao salvar frames em cache: {e}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return os.path.isdir(target)
+
+        self._evict()
+        return True
+
+    def get_video(self, key: str) -> Optional[str]:
+        """
+        Busca um vídeo codificado
+
+        Returns:
+            Caminho do MP4 em cache ou None
+        """
+        path = self._video_path(key)
+        try:
+            os.utime(path, None)
+        except OSError:
+            self._count(False)
+            return None
+
+        self._count(True)
+        return path
+
+    def put_video(self, key: str, source_path: str) -> bool:
+        """Copia um vídeo codificado para o cache"""
+        path = self._video_path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            shutil.copyfile(source_path, temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Erro ao salvar vídeo em cache: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        self._evict()
+        return True
+
+    def _evict(self):
+        """Remove as entradas menos usadas até o cache caber no limite"""
+        entries = []
+        total = 0
+
+        for name in os.listdir(self.frames_dir):
+            path = os.path.join(self.frames_dir, name)
+            if name.endswith(".tmp") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.stat(path).st_mtime, size, path))
+            except OSError:
+                continue
+            total += size
+
+        for name in os.listdir(self.videos_dir):
+            if not name.endswith(".mp4"):
+                continue
+            path = os.path.join(self.videos_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
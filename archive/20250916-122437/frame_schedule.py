@@ -0,0 +1,295 @@
+"""
+Cronograma por frame: prompts com pesos, strength, guidance e seed
+
+Substitui as listas de (prompt, strength) escritas à mão nos notebooks
+(progressive_sequence, key_poses) e a lista plana de --frame-prompts. O
+arquivo define keyframes, e os valores de todos os frames são interpolados
+de uma vez com NumPy ao carregar:
+
+    {
+      "frames": 300,
+      "interpolation": "linear",
+      "negative_prompt": "blurry, low quality",
+      "keyframes": [
+        {"frame": 0,   "prompt": "a cat sitting in a garden", "strength": 0.35, "seed": 42},
+        {"frame": 120, "prompt": {"a cat walking in a garden": 1.0, "autumn leaves": 0.5}, "strength": 0.45},
+        {"frame": 299, "prompt": "a cat running through the garden", "guidance": 9.0}
+      ]
+    }
+
+Cada parâmetro é interpolado entre os keyframes que o definem e fica
+constante antes do primeiro e depois do último. Os valores da linha de
+comando (--prompt, --strength, --guidance, --seed) valem como keyframe do
+frame 0 quando o cronograma não o define.
+
+- strength e guidance: interpolação "linear" (padrão), "smooth"
+  (aceleração suave nas pontas) ou "step" (muda só nos keyframes)
+- seed: a do último keyframe com seed, somada aos frames desde ele (como
+  seed + i sem cronograma)
+- prompt: texto ou {texto: peso}. Os pesos de cada texto são interpolados
+  (texto ausente num keyframe = peso 0) e o embedding de cada frame é a
+  média ponderada dos embeddings dos textos. Só os textos distintos passam
+  pelo text encoder: 300 frames com 10 keyframes fazem ~10 codificações.
+
+Aceita JSON, YAML (com PyYAML instalado) e, por compatibilidade, um .txt
+com um prompt por linha (linha i = frame i, sem interpolação; linhas
+iniciadas por # são comentários).
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional, Union
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Curva aplicada à posição t (0 a 1) entre dois keyframes
+INTERPOLATIONS = {
+    "linear": lambda t: t,
+    "smooth": lambda t: t * t * (3 - 2 * t),
+    "step": np.floor
+}
+
+# Prompt de um frame: texto ou {texto: peso}
+Prompt = Union[str, Dict[str, float]]
+
+def read_schedule_file(path: str) -> Dict[str, Any]:
+    """
+    Lê um arquivo de cronograma (.json, .yaml/.yml ou .txt)
+
+    Returns:
+        Dicionário com a lista "keyframes" e as chaves opcionais
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'r', encoding='utf-8') as f:
+        if extension in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML não instalado (pip install pyyaml); use um cronograma JSON")
+            try:
+                data = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"YAML inválido em {path}: {e}")
+        elif extension == ".txt":
+            prompts = [line.strip() for line in f if line.strip() and not line.strip().startswith("#")]
+            data = {
+                "interpolation": "step",
+                "keyframes": [{"frame": index, "prompt": prompt} for index, prompt in enumerate(prompts)]
+            }
+        else:
+            data = json.load(f)
+
+    if not isinstance(data, dict) or not isinstance(data.get("keyframes"), list):
+        raise ValueError(f"Cronograma inválido em {path}: esperado um objeto com a lista 'keyframes'")
+    return data
+
+def schedule_defaults(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Parâmetros do vídeo definidos pelo cronograma (número de frames, prompt negativo)"""
+    defaults = {}
+    if data.get("frames"):
+        defaults["frames"] = int(data["frames"])
+    if data.get("negative_prompt") is not None:
+        defaults["negative_prompt"] = str(data["negative_prompt"])
+    return defaults
+
+def interpolate_keyframes(num_frames: int, frames: np.ndarray, values: np.ndarray,
+                          interpolation: str = "linear") -> np.ndarray:
+    """
+    Valores de todos os frames a partir dos valores nos keyframes
+
+    Args:
+        num_frames: Número de frames
+        frames: Índices dos keyframes, em ordem crescente
+        values: Valor em cada keyframe (eixo 0; pode ter mais dimensões)
+        interpolation: Curva entre keyframes (ver INTERPOLATIONS)
+
+    Returns:
+        Array com num_frames valores no eixo 0
+    """
+    x = np.arange(num_frames)
+    start = np.clip(np.searchsorted(frames, x, side="right") - 1, 0, len(frames) - 1)
+    end = np.minimum(start + 1, len(frames) - 1)
+    span = np.maximum(frames[end] - frames[start], 1)
+    t = INTERPOLATIONS[interpolation](np.clip((x - frames[start]) / span, 0.0, 1.0))
+    t = t.reshape(t.shape + (1,) * (values.ndim - 1))
+    return values[start] + (values[end] - values[start]) * t
+
+class FrameSchedule:
+    """
+    Valores por frame de um cronograma (ver a docstring do módulo)
+
+    Attributes:
+        prompts: Textos distintos do cronograma (um embedding cada)
+        weights: Peso de cada texto em cada frame, matriz (frames, textos)
+            com linhas somando 1
+        strength: Strength de cada frame
+        guidance: Escala de orientação de cada frame
+        seeds: Seed de cada frame (-1 = sem seed)
+        negative_prompt: Prompt negativo do cronograma (None: o da linha de comando)
+    """
+
+    def __init__(self,
+                 prompts: List[str],
+                 weights: np.ndarray,
+                 strength: np.ndarray,
+                 guidance: np.ndarray,
+                 seeds: np.ndarray,
+                 negative_prompt: Optional[str] = None):
+        self.prompts = prompts
+        self.weights = weights
+        self.strength = strength
+        self.guidance = guidance
+        self.seeds = seeds
+        self.negative_prompt = negative_prompt
+
+    @classmethod
+    def from_dict(cls,
+                  data: Dict[str, Any],
+                  num_frames: Optional[int] = None,
+                  prompt: Optional[str] = None,
+                  strength: Optional[float] = None,
+                  guidance: Optional[float] = None,
+                  seed: Optional[int] = None) -> "FrameSchedule":
+        """
+        Interpola um cronograma para todos os frames
+
+        Args:
+            data: Cronograma (ver read_schedule_file)
+            num_frames: Número de frames (padrão: "frames" do cronograma ou
+                o último keyframe + 1); keyframes além do fim ainda
+                orientam a interpolação dos frames anteriores
+            prompt, strength, guidance, seed: Valores do frame 0 quando o
+                cronograma não os define
+
+        Returns:
+            FrameSchedule
+        """
+        keyframes = data.get("keyframes") or []
+        for keyframe in keyframes:
+            if not isinstance(keyframe, dict) or not isinstance(keyframe.get("frame"), int) or keyframe["frame"] < 0:
+                raise ValueError(f"Keyframe inválido: {keyframe} (cada keyframe precisa de 'frame' inteiro >= 0)")
+        keyframes = sorted(keyframes, key=lambda keyframe: keyframe["frame"])
+        indices = [keyframe["frame"] for keyframe in keyframes]
+        if len(set(indices)) != len(indices):
+            raise ValueError("Cronograma com dois keyframes no mesmo frame")
+
+        interpolation = data.get("interpolation", "linear")
+        if interpolation not in INTERPOLATIONS:
+            raise ValueError(f"Interpolação não suportada: {interpolation}. Disponíveis: {list(INTERPOLATIONS)}")
+
+        num_frames = int(num_frames or data.get("frames") or (indices[-1] + 1 if indices else 0))
+        if num_frames <= 0:
+            raise ValueError("Cronograma sem frames")
+
+        def track(name: str, default: Any) -> List[tuple]:
+            points = [(keyframe["frame"], keyframe[name]) for keyframe in keyframes if name in keyframe]
+            if default is not None and (not points or points[0][0] != 0):
+                points.insert(0, (0, default))
+            return points
+
+        def scalar_track(name: str, default: Optional[float], low: float, high: float) -> np.ndarray:
+            points = track(name, default)
+            if not points:
+                raise ValueError(f"O cronograma não define '{name}'")
+            frames = np.array([frame for frame, _ in points])
+            values = np.array([value for _, value in points], dtype=float)
+            if np.any((values < low) | (values > high)):
+                raise ValueError(f"'{name}' fora do intervalo [{low}, {high}]: {values.tolist()}")
+            return interpolate_keyframes(num_frames, frames, values, interpolation)
+
+        # Prompts: uma coluna de pesos por texto distinto, normalizada por keyframe
+        prompt_points = track("prompt", prompt)
+        if not prompt_points:
+            raise ValueError("O cronograma não define nenhum prompt (nem há --prompt)")
+        texts: List[str] = []
+        rows = []
+        for frame, value in prompt_points:
+            row = {value: 1.0} if isinstance(value, str) else value
+            if not isinstance(row, dict) or not row or any(
+                    not isinstance(weight, (int, float)) or weight < 0 for weight in row.values()):
+                raise ValueError(f"Prompt inválido no frame {frame}: use um texto ou {{texto: peso >= 0}}")
+            if sum(row.values()) <= 0:
+                raise ValueError(f"Pesos do prompt no frame {frame} somam zero")
+            rows.append(row)
+            texts.extend(text for text in row if text not in texts)
+        matrix = np.array([[row.get(text, 0.0) for text in texts] for row in rows], dtype=float)
+        matrix /= matrix.sum(axis=1, keepdims=True)
+        weights = interpolate_keyframes(num_frames, np.array([frame for frame, _ in prompt_points]),
+                                        matrix, interpolation)
+        # Textos que só aparecem em keyframes além do fim não são codificados
+        used = weights.max(axis=0) > 1e-6
+        texts = [text for text, keep in zip(texts, used) if keep]
+        weights = weights[:, used]
+
+        # Seeds: a do último keyframe com seed + frames desde ele; antes do primeiro, sem seed
+        seed_points = track("seed", seed)
+        seeds = np.full(num_frames, -1, dtype=np.int64)
+        if seed_points:
+            frames = np.array([frame for frame, _ in seed_points])
+            values = np.array([int(value) for _, value in seed_points], dtype=np.int64)
+            if np.any(values < 0):
+                raise ValueError(f"Seeds devem ser >= 0: {values.tolist()}")
+            x = np.arange(num_frames)
+            last = np.clip(np.searchsorted(frames, x, side="right") - 1, 0, len(frames) - 1)
+            seeds = np.where(x >= frames[0], values[last] + x - frames[last], -1)
+
+        return cls(
+            prompts=texts,
+            weights=weights,
+            strength=scalar_track("strength", strength, 0.0, 1.0),
+            guidance=scalar_track("guidance", guidance, 0.0, float("inf")),
+            seeds=seeds,
+            negative_prompt=data.get("negative_prompt")
+        )
+
+    @classmethod
+    def load(cls, path: str, **defaults) -> "FrameSchedule":
+        """Lê e interpola um arquivo de cronograma (defaults: ver from_dict)"""
+        schedule = cls.from_dict(read_schedule_file(path), **defaults)
+        logger.info(f"Cronograma {path}: {len(schedule)} frames, {len(schedule.prompts)} prompts distintos")
+        return schedule
+
+    def __len__(self) -> int:
+        return len(self.strength)
+
+    @property
+    def reproducible(self) -> bool:
+        """Se todos os frames têm seed"""
+        return bool(np.all(self.seeds >= 0))
+
+    def prompt(self, index: int) -> Prompt:
+        """Prompt do frame: o texto, ou {texto: peso} quando há mistura"""
+        mix = {text: round(float(weight), 6) for text, weight in zip(self.prompts, self.weights[index])
+               if weight > 1e-6}
+        if len(mix) == 1:
+            return next(iter(mix))
+        return mix
+
+    def seed(self, index: int) -> Optional[int]:
+        seed = int(self.seeds[index])
+        return seed if seed >= 0 else None
+
+    def frame_settings(self, index: int) -> Dict[str, Any]:
+        """Prompt, strength, guidance e seed de um frame"""
+        return {
+            "prompt": self.prompt(index),
+            "strength": float(self.strength[index]),
+            "guidance": float(self.guidance[index]),
+            "seed": self.seed(index)
+        }
+
+    def digest(self) -> str:
+        """Hash dos valores por frame (chave de cache e de checkpoint)"""
+        payload = json.dumps({
+            "prompts": self.prompts,
+            "weights": np.round(self.weights, 6).tolist(),
+            "strength": np.round(self.strength, 6).tolist(),
+            "guidance": np.round(self.guidance, 6).tolist(),
+            "seeds": self.seeds.tolist(),
+            "negative_prompt": self.negative_prompt
+        })
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
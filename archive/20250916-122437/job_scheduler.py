@@ -0,0 +1,631 @@
+"""
+Escalonador de jobs de vídeo com um pool fixo de processos worker
+
+Cada worker carrega o StableDiffusionVideoGenerator uma única vez, com o
+número de threads do torch fixo e (quando possível) afinidade a um conjunto
+próprio de núcleos, e então processa jobs inteiros de uma fila local.
+
+Uso:
+  python job_scheduler.py serve --workers 2 --queue-dir jobs
+  python job_scheduler.py submit --queue-dir jobs job1.json job2.json
+
+Um job é um JSON com as mesmas chaves da configuração (ver config.py),
+mais "prompt", "frames", "output" e opcionalmente "frame_prompts" ou
+"schedule" (caminho de um cronograma ou o próprio cronograma; ver
+frame_schedule.py).
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing as mp
+import os
+import queue
+import shutil
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional
+
+from config import Config
+from cpu_tuning import apply_cpu_tuning, openvino_config, partition_cpus, resolve_affinity
+from frame_schedule import FrameSchedule, read_schedule_file, schedule_defaults
+from schedulers import SCHEDULERS, recommended_settings
+
+logger = logging.getLogger(__name__)
+
+def new_job_id() -> str:
+    """Gera um identificador curto para um job"""
+    return uuid.uuid4().hex[:12]
+
+# Parâmetros de um job que determinam o vídeo final (chave do cache de vídeos)
+VIDEO_KEY_FIELDS = (
+    "prompt", "frame_prompts", "frames", "negative_prompt", "width", "height",
+    "strength", "steps", "effective_steps", "guidance", "seed", "latent_feedback",
+    "keyframe_interval", "interpolation", "fps", "quality", "method",
+    "scheduler", "lcm_lora", "bucket_fit"
+)
+
+def schedule_data(schedule) -> Dict[str, Any]:
+    """Cronograma de um job: caminho de arquivo ou o próprio dicionário"""
+    return read_schedule_file(schedule) if isinstance(schedule, str) else schedule
+
+def job_params(job: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parâmetros efetivos de um job
+
+    Configuração padrão, depois os passos/orientação recomendados do
+    scheduler do job (ex: 4 passos para 'lcm'), os frames e o prompt
+    negativo do cronograma e por fim o que o job define.
+    """
+    params = Config.get_default_config()
+    params.update(recommended_settings(job.get("scheduler") or params["scheduler"]))
+    if job.get("schedule"):
+        params.update(schedule_defaults(schedule_data(job["schedule"])))
+    params.update(job)
+    return params
+
+def job_schedule(params: Dict[str, Any]) -> Optional[FrameSchedule]:
+    """Cronograma interpolado de um job (None se o job não tiver)"""
+    if not params.get("schedule"):
+        return None
+    return FrameSchedule.from_dict(
+        schedule_data(params["schedule"]),
+        num_frames=params.get("frames", 30),
+        prompt=params.get("prompt"),
+        strength=params["strength"],
+        guidance=params["guidance"],
+        seed=params.get("seed")
+    )
+
+def expected_backend(use_openvino: bool) -> str:
+    """
+    Backend em que um worker gera os frames, sem carregar o modelo
+
+    Mesma escolha do StableDiffusionVideoGenerator: OpenVINO se pedido e
+    instalado, senão PyTorch na GPU (CUDA) ou na CPU.
+
+    Returns:
+        "openvino", "cuda" ou "cpu"
+    """
+    import importlib.util
+    if use_openvino and importlib.util.find_spec("optimum") is not None \
+            and importlib.util.find_spec("optimum.intel") is not None:
+        return "openvino"
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+def video_cache_key(job: Dict[str, Any], model_id: str,
+                    quantization: Optional[str] = None,
+                    backend: Optional[str] = None) -> Optional[str]:
+    """
+    Chave do vídeo de um job no FrameCache
+
+    Usa apenas o conteúdo do pedido (pixels da imagem de entrada e
+    parâmetros), não o job_id nem caminhos, para que pedidos idênticos
+    compartilhem o resultado. Pode ser calculada sem o modelo carregado.
+    O backend faz parte da chave: OpenVINO, PyTorch na CPU e na GPU não
+    geram os mesmos pixels e não podem servir os vídeos uns dos outros.
+
+    Args:
+        job: Parâmetros do job
+        model_id: Modelo carregado nos workers
+        quantization: Quantização dos pesos (None ou "int8")
+        backend: "openvino", "cuda" ou "cpu" (ver expected_backend)
+
+    Returns:
+        Chave ou None se o job não for reprodutível (sem seed)
+    """
+    from PIL import Image
+    from checkpoint import image_digest
+    from frame_cache import FrameCache
+
+    params = job_params(job)
+    schedule = job_schedule(params)
+    if not (schedule.reproducible if schedule is not None else params.get("seed") is not None):
+        return None
+
+    key_params = {field: params.get(field) for field in VIDEO_KEY_FIELDS}
+    key_params["model_id"] = model_id
+    key_params["backend"] = backend
+    # Conteúdo do cronograma, não o caminho do arquivo
+    key_params["schedule"] = schedule.digest() if schedule is not None else None
+    if quantization:
+        # Pesos INT8 mudam os pixels gerados
+        key_params["quantization"] = quantization
+    key_params["init_image"] = None
+    if params.get("init_image"):
+        with Image.open(params["init_image"]) as image:
+            key_params["init_image"] = image_digest(image)
+    return FrameCache.make_key(key_params)
+
+def run_video_job(generator,
+                  job: Dict[str, Any],
+                  progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                  should_cancel: Optional[Callable[[], bool]] = None) -> Dict[str, Any]:
+    """
+    Executa um job completo: gera os frames e codifica o vídeo em streaming
+
+    Args:
+        generator: StableDiffusionVideoGenerator já carregado
+        job: Parâmetros do job ("init_image" é o caminho de uma imagem de partida)
+        progress_callback: Função chamada com os eventos de passo e de frame
+            do gerador (ver progress.py), acrescidos do job_id
+        should_cancel: Consultada a cada evento; se retornar True o job é
+            interrompido no próximo passo e o vídeo parcial é removido
+
+    Returns:
+        Dicionário com o resultado do job
+    """
+    from PIL import Image
+    from progress import GenerationCancelled
+    from video_creator import SegmentedVideoWriter, VideoCreator
+
+    params = job_params(job)
+    params.setdefault("job_id", new_job_id())
+
+    start_time = time.time()
+    output_path = params.get("output") or os.path.join(params["output_dir"], f"{params['job_id']}.mp4")
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    init_image = None
+    if params.get("init_image"):
+        init_image = Image.open(params["init_image"]).convert("RGB")
+
+    num_frames = params.get("frames", 30)
+    frame_cache = getattr(generator, "frame_cache", None)
+    video_key = None
+    if frame_cache is not None:
+        video_key = video_cache_key(params, generator.model_id, getattr(generator, "quantization", None),
+                                    generator.backend)
+    if video_key is not None:
+        cached_path = frame_cache.get_video(video_key)
+        if cached_path is not None:
+            shutil.copyfile(cached_path, output_path)
+            logger.info(f"Job {params['job_id']}: vídeo encontrado no cache")
+            return {
+                "job_id": params["job_id"],
+                "status": "done",
+                "output": output_path,
+                "frames": num_frames,
+                "cached": True,
+                "elapsed": time.time() - start_time
+            }
+
+    def on_progress(event: Dict[str, Any]):
+        if should_cancel is not None and should_cancel():
+            raise GenerationCancelled(params["job_id"])
+        if progress_callback is not None:
+            event["job_id"] = params["job_id"]
+            progress_callback(event)
+
+    # O sampler pode variar por job; o modelo carregado continua o mesmo
+    if (params["scheduler"], params.get("lcm_lora")) != (generator.scheduler_name, generator.lcm_lora):
+        generator.set_scheduler(params["scheduler"], params.get("lcm_lora"))
+    # Ajuste da imagem de entrada ao bucket: faz parte da chave do vídeo
+    generator.bucket_fit = params["bucket_fit"]
+
+    frames = generator.iter_video_frames(
+        initial_prompt=params.get("prompt") or "",
+        frame_prompts=params.get("frame_prompts") or [],
+        num_frames=num_frames,
+        negative_prompt=params.get("negative_prompt", ""),
+        width=params["width"],
+        height=params["height"],
+        strength=params["strength"],
+        num_inference_steps=params["steps"],
+        effective_steps=params.get("effective_steps"),
+        schedule=job_schedule(params),
+        guidance_scale=params["guidance"],
+        seed=params.get("seed"),
+        latent_feedback=params.get("latent_feedback", False),
+        async_decode=params.get("async_decode", False),
+        keyframe_interval=params.get("keyframe_interval", 1),
+        interpolation=params.get("interpolation", "flow"),
+        init_image=init_image,
+        progress_callback=on_progress if progress_callback or should_cancel else None
+    )
+
+    video_creator = VideoCreator(fps=params["fps"], quality=params["quality"])
+    try:
+        with video_creator.open_stream(output_path, method=params["method"],
+                                        segment_frames=params.get("segment_frames", 0)) as writer:
+            for frame in frames:
+                writer.write(frame)
+    except GenerationCancelled:
+        logger.info(f"Job {params['job_id']} cancelado após {writer.frame_count} frames")
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        if isinstance(writer, SegmentedVideoWriter):
+            shutil.rmtree(writer.segments_dir, ignore_errors=True)
+        return {
+            "job_id": params["job_id"],
+            "status": "cancelled",
+            "output": None,
+            "frames": writer.frame_count,
+            "elapsed": time.time() - start_time
+        }
+
+    success = writer.close()
+    if success and video_key is not None:
+        frame_cache.put_video(video_key, output_path)
+
+    return {
+        "job_id": params["job_id"],
+        "status": "done" if success else "failed",
+        "output": output_path,
+        "frames": writer.frame_count,
+        "elapsed": time.time() - start_time
+    }
+
+def _worker_main(worker_id: int,
+                 generator_kwargs: Dict[str, Any],
+                 num_threads: int,
+                 inter_op_threads: Optional[int],
+                 cpu_ids: List[int],
+                 job_queue,
+                 result_queue,
+                 cancel_queue):
+    """Loop de um processo worker: carrega o modelo e processa jobs até receber None"""
+    # Fixar afinidade e threads antes de carregar o modelo
+    apply_cpu_tuning(num_threads, inter_op_threads, cpu_ids)
+
+    from stable_diffusion_pipeline import StableDiffusionVideoGenerator
+
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s - worker{worker_id} - %(levelname)s - %(message)s")
+
+    try:
+        generator = StableDiffusionVideoGenerator(**generator_kwargs)
+        # Compilar todos os buckets antes de aceitar jobs
+        generator.precompile_buckets()
+    except Exception as e:
+        result_queue.put({"type": "worker_failed", "worker": worker_id, "error": str(e)})
+        return
+
+    result_queue.put({"type": "worker_ready", "worker": worker_id})
+
+    # IDs de jobs cancelados, recebidos do escalonador (difundidos a todos os workers)
+    cancelled = set()
+
+    def is_cancelled(job_id: str) -> bool:
+        while True:
+            try:
+                cancelled.add(cancel_queue.get_nowait())
+            except queue.Empty:
+                break
+        return job_id in cancelled
+
+    while True:
+        job = job_queue.get()
+        if job is None:
+            break
+
+        job_id = job["job_id"]
+        if is_cancelled(job_id):
+            result_queue.put({"type": "result", "worker": worker_id, "job_id": job_id,
+                              "status": "cancelled", "output": None, "frames": 0})
+            continue
+
+        result_queue.put({"type": "started", "worker": worker_id, "job_id": job_id})
+        try:
+            result = run_video_job(generator, job,
+                                   progress_callback=result_queue.put,
+                                   should_cancel=lambda: is_cancelled(job_id))
+        except Exception as e:
+            logger.error(f"Job {job['job_id']} falhou: {e}")
+            result = {"job_id": job["job_id"], "status": "failed", "error": str(e)}
+
+        result["type"] = "result"
+        result["worker"] = worker_id
+        result_queue.put(result)
+
+    generator.cleanup()
+
+class JobScheduler:
+    """
+    Pool fixo de processos worker, cada um com um gerador carregado
+
+    O custo de carregar o modelo é pago uma vez por worker, e cada worker usa
+    apenas o seu bloco de núcleos, evitando vários pools de threads do torch
+    disputando os mesmos núcleos.
+    """
+
+    def __init__(self,
+                 num_workers: int = 1,
+                 model_id: str = Config.DEFAULT_MODEL,
+                 use_openvino: bool = Config.USE_OPENVINO,
+                 threads_per_worker: Optional[int] = None,
+                 pin_cores: bool = True,
+                 embedding_cache_dir: Optional[str] = Config.EMBEDDING_CACHE_DIR,
+                 frame_cache_dir: Optional[str] = Config.FRAME_CACHE_DIR,
+                 openvino_cache_dir: Optional[str] = Config.OPENVINO_CACHE_DIR,
+                 quantization: Optional[str] = Config.QUANTIZATION,
+                 inter_op_threads: Optional[int] = 1,
+                 ov_performance_hint: Optional[str] = Config.OV_PERFORMANCE_HINT,
+                 ov_num_streams: Optional[int] = Config.OV_NUM_STREAMS,
+                 cpu_affinity: Optional[str] = Config.CPU_AFFINITY,
+                 scheduler: str = Config.SCHEDULER,
+                 lcm_lora: Optional[str] = Config.LCM_LORA):
+        """
+        Inicializa o escalonador (os workers só sobem em start())
+
+        Args:
+            num_workers: Número de processos worker
+            model_id: ID do modelo Stable Diffusion
+            use_openvino: Se deve usar OpenVINO
+            threads_per_worker: Threads do torch por worker (padrão: núcleos / workers)
+            pin_cores: Fixar cada worker em um bloco próprio de núcleos
+            embedding_cache_dir: Cache de embeddings compartilhado entre workers
+            frame_cache_dir: Cache de frames e vídeos compartilhado entre workers
+                (None desativa)
+            openvino_cache_dir: Cache do modelo OpenVINO exportado e compilado;
+                rode `python openvino_cache.py` antes do deploy para os
+                workers subirem sem exportar nem compilar
+            quantization: 'int8' para pesos quantizados (ver quantization.py)
+            inter_op_threads: Threads inter-op do torch por worker
+            ov_performance_hint: PERFORMANCE_HINT do OpenVINO (LATENCY/THROUGHPUT)
+            ov_num_streams: Streams de inferência do OpenVINO por worker
+            cpu_affinity: Núcleos divididos entre os workers ('numa:N' ou
+                lista de CPUs; padrão: todos os da afinidade do processo)
+            scheduler: Sampler padrão dos jobs (ver schedulers.py); um job
+                pode pedir outro com a chave "scheduler"
+            lcm_lora: LoRA do sampler 'lcm'
+        """
+        self.num_workers = max(1, num_workers)
+        self.generator_kwargs = {
+            "model_id": model_id,
+            "use_openvino": use_openvino,
+            "embedding_cache_dir": embedding_cache_dir,
+            "frame_cache_dir": frame_cache_dir,
+            "frame_cache_size_mb": Config.FRAME_CACHE_SIZE_MB,
+            "openvino_cache_dir": openvino_cache_dir,
+            "resolution_buckets": Config.RESOLUTION_BUCKETS,
+            "bucket_fit": Config.BUCKET_FIT,
+            "quantization": quantization,
+            "scheduler": scheduler,
+            "lcm_lora": lcm_lora
+        }
+        self.cpu_sets = partition_cpus(self.num_workers, resolve_affinity(cpu_affinity))
+        self.threads_per_worker = threads_per_worker or len(self.cpu_sets[0])
+        self.inter_op_threads = inter_op_threads
+        self.pin_cores = pin_cores
+        # O plugin de CPU do OpenVINO usa as mesmas threads do bloco do worker
+        self.generator_kwargs["ov_config"] = openvino_config(ov_performance_hint, ov_num_streams,
+                                                             self.threads_per_worker)
+
+        self._context = mp.get_context("spawn")
+        self.job_queue = self._context.Queue()
+        self.result_queue = self._context.Queue()
+        self.cancel_queues = [self._context.Queue() for _ in range(self.num_workers)]
+        self.workers = []
+
+    def start(self, wait_ready: bool = True):
+        """
+        Sobe os processos worker
+
+        Args:
+            wait_ready: Aguardar todos os workers carregarem o modelo
+        """
+        for worker_id in range(self.num_workers):
+            cpu_ids = self.cpu_sets[worker_id] if self.pin_cores else []
+            process = self._context.Process(
+                target=_worker_main,
+                args=(worker_id, self.generator_kwargs, self.threads_per_worker,
+                      self.inter_op_threads, cpu_ids, self.job_queue, self.result_queue,
+                      self.cancel_queues[worker_id]),
+                daemon=True
+            )
+            process.start()
+            self.workers.append(process)
+            logger.info(f"Worker {worker_id} iniciado (threads={self.threads_per_worker}, núcleos={cpu_ids or 'todos'})")
+
+        if wait_ready:
+            ready = 0
+            while ready < self.num_workers:
+                message = self.result_queue.get()
+                if message["type"] == "worker_failed":
+                    self.shutdown()
+                    raise RuntimeError(f"Worker {message['worker']} falhou ao carregar o modelo: {message['error']}")
+                if message["type"] == "worker_ready":
+                    ready += 1
+            logger.info(f"{ready} worker(s) prontos")
+
+    def submit(self, job: Dict[str, Any]) -> str:
+        """
+        Enfileira um job
+
+        Args:
+            job: Parâmetros do job (um job_id é gerado se ausente)
+
+        Returns:
+            ID do job
+        """
+        job = self.with_defaults(job)
+        job.setdefault("job_id", new_job_id())
+        self.job_queue.put(job)
+        return job["job_id"]
+
+    def with_defaults(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Cópia do job com o sampler padrão deste escalonador, se o job não escolher outro"""
+        job = dict(job)
+        job.setdefault("scheduler", self.generator_kwargs["scheduler"])
+        job.setdefault("lcm_lora", self.generator_kwargs["lcm_lora"])
+        return job
+
+    def cancel(self, job_id: str):
+        """
+        Pede o cancelamento de um job
+
+        O pedido vai para todos os workers: quem estiver executando o job o
+        interrompe no próximo passo de difusão, e um job ainda na fila é
+        descartado quando for retirado dela. O resultado chega com status
+        "cancelled".
+        """
+        for cancel_queue in self.cancel_queues:
+            cancel_queue.put(job_id)
+
+    def get_message(self, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Próxima mensagem dos workers (started, step, frame, result, ...)
+
+        Returns:
+            Mensagem ou None se o timeout expirar
+        """
+        try:
+            return self.result_queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def shutdown(self, timeout: float = 30.0):
+        """Encerra os workers após os jobs em andamento"""
+        for _ in self.workers:
+            self.job_queue.put(None)
+        for process in self.workers:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        self.workers = []
+        logger.info("Workers encerrados")
+
+def _queue_dirs(queue_dir: str) -> Dict[str, str]:
+    dirs = {name: os.path.join(queue_dir, name) for name in ("pending", "running", "done")}
+    for path in dirs.values():
+        os.makedirs(path, exist_ok=True)
+    return dirs
+
+def serve(args):
+    """Processa jobs da fila em disco (queue_dir/pending) até Ctrl+C"""
+    dirs = _queue_dirs(args.queue_dir)
+
+    scheduler = JobScheduler(
+        num_workers=args.workers,
+        model_id=args.model,
+        use_openvino=not args.no_openvino,
+        threads_per_worker=args.threads_per_worker,
+        pin_cores=not args.no_pin,
+        frame_cache_dir=None if args.no_frame_cache else args.frame_cache_dir,
+        quantization=None if args.quantize == "none" else args.quantize,
+        inter_op_threads=args.interop_threads,
+        ov_performance_hint=args.ov_hint,
+        ov_num_streams=args.ov_streams,
+        cpu_affinity=args.cpu_affinity,
+        scheduler=args.scheduler
+    )
+    scheduler.start()
+
+    # Jobs que estavam em execução quando o servidor caiu voltam para a fila
+    for name in os.listdir(dirs["running"]):
+        shutil.move(os.path.join(dirs["running"], name), os.path.join(dirs["pending"], name))
+
+    in_flight = 0
+    logger.info(f"Aguardando jobs em {dirs['pending']}")
+
+    try:
+        while True:
+            # Despachar no máximo um job por worker livre; o resto fica em disco
+            for name in sorted(os.listdir(dirs["pending"])):
+                if in_flight >= scheduler.num_workers:
+                    break
+                if not name.endswith(".json"):
+                    continue
+
+                running_path = os.path.join(dirs["running"], name)
+                shutil.move(os.path.join(dirs["pending"], name), running_path)
+                try:
+                    with open(running_path, 'r', encoding='utf-8') as f:
+                        job = json.load(f)
+                except Exception as e:
+                    logger.error(f"Job inválido {name}: {e}")
+                    shutil.move(running_path, os.path.join(dirs["done"], name))
+                    continue
+
+                job.setdefault("job_id", name[:-len(".json")])
+                scheduler.submit(job)
+                in_flight += 1
+                logger.info(f"Job {job['job_id']} despachado")
+
+            message = scheduler.get_message(timeout=args.poll_interval)
+            if message is None or message["type"] != "result":
+                continue
+
+            in_flight -= 1
+            job_id = message["job_id"]
+            logger.info(f"Job {job_id}: {message['status']}")
+
+            running_path = os.path.join(dirs["running"], f"{job_id}.json")
+            if os.path.exists(running_path):
+                os.remove(running_path)
+            with open(os.path.join(dirs["done"], f"{job_id}.json"), 'w', encoding='utf-8') as f:
+                json.dump(message, f, indent=2, ensure_ascii=False)
+
+    except KeyboardInterrupt:
+        logger.info("Interrompido pelo usuário")
+    finally:
+        scheduler.shutdown()
+
+def submit(args):
+    """Copia arquivos de job para a fila em disco"""
+    dirs = _queue_dirs(args.queue_dir)
+
+    for path in args.jobs:
+        with open(path, 'r', encoding='utf-8') as f:
+            job = json.load(f)
+
+        job_id = job.setdefault("job_id", new_job_id())
+        temp_path = os.path.join(dirs["pending"], f".{job_id}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(job, f, indent=2, ensure_ascii=False)
+        # Renomear de forma atômica para o servidor nunca ler um job pela metade
+        os.replace(temp_path, os.path.join(dirs["pending"], f"{job_id}.json"))
+
+        print(job_id)
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Escalonador de jobs de vídeo Stable Diffusion")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="Sobe os workers e processa a fila")
+    serve_parser.add_argument("--workers", type=int, default=1, help="Número de processos worker")
+    serve_parser.add_argument("--queue-dir", type=str, default="jobs", help="Diretório da fila de jobs")
+    serve_parser.add_argument("--model", type=str, default=Config.DEFAULT_MODEL, help="ID do modelo Stable Diffusion")
+    serve_parser.add_argument("--no-openvino", action="store_true", help="Desabilitar otimização OpenVINO")
+    serve_parser.add_argument("--threads-per-worker", type=int, default=None,
+                              help="Threads do torch por worker (padrão: núcleos / workers)")
+    serve_parser.add_argument("--no-pin", action="store_true", help="Não fixar afinidade de núcleos dos workers")
+    serve_parser.add_argument("--interop-threads", type=int, default=Config.INTER_OP_THREADS or 1,
+                              help="Threads inter-op do torch por worker")
+    serve_parser.add_argument("--ov-hint", type=str, choices=["LATENCY", "THROUGHPUT"],
+                              default=Config.OV_PERFORMANCE_HINT, help="PERFORMANCE_HINT do OpenVINO")
+    serve_parser.add_argument("--ov-streams", type=int, default=Config.OV_NUM_STREAMS,
+                              help="Streams de inferência do OpenVINO por worker (padrão: do hint)")
+    serve_parser.add_argument("--cpu-affinity", type=str, default=Config.CPU_AFFINITY,
+                              help="Núcleos divididos entre os workers: 'numa:N' ou lista ('0-15')")
+    serve_parser.add_argument("--frame-cache-dir", type=str, default=Config.FRAME_CACHE_DIR,
+                              help="Cache de frames e vídeos já gerados")
+    serve_parser.add_argument("--no-frame-cache", action="store_true", help="Desativar o cache de frames e vídeos")
+    serve_parser.add_argument("--quantize", type=str, choices=["none", "int8"], default=Config.QUANTIZATION or "none",
+                              help="Quantização INT8 dos pesos da UNet e do text encoder")
+    serve_parser.add_argument("--scheduler", type=str, choices=list(SCHEDULERS.keys()), default=Config.SCHEDULER,
+                              help="Sampler padrão dos jobs (um job pode pedir outro com a chave \"scheduler\")")
+    serve_parser.add_argument("--poll-interval", type=float, default=1.0, help="Intervalo de verificação da fila (s)")
+
+    submit_parser = subparsers.add_parser("submit", help="Enfileira arquivos de job (JSON)")
+    submit_parser.add_argument("--queue-dir", type=str, default="jobs", help="Diretório da fila de jobs")
+    submit_parser.add_argument("jobs", nargs="+", help="Arquivos JSON de job")
+
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    if args.command == "serve":
+        serve(args)
+    elif args.command == "submit":
+        submit(args)
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,13 @@ from pathlib import Path
 
 from stable_diffusion_pipeline import StableDiffusionVideoGenerator
 from video_creator import VideoCreator
+from checkpoint import GenerationCheckpoint
+from config import Config, PRESET_CONFIGS
+from cpu_tuning import apply_cpu_tuning, openvino_config, resolve_affinity
+from resolution_buckets import nearest_bucket, parse_buckets
+from schedulers import SCHEDULERS, recommended_settings
+from step_plan import plan_keyframe_steps
+from frame_schedule import FrameSchedule, read_schedule_file, schedule_defaults
 
 # Configurar logging
 logging.basicConfig(
@@ -29,8 +36,8 @@ def parse_arguments():
     parser.add_argument(
         "--prompt", 
         type=str, 
-        required=True,
-        help="Prompt inicial para geração do vídeo"
+        default=None,
+        help="Prompt inicial para geração do vídeo (opcional com --schedule)"
     )
     
     parser.add_argument(
@@ -47,6 +54,13 @@ def parse_arguments():
         help="Número de frames a gerar"
     )
     
+    parser.add_argument(
+        "--init-image", 
+        type=str, 
+        default=None,
+        help="Imagem de partida (o primeiro frame vira um img2img dela)"
+    )
+    
     # Parâmetros do modelo
     parser.add_argument(
         "--model", 
@@ -61,6 +75,19 @@ def parse_arguments():
         help="Desabilitar otimização OpenVINO"
     )
     
+    parser.add_argument(
+        "--openvino-cache-dir", 
+        type=str, 
+        default="cache/openvino",
+        help="Cache do modelo OpenVINO exportado e compilado (ver openvino_cache.py)"
+    )
+    
+    parser.add_argument(
+        "--no-openvino-cache", 
+        action="store_true",
+        help="Reexportar e recompilar o modelo OpenVINO a cada execução"
+    )
+    
     # Parâmetros de geração
     parser.add_argument(
         "--width", 
@@ -76,6 +103,96 @@ def parse_arguments():
         help="Altura das imagens"
     )
     
+    parser.add_argument(
+        "--buckets", 
+        type=str, 
+        nargs='+',
+        default=[f"{w}x{h}" for w, h in Config.RESOLUTION_BUCKETS],
+        help="Resoluções aceitas com OpenVINO (LARGURAxALTURA); o tamanho pedido é ajustado à mais próxima"
+    )
+    
+    parser.add_argument(
+        "--no-buckets", 
+        action="store_true",
+        help="Usar exatamente --width/--height (OpenVINO com forma dinâmica, mais lento no CPU)"
+    )
+    
+    parser.add_argument(
+        "--bucket-fit", 
+        type=str, 
+        choices=['crop', 'pad'],
+        default=Config.BUCKET_FIT,
+        help="Ajuste da imagem de partida ao bucket: recortar ou preencher as bordas"
+    )
+    
+    parser.add_argument(
+        "--quantize", 
+        type=str, 
+        choices=['none', 'int8'],
+        default=Config.QUANTIZATION or 'none',
+        help="Quantização INT8 dos pesos da UNet e do text encoder (NNCF no OpenVINO, dinâmica no PyTorch/CPU)"
+    )
+    
+    # Parâmetros de CPU
+    parser.add_argument(
+        "--threads", 
+        type=int, 
+        default=Config.INTRA_OP_THREADS,
+        help="Threads intra-op do torch e do OpenVINO (padrão: um por núcleo da afinidade)"
+    )
+    
+    parser.add_argument(
+        "--interop-threads", 
+        type=int, 
+        default=Config.INTER_OP_THREADS,
+        help="Threads inter-op do torch (padrão do torch se omitido)"
+    )
+    
+    parser.add_argument(
+        "--ov-hint", 
+        type=str, 
+        choices=['LATENCY', 'THROUGHPUT'],
+        default=Config.OV_PERFORMANCE_HINT,
+        help="PERFORMANCE_HINT do OpenVINO"
+    )
+    
+    parser.add_argument(
+        "--ov-streams", 
+        type=int, 
+        default=Config.OV_NUM_STREAMS,
+        help="Streams de inferência do OpenVINO (padrão: escolhido pelo hint)"
+    )
+    
+    parser.add_argument(
+        "--cpu-affinity", 
+        type=str, 
+        default=Config.CPU_AFFINITY,
+        help="Núcleos do processo: 'numa:N' ou lista de CPUs ('0-7,16-23'); ver benchmark_cpu_tuning.py"
+    )
+    
+    parser.add_argument(
+        "--preset", 
+        type=str, 
+        choices=list(PRESET_CONFIGS.keys()),
+        default=None,
+        help="Conjunto de padrões (config.py); opções explícitas prevalecem. 'fast' usa LCM com 4 passos"
+    )
+    
+    parser.add_argument(
+        "--scheduler", 
+        type=str, 
+        choices=list(SCHEDULERS.keys()),
+        default=Config.SCHEDULER,
+        help="Sampler (ver schedulers.py); lcm e turbo ajustam --steps/--guidance aos valores recomendados"
+    )
+    
+    parser.add_argument(
+        "--lcm-lora", 
+        type=str, 
+        default=Config.LCM_LORA,
+        help="LoRA do sampler lcm (padrão: latent-consistency/lcm-lora-sdv1-5)"
+    )
+    
     parser.add_argument(
         "--steps", 
         type=int, 
@@ -97,6 +214,19 @@ def parse_arguments():
         help="Força da transformação entre frames"
     )
     
+    parser.add_argument(
+        "--effective-steps", 
+        type=int, 
+        default=Config.EFFECTIVE_STEPS,
+        help="Passos reais por frame img2img: --steps é ajustado à strength (ex: 7 com strength 0.35 usa 20 passos)"
+    )
+    
+    parser.add_argument(
+        "--plan", 
+        action="store_true",
+        help="Apenas mostrar os passos de difusão previstos por frame, sem carregar o modelo"
+    )
+    
     parser.add_argument(
         "--seed", 
         type=int, 
@@ -104,6 +234,33 @@ def parse_arguments():
         help="Semente para reprodutibilidade"
     )
     
+    parser.add_argument(
+        "--latent-feedback", 
+        action="store_true",
+        help="Retroalimentar frames pelos latentes (evita decode/encode do VAE a cada frame)"
+    )
+    
+    parser.add_argument(
+        "--async-decode", 
+        action="store_true",
+        help="Com --latent-feedback, decodificar frames numa thread de fundo"
+    )
+    
+    parser.add_argument(
+        "--keyframe-interval", 
+        type=int, 
+        default=1,
+        help="Difundir apenas 1 a cada N frames e interpolar os demais (1 = todos os frames)"
+    )
+    
+    parser.add_argument(
+        "--interpolation", 
+        type=str, 
+        choices=['flow', 'slerp'],
+        default='flow',
+        help="Interpolação dos frames entre keyframes (flow: fluxo óptico; slerp: latentes)"
+    )
+    
     # Parâmetros do vídeo
     parser.add_argument(
         "--fps", 
@@ -122,9 +279,9 @@ def parse_arguments():
     parser.add_argument(
         "--method", 
         type=str, 
-        choices=['opencv', 'imageio', 'ffmpeg'],
-        default='imageio',
-        help="Método para criação do vídeo"
+        choices=['auto', 'opencv', 'imageio', 'ffmpeg'],
+        default='auto',
+        help="Método para criação do vídeo ('auto' escolhe o mais rápido calibrado nesta máquina)"
     )
     
     # Parâmetros adicionais
@@ -135,6 +292,26 @@ def parse_arguments():
         help="Prompt negativo"
     )
     
+    parser.add_argument(
+        "--segment-frames", 
+        type=int, 
+        default=0,
+        help="Gravar o vídeo em segmentos deste número de frames (0 = arquivo único)"
+    )
+    
+    parser.add_argument(
+        "--checkpoint-dir", 
+        type=str, 
+        default=None,
+        help="Gravar o estado da geração neste diretório após cada keyframe (permite --resume)"
+    )
+    
+    parser.add_argument(
+        "--resume", 
+        action="store_true",
+        help="Continuar um job interrompido do --checkpoint-dir e dos segmentos já gravados"
+    )
+    
     parser.add_argument(
         "--save-frames", 
         action="store_true",
@@ -155,7 +332,64 @@ def parse_arguments():
         help="Prompts específicos para cada frame"
     )
     
-    return parser.parse_args()
+    parser.add_argument(
+        "--schedule", 
+        type=str, 
+        default=None,
+        help="Cronograma por frame (JSON, YAML ou .txt com um prompt por linha): prompts com pesos, "
+             "strength, guidance e seed interpolados entre keyframes; ver frame_schedule.py"
+    )
+    
+    parser.add_argument(
+        "--embedding-cache-dir", 
+        type=str, 
+        default="cache/embeddings",
+        help="Diretório do cache de embeddings de prompt (reaproveitado entre execuções)"
+    )
+    
+    parser.add_argument(
+        "--no-embedding-cache", 
+        action="store_true",
+        help="Manter o cache de embeddings apenas em memória"
+    )
+    
+    parser.add_argument(
+        "--frame-cache-dir", 
+        type=str, 
+        default="cache/frames",
+        help="Cache de frames gerados: pedidos idênticos (com --seed) não são recalculados"
+    )
+    
+    parser.add_argument(
+        "--no-frame-cache", 
+        action="store_true",
+        help="Desativar o cache de frames"
+    )
+    
+    # Preset e sampler ajustam os padrões; opções explícitas na linha de comando prevalecem
+    known, _ = parser.parse_known_args()
+    if known.preset:
+        parser.set_defaults(**PRESET_CONFIGS[known.preset])
+        known, _ = parser.parse_known_args()
+    if known.schedule:
+        try:
+            parser.set_defaults(**schedule_defaults(read_schedule_file(known.schedule)))
+        except (OSError, ValueError) as e:
+            parser.error(f"Erro ao ler o cronograma: {e}")
+    parser.set_defaults(**recommended_settings(known.scheduler))
+    
+    args = parser.parse_args()
+    if not args.schedule and not args.frame_prompts and os.path.exists("frame_prompts.txt"):
+        # Compatibilidade: o arquivo do diretório atual ainda vale como --frame-prompts
+        # (frame 0 usa --prompt, a linha i o frame i, e --prompt de novo após a última)
+        logger.warning("frame_prompts.txt lido automaticamente como --frame-prompts; este comportamento "
+                       "será removido, use --frame-prompts ou --schedule")
+        args.frame_prompts = load_frame_prompts("frame_prompts.txt")
+    if not args.prompt and not args.schedule:
+        parser.error("--prompt é obrigatório sem --schedule")
+    if args.schedule and args.frame_prompts:
+        parser.error("Use --schedule ou --frame-prompts, não os dois")
+    return args
 
 def load_frame_prompts(file_path: str) -> List[str]:
     """Carrega prompts de frames de um arquivo"""
@@ -167,35 +401,135 @@ def load_frame_prompts(file_path: str) -> List[str]:
         logger.error(f"Erro ao carregar prompts de frames: {e}")
         return []
 
+def load_schedule(args) -> Optional[FrameSchedule]:
+    """Carrega o cronograma de --schedule; os parâmetros da linha de comando valem como frame 0"""
+    if not args.schedule:
+        return None
+    return FrameSchedule.load(args.schedule, num_frames=args.frames, prompt=args.prompt,
+                              strength=args.strength, guidance=args.guidance, seed=args.seed)
+
+def log_progress(event: dict):
+    """Registra no log a vazão real de cada frame entregue"""
+    if event["type"] != "frame":
+        return
+    eta = f"{event['eta']:.0f}s" if event["eta"] is not None else "?"
+    logger.info(f"Progresso: {event['frame']}/{event['frames']} frames "
+                f"({event['frame_latency']:.2f}s/frame, ETA {eta})")
+
+def print_step_plan(args, schedule: Optional[FrameSchedule] = None):
+    """Mostra os passos de difusão que cada frame realmente executa (modo --plan)"""
+    keyframes = StableDiffusionVideoGenerator.keyframe_indices(args.frames, args.keyframe_interval)
+    if not keyframes:
+        print("Nenhum frame a gerar")
+        return
+    
+    strengths = [float(schedule.strength[index]) if schedule is not None else args.strength for index in keyframes]
+    keyframe_steps = plan_keyframe_steps(keyframes, args.steps, strengths, args.effective_steps,
+                                         bool(args.init_image))
+    total = sum(executed for _, executed in keyframe_steps.values())
+    
+    print(f"Plano: {args.frames} frames, {len(keyframes)} keyframes difundidos, "
+          f"{args.frames - len(keyframes)} interpolados")
+    print(f"  Primeiro frame ({'img2img' if args.init_image else 'txt2img'}): "
+          f"{keyframe_steps[keyframes[0]][1]} passos")
+    if len(keyframes) > 1:
+        img2img_steps = [keyframe_steps[index][1] for index in keyframes[1:]]
+        if min(img2img_steps) == max(img2img_steps):
+            scheduled = keyframe_steps[keyframes[1]][0]
+            print(f"  Keyframes img2img: {len(img2img_steps)} x {img2img_steps[0]} passos "
+                  f"(strength {strengths[1]:g} de {scheduled} passos)")
+        else:
+            print(f"  Keyframes img2img: {len(img2img_steps)}, de {min(img2img_steps)} a {max(img2img_steps)} "
+                  f"passos (strength {min(strengths[1:]):g}-{max(strengths[1:]):g})")
+    if schedule is not None:
+        print(f"  Prompts distintos (chamadas do text encoder): {len(schedule.prompts)}")
+    print(f"  Total: {total} passos de difusão ({total / args.frames:.1f} por frame; "
+          f"{len(keyframes) * args.steps} contando --steps em todo keyframe)")
+
 def main():
     """Função principal"""
     args = parse_arguments()
     
+    try:
+        schedule = load_schedule(args)
+    except (OSError, ValueError) as e:
+        logger.error(f"Erro no cronograma: {e}")
+        sys.exit(1)
+    
+    if args.plan:
+        try:
+            print_step_plan(args, schedule)
+        except ValueError as e:
+            logger.error(f"Erro no plano: {e}")
+            sys.exit(1)
+        return
+    
     logger.info("Iniciando geração de vídeo com Stable Diffusion")
     logger.info(f"Prompt: {args.prompt}")
     logger.info(f"Frames: {args.frames}")
     logger.info(f"Modelo: {args.model}")
     logger.info(f"OpenVINO: {not args.no_openvino}")
+    logger.info(f"Sampler: {args.scheduler}, {args.steps} passos, guidance {args.guidance}")
     
     try:
+        # Threads e afinidade antes de carregar o modelo
+        cpu = apply_cpu_tuning(args.threads, args.interop_threads, resolve_affinity(args.cpu_affinity))
+        logger.info(f"CPU: {len(cpu['cpus'])} núcleos, {cpu['intra_op_threads']} threads intra-op, "
+                    f"{cpu['inter_op_threads']} inter-op")
+        
+        # Compilar direto no bucket deste vídeo, não no primeiro da lista
+        buckets = None if args.no_buckets else parse_buckets(args.buckets)
+        static_shape = nearest_bucket(args.width, args.height, buckets) if buckets else None
+        
         # Inicializar gerador de vídeo
         video_generator = StableDiffusionVideoGenerator(
             model_id=args.model,
-            use_openvino=not args.no_openvino
+            use_openvino=not args.no_openvino,
+            embedding_cache_dir=None if args.no_embedding_cache else args.embedding_cache_dir,
+            frame_cache_dir=None if args.no_frame_cache else args.frame_cache_dir,
+            openvino_cache_dir=None if args.no_openvino_cache else args.openvino_cache_dir,
+            static_shape=static_shape,
+            resolution_buckets=buckets,
+            bucket_fit=args.bucket_fit,
+            quantization=None if args.quantize == "none" else args.quantize,
+            ov_config=openvino_config(args.ov_hint, args.ov_streams, args.threads),
+            scheduler=args.scheduler,
+            lcm_lora=args.lcm_lora
         )
         
-        # Preparar prompts de frames
-        frame_prompts = []
-        if args.frame_prompts:
-            frame_prompts = args.frame_prompts
-        elif os.path.exists("frame_prompts.txt"):
-            frame_prompts = load_frame_prompts("frame_prompts.txt")
+        init_image = None
+        if args.init_image:
+            from PIL import Image
+            init_image = Image.open(args.init_image).convert("RGB")
         
-        # Gerar frames
+        # Checkpoints só permitem retomar se o vídeo também for gravado em segmentos
+        segment_frames = args.segment_frames
+        checkpoint = None
+        if args.resume and not args.checkpoint_dir:
+            logger.error("--resume requer --checkpoint-dir")
+            sys.exit(1)
+        if args.checkpoint_dir:
+            if segment_frames <= 0:
+                segment_frames = 24
+                logger.info(f"Checkpoints ativos: gravando o vídeo em segmentos de {segment_frames} frames")
+            # Manter keyframes suficientes para retomar do início do último segmento completo
+            checkpoint = GenerationCheckpoint(
+                args.checkpoint_dir,
+                history=segment_frames // max(1, args.keyframe_interval) + 2
+            )
+        
+        video_creator = VideoCreator(fps=args.fps, quality=args.quality)
+        writer = video_creator.open_stream(args.output, method=args.method,
+                                           segment_frames=segment_frames, resume=args.resume)
+        start_frame = writer.frames_done if args.resume else 0
+        if start_frame:
+            logger.info(f"Retomando: {start_frame} frames já gravados")
+        
+        # Gerar frames e codificar o vídeo à medida que ficam prontos
         logger.info("Iniciando geração de frames...")
-        frames = video_generator.generate_video_frames(
-            initial_prompt=args.prompt,
-            frame_prompts=frame_prompts,
+        frames = video_generator.iter_video_frames(
+            initial_prompt=args.prompt or "",
+            frame_prompts=args.frame_prompts or [],
             num_frames=args.frames,
             negative_prompt=args.negative_prompt,
             width=args.width,
@@ -203,28 +537,34 @@ def main():
             strength=args.strength,
             num_inference_steps=args.steps,
             guidance_scale=args.guidance,
-            seed=args.seed
+            seed=args.seed,
+            latent_feedback=args.latent_feedback,
+            async_decode=args.async_decode,
+            keyframe_interval=args.keyframe_interval,
+            interpolation=args.interpolation,
+            init_image=init_image,
+            progress_callback=log_progress,
+            checkpoint=checkpoint,
+            resume_from=start_frame,
+            effective_steps=args.effective_steps,
+            schedule=schedule
         )
         
-        logger.info(f"Gerados {len(frames)} frames com sucesso")
+        with writer:
+            for i, frame in enumerate(frames, start=start_frame):
+                # Salvar frames individuais se solicitado
+                if args.save_frames:
+                    video_creator.save_frame(frame, args.frames_dir, i)
+                
+                writer.write(frame)
         
-        # Salvar frames individuais se solicitado
-        if args.save_frames:
-            video_creator = VideoCreator(fps=args.fps, quality=args.quality)
-            video_creator.save_frames_as_images(frames, args.frames_dir)
-        
-        # Criar vídeo
-        logger.info("Criando vídeo...")
-        video_creator = VideoCreator(fps=args.fps, quality=args.quality)
-        
-        success = video_creator.create_video(
-            frames=frames,
-            output_path=args.output,
-            method=args.method
-        )
+        success = writer.close()
+        logger.info(f"Gerados {writer.frame_count} frames com sucesso")
         
         if success:
             logger.info(f"Vídeo criado com sucesso: {args.output}")
+            if checkpoint is not None:
+                checkpoint.clear()
             
             # Mostrar informações do arquivo
             if os.path.exists(args.output):
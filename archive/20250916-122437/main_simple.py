@@ -113,9 +113,9 @@ def parse_arguments():
     parser.add_argument(
         "--method", 
         type=str, 
-        choices=['opencv', 'imageio', 'ffmpeg'],
-        default='imageio',
-        help="Método para criação do vídeo"
+        choices=['auto', 'opencv', 'imageio', 'ffmpeg'],
+        default='auto',
+        help="Método para criação do vídeo ('auto' escolhe o mais rápido calibrado nesta máquina)"
     )
     
     # Parâmetros adicionais
@@ -0,0 +1,320 @@
+"""
+Motor assíncrono do OpenVINO para gerar imagens independentes em paralelo
+
+O pipeline OpenVINO chama a UNet de forma síncrona, um passo por vez, e um
+único pedido de inferência não ocupa todos os núcleos de uma máquina
+grande. Para imagens que não dependem umas das outras (txt2img com prompts
+ou seeds diferentes), este motor compila a UNet com PERFORMANCE_HINT
+THROUGHPUT, cria N pedidos de inferência (AsyncInferQueue) e mantém todos
+ocupados:
+
+  - cada imagem é uma difusão independente, com scheduler e latentes próprios
+  - quando um passo termina, o resultado entra numa fila de conclusões; o
+    laço principal aplica a orientação (CFG) e o passo do scheduler e
+    reenfileira o próximo passo da mesma imagem
+  - imagens concluídas vão para uma thread de decodificação com o VAE,
+    sobreposta à difusão das demais
+
+Com seed fixa, cada imagem usa o mesmo ruído inicial de
+StableDiffusionVideoGenerator.generate_images_batch.
+
+Uso (comparar com o laço síncrono):
+  python openvino_async.py --model runwayml/stable-diffusion-v1-5 --images 8
+  python openvino_async.py --requests 4 --width 512 --height 512 --steps 20
+"""
+
+import argparse
+import inspect
+import logging
+import queue
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+try:
+    import openvino as ov
+    OPENVINO_AVAILABLE = True
+except ImportError:
+    OPENVINO_AVAILABLE = False
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Entradas da UNet que o motor sabe preencher (SD 1.x/2.x)
+UNET_INPUTS = ("sample", "timestep", "encoder_hidden_states")
+
+# Chamado a cada passo concluído: (índice da imagem, passo, total de passos)
+StepCallback = Callable[[int, int, int], None]
+
+class _DiffusionJob:
+    """Estado da difusão de uma imagem: scheduler, latentes e passo atual"""
+
+    def __init__(self,
+                 index: int,
+                 scheduler,
+                 latents: torch.Tensor,
+                 embeds: np.ndarray,
+                 guidance_scale: float,
+                 generator: Optional[torch.Generator]):
+        self.index = index
+        self.scheduler = scheduler
+        self.latents = latents
+        # (negativo, positivo) empilhados, como na entrada da UNet com CFG
+        self.embeds = embeds
+        self.guidance_scale = guidance_scale
+        self.do_cfg = guidance_scale > 1.0
+        self.step_index = 0
+        self.timesteps = scheduler.timesteps
+        self._step_kwargs = {}
+        if generator is not None and "generator" in inspect.signature(scheduler.step).parameters:
+            # Schedulers ancestrais sorteiam ruído a cada passo
+            self._step_kwargs["generator"] = generator
+
+    @property
+    def done(self) -> bool:
+        return self.step_index >= len(self.timesteps)
+
+    @property
+    def timestep(self):
+        return self.timesteps[self.step_index]
+
+    def unet_inputs(self, batch: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Entradas do próximo passo (sample, timestep, encoder_hidden_states)
+
+        Args:
+            batch: Tamanho de lote da UNet compilada (2 com CFG)
+        """
+        sample = self.scheduler.scale_model_input(self.latents, self.timestep).numpy()
+        if batch == 2:
+            sample = np.concatenate([sample, sample])
+            embeds = self.embeds if self.do_cfg else np.concatenate([self.embeds[1:2], self.embeds[1:2]])
+        else:
+            embeds = self.embeds[1:2]
+        return sample, np.asarray(self.timestep), embeds
+
+    def advance(self, noise_pred: np.ndarray):
+        """Aplica a orientação e o passo do scheduler com a saída da UNet"""
+        noise_pred = torch.from_numpy(noise_pred)
+        if self.do_cfg and noise_pred.shape[0] == 2:
+            noise_uncond, noise_text = noise_pred.chunk(2)
+            noise_pred = noise_uncond + self.guidance_scale * (noise_text - noise_uncond)
+        else:
+            noise_pred = noise_pred[:1]
+
+        self.latents = self.scheduler.step(noise_pred, self.timestep, self.latents,
+                                           **self._step_kwargs).prev_sample
+        self.step_index += 1
+
+class AsyncDiffusionEngine:
+    """
+    UNet com vários pedidos de inferência em voo e decodificação em paralelo
+
+    Criado a partir de um OVStableDiffusionPipeline já carregado (reusa o
+    modelo da UNet e do VAE, o scheduler e o text encoder); a UNet é
+    compilada de novo com PERFORMANCE_HINT THROUGHPUT, usando o CACHE_DIR do
+    pipeline quando houver.
+    """
+
+    def __init__(self, pipeline, num_requests: int = 0, device: str = "CPU"):
+        """
+        Args:
+            pipeline: OVStableDiffusionPipeline (forma estática ou dinâmica)
+            num_requests: Pedidos de inferência em voo (0: número ótimo
+                informado pelo dispositivo)
+            device: Dispositivo OpenVINO
+        """
+        if not OPENVINO_AVAILABLE:
+            raise RuntimeError("OpenVINO não instalado")
+
+        input_names = {name for port in pipeline.unet.model.inputs for name in port.get_names()}
+        unsupported = input_names - set(UNET_INPUTS)
+        if unsupported:
+            raise ValueError(f"UNet com entradas não suportadas pelo motor assíncrono: {sorted(unsupported)}")
+
+        base_config = {}
+        cache_dir = (getattr(pipeline, "ov_config", None) or {}).get("CACHE_DIR")
+        if cache_dir:
+            base_config["CACHE_DIR"] = cache_dir
+
+        core = ov.Core()
+        unet_config = dict(base_config, PERFORMANCE_HINT="THROUGHPUT")
+        if num_requests:
+            unet_config["PERFORMANCE_HINT_NUM_REQUESTS"] = str(num_requests)
+
+        start = time.perf_counter()
+        self.unet = core.compile_model(pipeline.unet.model, device, unet_config)
+        self.vae = core.compile_model(pipeline.vae_decoder.model, device,
+                                      dict(base_config, PERFORMANCE_HINT="LATENCY"))
+        self.num_requests = num_requests or self.unet.get_property("OPTIMAL_NUMBER_OF_INFER_REQUESTS")
+        logger.info(f"Motor assíncrono compilado em {time.perf_counter() - start:.1f}s "
+                    f"({self.num_requests} pedidos em voo)")
+
+        self.pipeline = pipeline
+        self.scheduler_config = pipeline.scheduler.config
+        self.scheduler_class = type(pipeline.scheduler)
+        self.vae_scale_factor = getattr(pipeline, "vae_scale_factor", 8)
+        self.scaling_factor = self._config_value(pipeline.vae_decoder, "scaling_factor", 0.18215)
+        self.latent_channels = self._config_value(pipeline.unet, "in_channels", 4)
+
+        sample_shape = self.unet.input("sample").get_partial_shape()
+        self.static_batch = sample_shape[0].get_length() if sample_shape[0].is_static else None
+        self.timestep_rank = self.unet.input("timestep").get_partial_shape().rank.get_length()
+        self.timestep_dtype = self.unet.input("timestep").get_element_type().to_dtype()
+
+        self._completions = queue.Queue()
+        self._infer_queue = ov.AsyncInferQueue(self.unet, self.num_requests)
+        self._infer_queue.set_callback(self._on_unet_done)
+
+    @staticmethod
+    def _config_value(model, name, default):
+        config = getattr(model, "config", None) or {}
+        value = config.get(name) if isinstance(config, dict) else getattr(config, name, None)
+        return default if value is None else value
+
+    def _on_unet_done(self, request, job: _DiffusionJob):
+        # O pedido é reutilizado logo em seguida: copiar a saída
+        self._completions.put((job, request.get_output_tensor(0).data.copy()))
+
+    def _start(self, job: _DiffusionJob):
+        """Enfileira o próximo passo de uma imagem (bloqueia se todos os pedidos estiverem ocupados)"""
+        batch = self.static_batch or (2 if job.do_cfg else 1)
+        sample, timestep, embeds = job.unet_inputs(batch)
+        if self.timestep_rank == 0:
+            timestep = timestep.reshape(())
+        else:
+            timestep = np.full((sample.shape[0],), timestep, dtype=self.timestep_dtype)
+        self._infer_queue.start_async({
+            "sample": sample,
+            "timestep": timestep.astype(self.timestep_dtype),
+            "encoder_hidden_states": embeds
+        }, job)
+
+    def _decode(self, latents: torch.Tensor) -> Image.Image:
+        """Decodifica latentes com o VAE (roda na thread de decodificação)"""
+        image = self.vae([(latents / self.scaling_factor).numpy()])[self.vae.output(0)]
+        image = np.clip(image / 2 + 0.5, 0, 1).transpose(0, 2, 3, 1)[0]
+        return Image.fromarray((image * 255).round().astype(np.uint8))
+
+    def _new_job(self,
+                 index: int,
+                 embeds: np.ndarray,
+                 seed: Optional[int],
+                 width: int,
+                 height: int,
+                 num_inference_steps: int,
+                 guidance_scale: float) -> _DiffusionJob:
+        scheduler = self.scheduler_class.from_config(self.scheduler_config)
+        scheduler.set_timesteps(num_inference_steps)
+
+        generator = torch.Generator().manual_seed(seed) if seed is not None else None
+        shape = (1, self.latent_channels, height // self.vae_scale_factor, width // self.vae_scale_factor)
+        latents = torch.randn(shape, generator=generator, dtype=torch.float32) * scheduler.init_noise_sigma
+        return _DiffusionJob(index, scheduler, latents, embeds, guidance_scale, generator)
+
+    def generate(self,
+                 embeds: Sequence[np.ndarray],
+                 seeds: Sequence[Optional[int]],
+                 width: int = 512,
+                 height: int = 512,
+                 num_inference_steps: int = 20,
+                 guidance_scale: float = 7.5,
+                 on_step: Optional[StepCallback] = None) -> List[Image.Image]:
+        """
+        Gera uma imagem por embedding, mantendo todos os pedidos ocupados
+
+        Args:
+            embeds: Por imagem, array (2, tokens, dim) com o embedding
+                negativo e o positivo
+            seeds: Seed de cada imagem (None: aleatória)
+            width: Largura das imagens
+            height: Altura das imagens
+            num_inference_steps: Número de passos de inferência
+            guidance_scale: Escala de orientação
+            on_step: Chamado a cada passo concluído
+
+        Returns:
+            Imagens PIL, na ordem de embeds
+        """
+        pending = [self._new_job(index, np.asarray(embed, dtype=np.float32), seed,
+                                 width, height, num_inference_steps, guidance_scale)
+                   for index, (embed, seed) in enumerate(zip(embeds, seeds))]
+        pending.reverse()
+        decoded: Dict[int, Future] = {}
+        in_flight = 0
+
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vae") as decoder:
+            while pending and in_flight < self.num_requests:
+                self._start(pending.pop())
+                in_flight += 1
+
+            while in_flight:
+                job, noise_pred = self._completions.get()
+                job.advance(noise_pred)
+                if on_step is not None:
+                    on_step(job.index, job.step_index, len(job.timesteps))
+
+                if not job.done:
+                    self._start(job)
+                    continue
+
+                # Imagem pronta: decodificar em paralelo e ocupar o pedido livre
+                decoded[job.index] = decoder.submit(self._decode, job.latents)
+                in_flight -= 1
+                if pending:
+                    self._start(pending.pop())
+                    in_flight += 1
+
+            return [decoded[index].result() for index in range(len(decoded))]
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Compara o motor assíncrono do OpenVINO com o laço síncrono")
+    parser.add_argument("--model", type=str, default=Config.DEFAULT_MODEL, help="ID do modelo Stable Diffusion")
+    parser.add_argument("--openvino-cache-dir", type=str, default=Config.OPENVINO_CACHE_DIR,
+                        help="Cache do modelo OpenVINO exportado")
+    parser.add_argument("--prompt", type=str, default="a photograph of a lighthouse at dawn", help="Prompt")
+    parser.add_argument("--images", type=int, default=8, help="Número de imagens independentes")
+    parser.add_argument("--requests", type=int, default=0,
+                        help="Pedidos de inferência em voo (0: número ótimo do dispositivo)")
+    parser.add_argument("--width", type=int, default=Config.DEFAULT_WIDTH, help="Largura das imagens")
+    parser.add_argument("--height", type=int, default=Config.DEFAULT_HEIGHT, help="Altura das imagens")
+    parser.add_argument("--steps", type=int, default=Config.DEFAULT_STEPS, help="Passos de inferência")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    if not OPENVINO_AVAILABLE:
+        logger.error("OpenVINO/optimum-intel não instalados")
+        raise SystemExit(1)
+
+    from stable_diffusion_pipeline import StableDiffusionVideoGenerator
+
+    generator = StableDiffusionVideoGenerator(
+        model_id=args.model,
+        openvino_cache_dir=args.openvino_cache_dir,
+        static_shape=(args.width, args.height),
+        async_requests=args.requests
+    )
+    prompts = [args.prompt] * args.images
+    seeds = list(range(args.images))
+
+    print(f"{args.images} imagens {args.width}x{args.height}, {args.steps} passos")
+    for label, use_async in (("síncrono", False), ("assíncrono", True)):
+        start = time.perf_counter()
+        generator.generate_images_batch(prompts, seeds, width=args.width, height=args.height,
+                                        num_inference_steps=args.steps, max_batch_size=1,
+                                        use_async=use_async)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<12} {elapsed:>8.1f}s {args.images / elapsed:>8.3f} imagens/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Cache do modelo OpenVINO: IR exportado e blobs compilados
+
+Sem cache, cada processo reexporta o modelo PyTorch para IR (from_pretrained
+com export=True) e recompila para o dispositivo, o que leva minutos. Aqui a
+exportação é feita uma única vez por modelo e versão do OpenVINO, e a
+compilação usa o CACHE_DIR do OpenVINO, que guarda o blob compilado de cada
+forma (estática ou dinâmica) e o reaproveita nas próximas inicializações.
+
+  <cache>/<modelo>-<hash>/ir/                 IR exportado (save_pretrained)
+  <cache>/<modelo>-<hash>/blobs/512x512/      blobs compilados (forma estática)
+  <cache>/<modelo>-<hash>/blobs/dynamic/      blobs compilados (forma dinâmica)
+
+O hash cobre o model_id, a versão do OpenVINO e a quantização dos pesos;
+blobs de outra versão nunca são carregados.
+
+Uso (aquecer o cache antes de um deploy):
+  python openvino_cache.py --model runwayml/stable-diffusion-v1-5
+  python openvino_cache.py --shapes 512x512 768x512 512x768
+  python openvino_cache.py --buckets        # buckets de config.py
+  python openvino_cache.py --quantize int8  # IR com pesos INT8 (NNCF)
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import shutil
+import time
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import openvino
+    from optimum.intel import OVStableDiffusionPipeline
+    OPENVINO_AVAILABLE = True
+except ImportError:
+    OPENVINO_AVAILABLE = False
+
+from config import Config
+from quantization import compress_openvino_pipeline, validate_quantization
+from resolution_buckets import parse_size
+
+logger = logging.getLogger(__name__)
+
+# Lote com que a forma estática é compilada: a UNet não aceita lotes maiores
+STATIC_BATCH_SIZE = 1
+
+def openvino_version() -> str:
+    """Versão do runtime OpenVINO instalado"""
+    get_version = getattr(openvino, "get_version", None)
+    if get_version is None:
+        from openvino.runtime import get_version
+    return get_version()
+
+class OpenVINOModelCache:
+    """Exporta, guarda e carrega pipelines OpenVINO já compilados"""
+
+    def __init__(self, cache_dir: str = Config.OPENVINO_CACHE_DIR):
+        """
+        Args:
+            cache_dir: Diretório raiz do cache
+        """
+        if not OPENVINO_AVAILABLE:
+            raise RuntimeError("OpenVINO/optimum-intel não instalados")
+        self.cache_dir = cache_dir
+
+    def model_dir(self, model_id: str, quantization: Optional[str] = None) -> str:
+        """Diretório do modelo para a versão atual do OpenVINO"""
+        key = f"{model_id}\0{openvino_version()}"
+        if quantization:
+            key += f"\0{quantization}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+        slug = re.sub(r"[^A-Za-z0-9._-]+", "_", model_id).strip("_")[-48:]
+        if quantization:
+            slug += f"-{quantization}"
+        return os.path.join(self.cache_dir, f"{slug}-{digest}")
+
+    def ir_dir(self, model_id: str, quantization: Optional[str] = None) -> str:
+        return os.path.join(self.model_dir(model_id, quantization), "ir")
+
+    def blob_dir(self, model_id: str, static_shape: Optional[Tuple[int, int]] = None,
+                 quantization: Optional[str] = None) -> str:
+        shape = f"{static_shape[0]}x{static_shape[1]}" if static_shape else "dynamic"
+        return os.path.join(self.model_dir(model_id, quantization), "blobs", shape)
+
+    def is_exported(self, model_id: str, quantization: Optional[str] = None) -> bool:
+        return os.path.exists(os.path.join(self.ir_dir(model_id, quantization), "model_index.json"))
+
+    def export(self, model_id: str, quantization: Optional[str] = None) -> str:
+        """
+        Exporta o modelo para IR (se ainda não estiver no cache)
+
+        A exportação é gravada num diretório temporário e renomeada ao final,
+        então um processo interrompido nunca deixa um IR pela metade.
+
+        Args:
+            model_id: ID do modelo Stable Diffusion
+            quantization: 'int8' grava o IR com pesos comprimidos (NNCF)
+
+        Returns:
+            Diretório do IR
+        """
+        validate_quantization(quantization)
+        ir_dir = self.ir_dir(model_id, quantization)
+        if self.is_exported(model_id, quantization):
+            return ir_dir
+
+        logger.info(f"Exportando {model_id} para OpenVINO IR (uma vez por versão do OpenVINO)...")
+        start = time.perf_counter()
+        temp_dir = f"{ir_dir}.{os.getpid()}.tmp"
+        try:
+            pipeline = OVStableDiffusionPipeline.from_pretrained(model_id, export=True, compile=False)
+            if quantization and not compress_openvino_pipeline(pipeline):
+                raise RuntimeError("Quantização INT8 indisponível (NNCF não instalado)")
+            pipeline.save_pretrained(temp_dir)
+            del pipeline
+            if self.is_exported(model_id, quantization):
+                # Outro processo exportou primeiro
+                shutil.rmtree(temp_dir, ignore_errors=True)
+            else:
+                os.replace(temp_dir, ir_dir)
+        except Exception:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        logger.info(f"IR exportado em {time.perf_counter() - start:.1f}s: {ir_dir}")
+        return ir_dir
+
+    def load(self,
+             model_id: str,
+             static_shape: Optional[Tuple[int, int]] = None,
+             compile: bool = True,
+             quantization: Optional[str] = None,
+             ov_config: Optional[Dict[str, str]] = None):
+        """
+        Carrega o pipeline do IR em cache, exportando-o se necessário
+
+        Args:
+            model_id: ID do modelo Stable Diffusion
+            static_shape: (largura, altura) para compilar com forma estática
+                (batch 1); None mantém a forma dinâmica
+            compile: Compilar já (usa/grava os blobs do cache)
+            quantization: 'int8' para pesos comprimidos (IR separado)
+            ov_config: Propriedades de compilação extras (ex: PERFORMANCE_HINT,
+                ver cpu_tuning.openvino_config)
+
+        Returns:
+            OVStableDiffusionPipeline
+        """
+        ir_dir = self.export(model_id, quantization)
+        blob_dir = self.blob_dir(model_id, static_shape, quantization)
+        os.makedirs(blob_dir, exist_ok=True)
+
+        pipeline = OVStableDiffusionPipeline.from_pretrained(
+            ir_dir,
+            export=False,
+            compile=False,
+            ov_config={**(ov_config or {}), "CACHE_DIR": blob_dir}
+        )
+        if static_shape:
+            width, height = static_shape
+            pipeline.reshape(batch_size=STATIC_BATCH_SIZE, height=height, width=width, num_images_per_prompt=1)
+
+        if compile:
+            start = time.perf_counter()
+            pipeline.compile()
+            logger.info(f"Pipeline OpenVINO compilado em {time.perf_counter() - start:.1f}s "
+                        f"({'x'.join(map(str, static_shape)) if static_shape else 'forma dinâmica'})")
+        return pipeline
+
+def warmup(model_id: str, cache_dir: str, shapes: List[Optional[Tuple[int, int]]],
+           quantization: Optional[str] = None):
+    """Exporta o modelo e compila cada forma, preenchendo o cache"""
+    cache = OpenVINOModelCache(cache_dir)
+    for shape in shapes:
+        start = time.perf_counter()
+        pipeline = cache.load(model_id, static_shape=shape, quantization=quantization)
+        del pipeline
+        label = f"{shape[0]}x{shape[1]}" if shape else "dinâmica"
+        print(f"{label:<12} {time.perf_counter() - start:>8.1f}s  {cache.blob_dir(model_id, shape, quantization)}")
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Aquece o cache do modelo OpenVINO (IR e blobs compilados)")
+    parser.add_argument("--model", type=str, default=Config.DEFAULT_MODEL, help="ID do modelo Stable Diffusion")
+    parser.add_argument("--cache-dir", type=str, default=Config.OPENVINO_CACHE_DIR, help="Diretório do cache")
+    parser.add_argument("--shapes", type=str, nargs="*", default=[],
+                        help="Formas estáticas a compilar (LARGURAxALTURA); sem formas compila a dinâmica")
+    parser.add_argument("--buckets", action="store_true",
+                        help="Compilar também os buckets de resolução de Config.RESOLUTION_BUCKETS")
+    parser.add_argument("--quantize", type=str, choices=["none", "int8"], default=Config.QUANTIZATION or "none",
+                        help="Quantização dos pesos do IR exportado")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    if not OPENVINO_AVAILABLE:
+        logger.error("OpenVINO/optimum-intel não instalados")
+        raise SystemExit(1)
+
+    shapes = [parse_size(shape) for shape in args.shapes]
+    if args.buckets:
+        shapes += [bucket for bucket in Config.RESOLUTION_BUCKETS if bucket not in shapes]
+    shapes = shapes or [None]
+    print(f"OpenVINO {openvino_version()}, modelo {args.model}")
+    quantization = None if args.quantize == "none" else args.quantize
+    warmup(args.model, args.cache_dir, shapes, quantization)
+
+if __name__ == "__main__":
+    main()
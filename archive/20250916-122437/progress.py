@@ -0,0 +1,133 @@
+"""
+Eventos de progresso estruturados da geração de vídeo
+
+O ProgressTracker mede cada passo de difusão e cada frame entregue e chama
+um callback com eventos (dicionários serializáveis em JSON):
+
+  {"type": "step",  "frame": 3, "step": 5, "steps": 7, "step_latency": 0.41, "steps_done": 40,
+   "planned_steps": 223, "elapsed": 52.1, "eta": 210.4}
+  {"type": "frame", "frame": 4, "frames": 30, "frame_latency": 8.2, "steps_done": 41,
+   "planned_steps": 223, "elapsed": 60.3, "eta": 202.0}
+
+"frame" no evento de passo é o índice (0-based) do keyframe em difusão; no
+evento de frame é o número de frames já entregues. "steps" é o número de
+passos que o keyframe realmente executa (no img2img, strength * passos) e
+"planned_steps" o total previsto para o vídeo (ver step_plan.py). O
+callback pode levantar GenerationCancelled para interromper a geração no
+próximo passo.
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+class GenerationCancelled(Exception):
+    """Geração interrompida a pedido do cliente"""
+
+class ProgressTracker:
+    """
+    Mede passos e frames da geração e estima o tempo restante
+
+    O ETA é o tempo médio por passo (incluindo decode e interpolação, que
+    são rateados entre os passos) vezes os passos que ainda faltam.
+    """
+
+    def __init__(self,
+                 num_frames: int,
+                 planned_steps: int,
+                 callback: Optional[ProgressCallback] = None,
+                 frames_done: int = 0):
+        """
+        Inicializa o rastreador
+
+        Args:
+            num_frames: Número total de frames do vídeo
+            planned_steps: Total de passos de difusão previstos
+            callback: Função chamada com cada evento
+            frames_done: Frames já entregues antes (ao retomar um checkpoint)
+        """
+        self.num_frames = num_frames
+        self.planned_steps = max(1, planned_steps)
+        self.callback = callback
+        self.steps_done = 0
+        self.frames_done = frames_done
+        self.current_frame = 0
+        self.current_steps = None
+        self.start_time = time.perf_counter()
+        self._last_step = self.start_time
+        self._last_frame = self.start_time
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start_time
+
+    def eta(self) -> Optional[float]:
+        """Segundos restantes estimados (None antes do primeiro passo)"""
+        if self.frames_done >= self.num_frames:
+            return 0.0
+        if self.steps_done == 0:
+            return None
+        remaining = max(0, self.planned_steps - self.steps_done)
+        return remaining * self.elapsed / self.steps_done
+
+    def start_keyframe(self, frame_index: int, num_steps: Optional[int] = None):
+        """
+        Marca o início da difusão de um keyframe
+
+        Args:
+            frame_index: Índice do keyframe
+            num_steps: Passos que o keyframe executa, se conhecidos
+        """
+        self.current_frame = frame_index
+        self.current_steps = num_steps
+        self._last_step = time.perf_counter()
+
+    def step(self, step: int, num_steps: Optional[int] = None):
+        """
+        Registra um passo de difusão concluído
+
+        Args:
+            step: Índice (0-based) do passo dentro do keyframe atual
+            num_steps: Número de passos do keyframe atual, se conhecido
+        """
+        now = time.perf_counter()
+        latency = now - self._last_step
+        self._last_step = now
+        self.steps_done += 1
+
+        self._emit({
+            "type": "step",
+            "frame": self.current_frame,
+            "step": step + 1,
+            "steps": num_steps or self.current_steps,
+            "step_latency": round(latency, 4)
+        })
+
+    def frame_done(self):
+        """Registra um frame entregue ao consumidor"""
+        now = time.perf_counter()
+        latency = now - self._last_frame
+        self._last_frame = now
+        self.frames_done += 1
+
+        self._emit({
+            "type": "frame",
+            "frame": self.frames_done,
+            "frames": self.num_frames,
+            "frame_latency": round(latency, 4)
+        })
+
+    def _emit(self, event: Dict[str, Any]):
+        if self.callback is None:
+            return
+
+        eta = self.eta()
+        event["steps_done"] = self.steps_done
+        event["planned_steps"] = self.planned_steps
+        event["elapsed"] = round(self.elapsed, 3)
+        event["eta"] = round(eta, 1) if eta is not None else None
+        self.callback(event)
@@ -0,0 +1,181 @@
+"""
+Cache de embeddings de prompts (CLIP) em memória e em disco
+
+Os embeddings são indexados por (model_id, prompt, negative_prompt) e pela
+variante do text encoder que os gerou (quantização e backend: INT8, OpenVINO
+e PyTorch na CPU ou GPU não produzem os mesmos valores). A camada
+em memória é um LRU; a camada em disco guarda um arquivo .npy por entrada,
+lido com memory-map, e remove as entradas menos usadas quando o diretório
+passa do tamanho máximo.
+"""
+
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Incrementar quando o formato dos arquivos mudar
+CACHE_FORMAT_VERSION = 2
+
+class PromptEmbeddingCache:
+    """
+    Cache LRU de embeddings de prompt com persistência opcional em disco
+
+    Cada entrada é um array (2, seq_len, dim) com o embedding negativo na
+    posição 0 e o positivo na posição 1.
+    """
+
+    def __init__(self,
+                 cache_dir: Optional[str] = None,
+                 max_memory_entries: int = 64,
+                 max_disk_mb: int = 512):
+        """
+        Inicializa o cache
+
+        Args:
+            cache_dir: Diretório do cache em disco (None para apenas memória)
+            max_memory_entries: Número máximo de entradas em memória
+            max_disk_mb: Tamanho máximo do diretório em disco (MB)
+        """
+        self.cache_dir = cache_dir
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_bytes = max_disk_mb * 1024 * 1024
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_id: str, prompt: str, negative_prompt: str = "",
+                 quantization: Optional[str] = None, backend: str = "cpu") -> str:
+        """Gera a chave (hash) de uma entrada"""
+        payload = "\0".join([str(CACHE_FORMAT_VERSION), model_id, prompt, negative_prompt,
+                             quantization or "none", backend])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def get(self, model_id: str, prompt: str, negative_prompt: str = "",
+            quantization: Optional[str] = None, backend: str = "cpu") -> Optional[np.ndarray]:
+        """
+        Busca embeddings no cache
+
+        Args:
+            model_id: ID do modelo
+            prompt: Prompt positivo
+            negative_prompt: Prompt negativo
+            quantization: Quantização do text encoder (None ou "int8")
+            backend: Backend do text encoder ("openvino", "cuda" ou "cpu")
+
+        Returns:
+            Array (2, seq_len, dim) ou None se não estiver em cache
+        """
+        key = self.make_key(model_id, prompt, negative_prompt, quantization, backend)
+
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            if self.cache_dir:
+                path = self._path(key)
+                if os.path.exists(path):
+                    try:
+                        embeds = np.load(path, mmap_mode='r')
+                        # Atualizar mtime para a política LRU do disco
+                        os.utime(path, None)
+                        self._remember(key, embeds)
+                        self.hits += 1
+                        return embeds
+                    except Exception as e:
+                        logger.warning(f"Entrada de cache corrompida ({path}): {e}")
+                        self._remove_file(path)
+
+            self.misses += 1
+            return None
+
+    def put(self, model_id: str, prompt: str, negative_prompt: str, embeds: np.ndarray,
+            quantization: Optional[str] = None, backend: str = "cpu"):
+        """
+        Armazena embeddings no cache
+
+        Args:
+            model_id: ID do modelo que gerou os embeddings
+            prompt: Prompt positivo
+            negative_prompt: Prompt negativo
+            embeds: Array (2, seq_len, dim)
+            quantization: Quantização do text encoder (None ou "int8")
+            backend: Backend do text encoder ("openvino", "cuda" ou "cpu")
+        """
+        key = self.make_key(model_id, prompt, negative_prompt, quantization, backend)
+
+        with self._lock:
+            self._remember(key, embeds)
+
+            if not self.cache_dir:
+                return
+
+            path = self._path(key)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, 'wb') as f:
+                    np.save(f, embeds)
+                os.replace(temp_path, path)
+            except Exception as e:
+                logger.warning(f"Erro ao salvar embedding em cache: {e}")
+                self._remove_file(temp_path)
+                return
+
+            self._evict_disk()
+
+    def _remember(self, key: str, embeds: np.ndarray):
+        """Insere no LRU em memória, removendo a entrada mais antiga se necessário"""
+        self._memory[key] = embeds
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """Remove os arquivos menos usados até o diretório caber no limite"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".npy"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            self._remove_file(path)
+            total -= size
+
+    @staticmethod
+    def _remove_file(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Limpa o cache em memória (o disco é mantido)"""
+        with self._lock:
+            self._memory.clear()
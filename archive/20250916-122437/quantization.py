@@ -0,0 +1,75 @@
+"""
+Quantização INT8 dos pesos para inferência em CPU
+
+Apenas a UNet (que roda a cada passo) e o text encoder são quantizados; o
+VAE fica em precisão cheia, pois é o que mais afeta a qualidade da imagem
+final e roda uma vez por frame.
+
+- OpenVINO: compressão de pesos INT8 do NNCF (weight-only) nos modelos IR;
+  a inferência continua em fp32, com pesos 4x menores em memória.
+- PyTorch: quantização dinâmica do torch nas camadas Linear (pesos INT8,
+  ativações quantizadas em tempo de execução); só para CPU.
+"""
+
+from typing import Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+QUANTIZATION_MODES = ("int8",)
+
+# Submodelos quantizados (a UNet domina o custo de cada passo)
+QUANTIZED_COMPONENTS: Tuple[str, ...] = ("unet", "text_encoder")
+
+def validate_quantization(quantization):
+    """Levanta ValueError se o modo de quantização não existir"""
+    if quantization is not None and quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Quantização não suportada: {quantization}. Disponíveis: {QUANTIZATION_MODES}")
+
+def quantize_torch_pipeline(pipeline) -> bool:
+    """
+    Quantização dinâmica INT8 (camadas Linear) da UNet e do text encoder
+
+    Modifica o pipeline no lugar, sem copiar os modelos.
+
+    Returns:
+        True se quantizou, False se indisponível neste torch
+    """
+    import torch
+    try:
+        from torch.ao.quantization import quantize_dynamic
+    except ImportError:
+        logger.warning("torch.ao.quantization indisponível; mantendo fp32")
+        return False
+
+    for name in QUANTIZED_COMPONENTS:
+        module = getattr(pipeline, name, None)
+        if module is not None:
+            quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+    logger.info(f"Quantização dinâmica INT8 aplicada: {', '.join(QUANTIZED_COMPONENTS)}")
+    return True
+
+def compress_openvino_pipeline(pipeline) -> bool:
+    """
+    Compressão de pesos INT8 (NNCF) da UNet e do text encoder de um pipeline OpenVINO
+
+    Deve ser chamada antes de compile(); save_pretrained grava o IR já
+    comprimido.
+
+    Returns:
+        True se comprimiu, False se o NNCF não estiver instalado
+    """
+    try:
+        import nncf
+    except ImportError:
+        logger.warning("NNCF não instalado (pip install nncf); mantendo pesos fp32")
+        return False
+
+    for name in QUANTIZED_COMPONENTS:
+        wrapper = getattr(pipeline, name, None)
+        if wrapper is not None:
+            wrapper.model = nncf.compress_weights(wrapper.model, mode=nncf.CompressWeightsMode.INT8_ASYM)
+
+    logger.info(f"Pesos comprimidos para INT8 (NNCF): {', '.join(QUANTIZED_COMPONENTS)}")
+    return True
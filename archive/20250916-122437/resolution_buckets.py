@@ -0,0 +1,70 @@
+"""
+Buckets de resolução para compilação com forma estática
+
+No CPU o OpenVINO é mais rápido com formas estáticas, mas cada forma exige
+um reshape e uma compilação. Em vez de aceitar qualquer largura/altura, os
+pedidos são ajustados ao bucket mais próximo de uma lista fixa (compilada
+uma vez por bucket), e a imagem de entrada é recortada ou preenchida para
+o tamanho do bucket.
+"""
+
+import math
+import re
+from typing import List, Sequence, Tuple
+
+from PIL import Image, ImageOps, ImageStat
+
+FIT_MODES = ("crop", "pad")
+
+def parse_size(text: str) -> Tuple[int, int]:
+    """Converte 'LARGURAxALTURA' em (largura, altura)"""
+    match = re.fullmatch(r"(\d+)x(\d+)", text.strip().lower())
+    if not match:
+        raise ValueError(f"Tamanho inválido: {text} (use LARGURAxALTURA, ex: 768x512)")
+    return int(match.group(1)), int(match.group(2))
+
+def parse_buckets(values: Sequence[str]) -> List[Tuple[int, int]]:
+    """Converte ['512x512', '768x512'] em [(512, 512), (768, 512)]"""
+    return [parse_size(value) for value in values]
+
+def nearest_bucket(width: int, height: int, buckets: Sequence[Tuple[int, int]]) -> Tuple[int, int]:
+    """
+    Bucket mais próximo de um tamanho pedido
+
+    Prioriza a proporção (para recortar/preencher o mínimo possível) e,
+    entre proporções iguais, a área mais próxima.
+    """
+    if not buckets:
+        return width, height
+
+    aspect = width / height
+    return min(buckets, key=lambda bucket: (
+        round(abs(math.log(aspect * bucket[1] / bucket[0])), 6),
+        abs(bucket[0] * bucket[1] - width * height)
+    ))
+
+def fit_image(image: Image.Image, size: Tuple[int, int], mode: str = "crop") -> Image.Image:
+    """
+    Ajusta uma imagem ao tamanho de um bucket sem distorcer
+
+    Args:
+        image: Imagem de entrada
+        size: (largura, altura) do bucket
+        mode: 'crop' (escala até cobrir e recorta o centro) ou 'pad'
+            (escala até caber e preenche as bordas com a cor média)
+
+    Returns:
+        Imagem RGB com exatamente o tamanho pedido
+    """
+    if mode not in FIT_MODES:
+        raise ValueError(f"Modo de ajuste não suportado: {mode}. Disponíveis: {FIT_MODES}")
+
+    image = image.convert("RGB")
+    if image.size == tuple(size):
+        return image
+
+    if mode == "crop":
+        return ImageOps.fit(image, size, method=Image.LANCZOS)
+
+    color = tuple(int(channel) for channel in ImageStat.Stat(image).mean)
+    return ImageOps.pad(image, size, method=Image.LANCZOS, color=color)
@@ -0,0 +1,98 @@
+"""
+Registro de schedulers (samplers) selecionáveis por nome
+
+Cada entrada diz a classe do diffusers, os ajustes de configuração e,
+quando o sampler só funciona bem com poucos passos e pouca orientação, os
+passos e a escala de orientação recomendados:
+
+  dpmpp_2m         DPM++ 2M (padrão)                         ~20 passos
+  dpmpp_2m_karras  DPM++ 2M com sigmas de Karras             10-20 passos
+  unipc            UniPC                                     10-20 passos
+  euler_a          Euler ancestral                           20-30 passos
+  lcm              LCM com LCM-LoRA carregado na UNet        4-8 passos, guidance 1.0
+  turbo            Modelos Turbo (ex: stabilityai/sd-turbo)  1-4 passos, sem guidance
+
+O LCM depende do LCM-LoRA (carregado e fundido nos pesos no PyTorch; no
+OpenVINO use um modelo LCM já destilado). O turbo só faz sentido com um
+modelo treinado para poucos passos.
+"""
+
+from typing import Any, Dict, Optional
+
+import diffusers
+
+DEFAULT_SCHEDULER = "dpmpp_2m"
+
+SCHEDULERS: Dict[str, Dict[str, Any]] = {
+    "dpmpp_2m": {
+        "class": "DPMSolverMultistepScheduler",
+        "config": {},
+        "description": "DPM++ 2M"
+    },
+    "dpmpp_2m_karras": {
+        "class": "DPMSolverMultistepScheduler",
+        "config": {"use_karras_sigmas": True},
+        "description": "DPM++ 2M Karras"
+    },
+    "unipc": {
+        "class": "UniPCMultistepScheduler",
+        "config": {},
+        "description": "UniPC"
+    },
+    "euler_a": {
+        "class": "EulerAncestralDiscreteScheduler",
+        "config": {},
+        "description": "Euler ancestral"
+    },
+    "lcm": {
+        "class": "LCMScheduler",
+        "config": {},
+        "lora": "latent-consistency/lcm-lora-sdv1-5",
+        "steps": 4,
+        "guidance": 1.0,
+        "description": "LCM com LCM-LoRA (4-8 passos)"
+    },
+    "turbo": {
+        "class": "EulerAncestralDiscreteScheduler",
+        "config": {"timestep_spacing": "trailing"},
+        "steps": 2,
+        "guidance": 0.0,
+        "description": "Modelos Turbo (1-4 passos, sem guidance)"
+    },
+}
+
+def get_scheduler_spec(name: str) -> Dict[str, Any]:
+    """Entrada do registro (ValueError se o nome não existir)"""
+    if name not in SCHEDULERS:
+        raise ValueError(f"Scheduler '{name}' não encontrado. Disponíveis: {list(SCHEDULERS.keys())}")
+    return SCHEDULERS[name]
+
+def build_scheduler(name: str, base_config: Dict[str, Any]):
+    """
+    Cria o scheduler a partir da configuração do scheduler do modelo
+
+    Args:
+        name: Nome no registro
+        base_config: Configuração do scheduler original do modelo (betas,
+            número de timesteps de treino, tipo de predição...)
+
+    Returns:
+        Instância do scheduler
+    """
+    spec = get_scheduler_spec(name)
+    scheduler_class = getattr(diffusers, spec["class"])
+    return scheduler_class.from_config(base_config, **spec["config"])
+
+def recommended_settings(name: Optional[str]) -> Dict[str, Any]:
+    """Passos e orientação recomendados do sampler ({} se não houver)"""
+    if not name:
+        return {}
+    spec = get_scheduler_spec(name)
+    return {key: spec[key] for key in ("steps", "guidance") if key in spec}
+
+def lora_for(name: str, lcm_lora: Optional[str] = None) -> Optional[str]:
+    """LoRA exigido pelo sampler (lcm_lora substitui o padrão do registro)"""
+    spec = get_scheduler_spec(name)
+    if "lora" not in spec:
+        return None
+    return lcm_lora or spec["lora"]
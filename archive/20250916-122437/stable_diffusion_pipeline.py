@@ -6,20 +6,93 @@ Baseado nos tutoriais do HuggingFace Optimum OpenVINO
 import torch
 import numpy as np
 from PIL import Image
-from diffusers import StableDiffusionPipeline, DPMSolverMultistepScheduler
+import diffusers
+from diffusers import StableDiffusionPipeline, StableDiffusionImg2ImgPipeline
 try:
-    from optimum.intel import OVStableDiffusionPipeline
+    from optimum.intel import OVStableDiffusionPipeline, OVStableDiffusionImg2ImgPipeline
     OPENVINO_AVAILABLE = True
 except ImportError:
     OPENVINO_AVAILABLE = False
 import cv2
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Iterator, Callable, Dict, Any, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+import inspect
+import json
 import logging
 
+from config import Config
+from prompt_cache import PromptEmbeddingCache
+from frame_interpolation import INTERPOLATION_METHODS, slerp, flow_interpolate
+from progress import ProgressCallback, ProgressTracker
+from step_plan import plan_keyframe_steps
+from frame_schedule import FrameSchedule, Prompt
+from checkpoint import GenerationCheckpoint, params_hash, image_digest
+from frame_cache import FrameCache
+from openvino_async import AsyncDiffusionEngine
+from openvino_cache import STATIC_BATCH_SIZE, OpenVINOModelCache
+from quantization import compress_openvino_pipeline, quantize_torch_pipeline, validate_quantization
+from resolution_buckets import fit_image, nearest_bucket
+from schedulers import DEFAULT_SCHEDULER, build_scheduler, get_scheduler_spec, lora_for
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class _LatentDecoder:
+    """
+    Decodifica latentes para imagens PIL, opcionalmente numa thread de fundo
+    
+    Em modo de fundo a decodificação do frame N roda enquanto a UNet gera o
+    frame N+1; os frames continuam sendo entregues na ordem original.
+    """
+    
+    def __init__(self, decode_fn: Callable[[torch.Tensor], Image.Image],
+                 background: bool = False,
+                 max_pending: int = 2):
+        self.decode_fn = decode_fn
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1) if background else None
+        self._pending = deque()
+    
+    def submit(self, latents: torch.Tensor) -> List[Image.Image]:
+        """Agenda a decodificação e retorna os frames já prontos para entrega"""
+        if self._executor is None:
+            return [self.decode_fn(latents)]
+        
+        self._pending.append(self._executor.submit(self.decode_fn, latents))
+        
+        ready = []
+        while len(self._pending) > self.max_pending:
+            ready.append(self._pending.popleft().result())
+        return ready
+    
+    def submit_ready(self, image: Image.Image) -> List[Image.Image]:
+        """Enfileira um frame já decodificado, preservando a ordem de entrega"""
+        if self._executor is None:
+            return [image]
+        
+        future = Future()
+        future.set_result(image)
+        self._pending.append(future)
+        
+        ready = []
+        while len(self._pending) > self.max_pending:
+            ready.append(self._pending.popleft().result())
+        return ready
+    
+    def flush(self) -> List[Image.Image]:
+        """Aguarda e retorna todos os frames pendentes"""
+        ready = [future.result() for future in self._pending]
+        self._pending.clear()
+        return ready
+    
+    def shutdown(self):
+        """Libera a thread de fundo"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
 class StableDiffusionVideoGenerator:
     """
     Classe para geração de vídeo usando Stable Diffusion com retroalimentação
@@ -28,7 +101,20 @@ class StableDiffusionVideoGenerator:
     def __init__(self, 
                  model_id: str = "runwayml/stable-diffusion-v1-5",
                  use_openvino: bool = True,
-                 device: str = "auto"):
+                 device: str = "auto",
+                 embedding_cache_dir: Optional[str] = None,
+                 embedding_cache_size_mb: int = 512,
+                 frame_cache_dir: Optional[str] = None,
+                 frame_cache_size_mb: int = 4096,
+                 openvino_cache_dir: Optional[str] = None,
+                 static_shape: Optional[Tuple[int, int]] = None,
+                 resolution_buckets: Optional[List[Tuple[int, int]]] = None,
+                 bucket_fit: str = "crop",
+                 quantization: Optional[str] = None,
+                 ov_config: Optional[Dict[str, str]] = None,
+                 async_requests: Optional[int] = None,
+                 scheduler: str = DEFAULT_SCHEDULER,
+                 lcm_lora: Optional[str] = None):
         """
         Inicializa o gerador de vídeo
         
@@ -36,11 +122,62 @@ class StableDiffusionVideoGenerator:
             model_id: ID do modelo Stable Diffusion
             use_openvino: Se deve usar OpenVINO para otimização
             device: Dispositivo para execução (auto, cpu, cuda)
+            embedding_cache_dir: Diretório do cache de embeddings de prompt
+                (None mantém o cache apenas em memória)
+            embedding_cache_size_mb: Tamanho máximo do cache em disco (MB)
+            frame_cache_dir: Diretório do cache de frames gerados (None desativa)
+            frame_cache_size_mb: Tamanho máximo do cache de frames (MB)
+            openvino_cache_dir: Cache do IR exportado e dos blobs compilados
+                (ver openvino_cache.py); None reexporta a cada inicialização
+            static_shape: (largura, altura) para compilar o OpenVINO com
+                forma estática (batch 1); None usa forma dinâmica
+            resolution_buckets: Resoluções (largura, altura) aceitas com
+                OpenVINO; cada pedido é ajustado ao bucket mais próximo, que
+                é compilado com forma estática uma única vez
+            bucket_fit: Ajuste da imagem de entrada ao bucket ('crop' ou 'pad')
+            quantization: 'int8' quantiza os pesos da UNet e do text encoder
+                (NNCF no OpenVINO, quantização dinâmica do torch no PyTorch
+                em CPU); None mantém fp32
+            ov_config: Propriedades de compilação do OpenVINO (hint de
+                desempenho, streams, threads; ver cpu_tuning.openvino_config)
+            async_requests: Pedidos de inferência em voo do motor assíncrono
+                do OpenVINO para imagens independentes (0 = número ótimo do
+                dispositivo); None desativa (ver openvino_async.py)
+            scheduler: Nome do sampler no registro de schedulers.py
+                (dpmpp_2m, dpmpp_2m_karras, unipc, euler_a, lcm, turbo)
+            lcm_lora: LoRA usado pelo scheduler 'lcm' (padrão: LCM-LoRA do SD 1.5)
         """
+        validate_quantization(quantization)
+        get_scheduler_spec(scheduler)
         self.model_id = model_id
         self.use_openvino = use_openvino
         self.device = device
+        self.openvino_cache_dir = openvino_cache_dir
+        self.resolution_buckets = list(resolution_buckets or [])
+        self.bucket_fit = bucket_fit
+        self.quantization = quantization
+        self.ov_config = dict(ov_config or {})
+        self.async_requests = async_requests
+        # Motores assíncronos já compilados de cada bucket
+        self._async_engines = {}
+        self.scheduler_name = scheduler
+        self.lcm_lora = lcm_lora
+        # LoRA fundido nos pesos da UNet (ex: LCM-LoRA)
+        self.lora = None
+        self._base_scheduler_config = None
+        self._torch_quantized = False
+        self.static_shape = static_shape or (self.resolution_buckets[0] if self.resolution_buckets else None)
+        # Pipelines (txt2img, img2img) já compilados de cada bucket
+        self._bucket_pipelines = {}
         self.pipeline = None
+        self.img2img_pipeline = None
+        self.is_openvino = False
+        self._progress = None
+        self.embedding_cache = PromptEmbeddingCache(
+            cache_dir=embedding_cache_dir,
+            max_disk_mb=embedding_cache_size_mb
+        )
+        self.frame_cache = FrameCache(frame_cache_dir, frame_cache_size_mb) if frame_cache_dir else None
         
         logger.info(f"Inicializando pipeline com modelo: {model_id}")
         self._setup_pipeline()
@@ -49,14 +186,8 @@ class StableDiffusionVideoGenerator:
         """Configura o pipeline do Stable Diffusion"""
         try:
             if self.use_openvino and OPENVINO_AVAILABLE:
-                # Usar OpenVINO para otimização
-                self.pipeline = OVStableDiffusionPipeline.from_pretrained(
-                    self.model_id,
-                    export=True,
-                    compile=False
-                )
-                # Compilar o modelo para otimização
-                self.pipeline.compile()
+                self.pipeline = self._load_openvino_pipeline(self.static_shape)
+                self.is_openvino = True
                 logger.info("Pipeline OpenVINO configurado com sucesso")
             else:
                 if self.use_openvino and not OPENVINO_AVAILABLE:
@@ -69,20 +200,331 @@ class StableDiffusionVideoGenerator:
                     requires_safety_checker=False
                 )
                 
-                # Usar scheduler mais rápido
-                self.pipeline.scheduler = DPMSolverMultistepScheduler.from_config(
-                    self.pipeline.scheduler.config
-                )
+                # LoRA do sampler antes de mover/quantizar os pesos
+                self._set_lora(lora_for(self.scheduler_name, self.lcm_lora))
                 
                 if torch.cuda.is_available():
                     self.pipeline = self.pipeline.to("cuda")
                 
+                if self.quantization:
+                    if torch.cuda.is_available():
+                        # Quantização dinâmica do torch só tem kernels de CPU
+                        logger.warning("Quantização INT8 ignorada: disponível apenas em CPU")
+                        self.quantization = None
+                    elif quantize_torch_pipeline(self.pipeline):
+                        self._torch_quantized = True
+                    else:
+                        self.quantization = None
+                
                 logger.info("Pipeline PyTorch configurado com sucesso")
+            
+            # img2img compartilha os mesmos pesos (UNet, VAE, text encoder)
+            self.img2img_pipeline = self._build_img2img_pipeline()
+            
+            # Configuração original do modelo: base de todos os samplers do registro
+            self._base_scheduler_config = self.pipeline.scheduler.config
+            self.set_scheduler(self.scheduler_name, self.lcm_lora)
+            
+            if self.resolution_buckets and not self.is_openvino:
+                logger.info("Buckets de resolução ignorados: só se aplicam ao OpenVINO")
                 
         except Exception as e:
             logger.error(f"Erro ao configurar pipeline: {e}")
             raise
     
+    def _load_openvino_pipeline(self, static_shape: Optional[Tuple[int, int]]):
+        """Carrega e compila o pipeline OpenVINO (forma estática ou dinâmica)"""
+        if self.openvino_cache_dir:
+            # IR e blobs compilados em cache: sem reexportar nem recompilar
+            return OpenVINOModelCache(self.openvino_cache_dir).load(
+                self.model_id,
+                static_shape=static_shape,
+                quantization=self.quantization,
+                ov_config=self.ov_config
+            )
+        
+        pipeline = OVStableDiffusionPipeline.from_pretrained(
+            self.model_id,
+            export=True,
+            compile=False,
+            ov_config=self.ov_config or None
+        )
+        if self.quantization and not compress_openvino_pipeline(pipeline):
+            self.quantization = None
+        if static_shape:
+            width, height = static_shape
+            pipeline.reshape(batch_size=STATIC_BATCH_SIZE, height=height, width=width, num_images_per_prompt=1)
+        # Compilar o modelo para otimização
+        pipeline.compile()
+        return pipeline
+    
+    @property
+    def backend(self) -> str:
+        """Backend efetivo da geração: "openvino", "cuda" ou "cpu" """
+        if self.is_openvino:
+            return "openvino"
+        return "cuda" if torch.cuda.is_available() else "cpu"
+    
+    @property
+    def static_batch_size(self) -> Optional[int]:
+        """Lote máximo da UNet compilada com forma estática (None: qualquer lote)"""
+        if self.is_openvino and self.static_shape is not None:
+            return STATIC_BATCH_SIZE
+        return None
+    
+    @property
+    def uses_buckets(self) -> bool:
+        """Se as resoluções são ajustadas aos buckets (apenas OpenVINO)"""
+        return bool(self.resolution_buckets) and self.is_openvino
+    
+    def use_resolution(self, width: int, height: int) -> Tuple[int, int]:
+        """
+        Prepara os pipelines para gerar na resolução pedida
+        
+        Com buckets, a resolução é ajustada ao bucket mais próximo e os
+        pipelines passam a ser os desse bucket (compilados na primeira vez).
+        
+        Returns:
+            (largura, altura) efetiva
+        """
+        if not self.uses_buckets:
+            return width, height
+        
+        bucket = nearest_bucket(width, height, self.resolution_buckets)
+        if bucket != (width, height):
+            logger.info(f"Resolução {width}x{height} ajustada ao bucket {bucket[0]}x{bucket[1]}")
+        if bucket == self.static_shape:
+            return bucket
+        
+        self._bucket_pipelines[self.static_shape] = (self.pipeline, self.img2img_pipeline)
+        if bucket not in self._bucket_pipelines:
+            logger.info(f"Compilando bucket {bucket[0]}x{bucket[1]} (uma vez por processo)")
+            pipeline = self._load_openvino_pipeline(bucket)
+            self._bucket_pipelines[bucket] = (pipeline, self._build_img2img_pipeline(pipeline))
+        
+        # Todos os buckets usam o sampler atual
+        scheduler = self.pipeline.scheduler
+        self.pipeline, self.img2img_pipeline = self._bucket_pipelines[bucket]
+        self.pipeline.scheduler = scheduler
+        self.img2img_pipeline.scheduler = scheduler
+        self.static_shape = bucket
+        return bucket
+    
+    def precompile_buckets(self):
+        """Compila todos os buckets já na inicialização (evita a espera no primeiro pedido)"""
+        current = self.static_shape
+        for width, height in self.resolution_buckets:
+            self.use_resolution(width, height)
+        if current is not None:
+            self.use_resolution(*current)
+    
+    def fit_input_image(self, image: Image.Image, width: int, height: int) -> Image.Image:
+        """Ajusta a imagem de entrada à resolução de geração"""
+        if self.uses_buckets:
+            return fit_image(image, (width, height), self.bucket_fit)
+        return image.convert("RGB").resize((width, height))
+    
+    @property
+    def txt2img_pipeline(self):
+        """Pipeline txt2img (alias de self.pipeline)"""
+        return self.pipeline
+    
+    def _build_img2img_pipeline(self, source=None):
+        """
+        Cria o pipeline img2img reaproveitando os componentes já carregados
+        
+        Nenhum peso é carregado ou compilado novamente: os dois modos usam os
+        mesmos objetos de UNet, VAE, text encoder, tokenizer e scheduler.
+        
+        Args:
+            source: Pipeline txt2img de origem (padrão: self.pipeline)
+        """
+        source = source or self.pipeline
+        if not self.is_openvino:
+            return StableDiffusionImg2ImgPipeline(**source.components, requires_safety_checker=False)
+        
+        if getattr(source, "vae_encoder", None) is None:
+            raise RuntimeError("Modelo OpenVINO exportado sem vae_encoder; img2img indisponível")
+        
+        img2img = OVStableDiffusionImg2ImgPipeline(
+            scheduler=source.scheduler,
+            unet=source.unet.model,
+            vae_decoder=source.vae_decoder.model,
+            vae_encoder=source.vae_encoder.model,
+            text_encoder=source.text_encoder.model,
+            tokenizer=source.tokenizer,
+            feature_extractor=source.feature_extractor,
+            device=source._device,
+            compile=False,
+            dynamic_shapes=False,
+            ov_config=source.ov_config,
+            model_save_dir=source.model_save_dir
+        )
+        
+        # Trocar os wrappers recém-criados pelos já compilados do pipeline txt2img
+        img2img.unet = source.unet
+        img2img.vae_decoder = source.vae_decoder
+        img2img.vae_encoder = source.vae_encoder
+        img2img.text_encoder = source.text_encoder
+        img2img.vae = source.vae
+        img2img.is_dynamic = source.is_dynamic
+        
+        return img2img
+    
+    def _set_lora(self, lora: Optional[str]):
+        """Carrega e funde um LoRA na UNet (None remove o atual)"""
+        if lora == self.lora:
+            return
+        
+        if self.is_openvino:
+            if lora:
+                logger.warning(f"LoRA {lora} não suportado no OpenVINO; use um modelo LCM já destilado (--model)")
+            return
+        
+        if self._torch_quantized:
+            raise ValueError("Não é possível trocar o LoRA de pesos quantizados; recarregue o gerador com o scheduler desejado")
+        
+        if self.lora:
+            self.pipeline.unfuse_lora()
+            self.pipeline.unload_lora_weights()
+            logger.info(f"LoRA {self.lora} removido")
+        if lora:
+            logger.info(f"Carregando LoRA {lora}")
+            self.pipeline.load_lora_weights(lora)
+            # Fundido nos pesos: sem custo extra por passo
+            self.pipeline.fuse_lora()
+        self.lora = lora
+    
+    def set_scheduler(self, name: str, lcm_lora: Optional[str] = None):
+        """
+        Troca o sampler dos pipelines txt2img e img2img
+        
+        Args:
+            name: Nome no registro de schedulers.py
+            lcm_lora: LoRA do scheduler 'lcm' (padrão: o do registro)
+        """
+        spec = get_scheduler_spec(name)
+        self._set_lora(lora_for(name, lcm_lora))
+        
+        scheduler = build_scheduler(name, self._base_scheduler_config)
+        self.pipeline.scheduler = scheduler
+        self.img2img_pipeline.scheduler = scheduler
+        self.scheduler_name = name
+        self.lcm_lora = lcm_lora
+        logger.info(f"Scheduler: {spec['description']}")
+    
+    def scheduler_config(self) -> Dict[str, Any]:
+        """Configuração serializável do scheduler atual (inclui _class_name)"""
+        return json.loads(self.pipeline.scheduler.to_json_string())
+    
+    def _restore_scheduler(self, config: Dict[str, Any]):
+        """Recria o scheduler a partir de uma configuração salva num checkpoint"""
+        if config == self.scheduler_config():
+            return
+        
+        scheduler_class = getattr(diffusers, config["_class_name"])
+        scheduler = scheduler_class.from_config(config)
+        self.pipeline.scheduler = scheduler
+        self.img2img_pipeline.scheduler = scheduler
+        logger.info(f"Scheduler restaurado do checkpoint: {config['_class_name']}")
+    
+    def encode_prompt(self, 
+                      prompt: str,
+                      negative_prompt: str = "") -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Codifica prompt e prompt negativo com o text encoder, usando o cache
+        
+        Args:
+            prompt: Prompt positivo
+            negative_prompt: Prompt negativo
+            
+        Returns:
+            Tupla (prompt_embeds, negative_prompt_embeds)
+        """
+        # Quantização e backend mudam a saída do text encoder: entradas separadas
+        variant = {"quantization": self.quantization, "backend": self.backend}
+        embeds = self.embedding_cache.get(self.model_id, prompt, negative_prompt, **variant)
+        
+        if embeds is None:
+            with torch.no_grad():
+                prompt_embeds, negative_prompt_embeds = self.pipeline.encode_prompt(
+                    prompt,
+                    self.pipeline._execution_device,
+                    1,
+                    True,
+                    negative_prompt
+                )
+            embeds = torch.cat([negative_prompt_embeds, prompt_embeds]).float().cpu().numpy()
+            self.embedding_cache.put(self.model_id, prompt, negative_prompt, embeds, **variant)
+        
+        embeds = torch.from_numpy(np.array(embeds))
+        return embeds[1:2], embeds[0:1]
+    
+    def encode_weighted_prompt(self, 
+                               prompts: Dict[str, float],
+                               negative_prompt: str = "") -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Embedding de uma mistura de prompts: média ponderada dos embeddings
+        
+        Cada texto é codificado uma única vez (cache de embeddings), então
+        misturas que variam de frame a frame não chamam o text encoder de novo.
+        
+        Args:
+            prompts: {texto: peso}
+            negative_prompt: Prompt negativo
+            
+        Returns:
+            Tupla (prompt_embeds, negative_prompt_embeds)
+        """
+        total = sum(prompts.values())
+        prompt_embeds = None
+        negative_prompt_embeds = None
+        for text, weight in prompts.items():
+            embeds, negative_prompt_embeds = self.encode_prompt(text, negative_prompt)
+            embeds = embeds * (weight / total)
+            prompt_embeds = embeds if prompt_embeds is None else prompt_embeds + embeds
+        return prompt_embeds, negative_prompt_embeds
+    
+    def _prompt_kwargs(self, prompt: Prompt, negative_prompt: str) -> Dict[str, Any]:
+        """Argumentos de prompt para o pipeline: embeddings em cache quando possível"""
+        if not hasattr(self.pipeline, "encode_prompt"):
+            if isinstance(prompt, dict):
+                # Sem acesso aos embeddings não há mistura: usar o texto de maior peso
+                prompt = max(prompt, key=prompt.get)
+            return {"prompt": prompt, "negative_prompt": negative_prompt}
+        
+        if isinstance(prompt, dict):
+            prompt_embeds, negative_prompt_embeds = self.encode_weighted_prompt(prompt, negative_prompt)
+        else:
+            prompt_embeds, negative_prompt_embeds = self.encode_prompt(prompt, negative_prompt)
+        return {"prompt_embeds": prompt_embeds, "negative_prompt_embeds": negative_prompt_embeds}
+    
+    def _step_callback_kwargs(self, pipe) -> Dict[str, Any]:
+        """
+        Argumentos de callback por passo para o pipeline, quando há progresso ativo
+        
+        Usa callback_on_step_end (diffusers atual) ou, em versões antigas
+        (e no optimum-intel), o par callback/callback_steps.
+        """
+        tracker = self._progress
+        if tracker is None or tracker.callback is None:
+            return {}
+        
+        parameters = inspect.signature(pipe.__call__).parameters
+        
+        if "callback_on_step_end" in parameters:
+            def on_step_end(pipeline, step, timestep, callback_kwargs):
+                tracker.step(step, getattr(pipeline, "num_timesteps", None))
+                return callback_kwargs
+            return {"callback_on_step_end": on_step_end}
+        
+        if "callback" in parameters:
+            def on_step(step, timestep, latents):
+                tracker.step(step)
+            return {"callback": on_step, "callback_steps": 1}
+        
+        return {}
+    
     def generate_initial_image(self, 
                              prompt: str,
                              negative_prompt: str = "",
@@ -115,18 +557,145 @@ class StableDiffusionVideoGenerator:
         
         # Gerar imagem
         image = self.pipeline(
-            prompt=prompt,
-            negative_prompt=negative_prompt,
+            **self._prompt_kwargs(prompt, negative_prompt),
             width=width,
             height=height,
             num_inference_steps=num_inference_steps,
             guidance_scale=guidance_scale,
-            generator=generator
+            generator=generator,
+            **self._step_callback_kwargs(self.pipeline)
         ).images[0]
         
         logger.info("Imagem inicial gerada com sucesso")
         return image
     
+    def _async_engine(self) -> Optional[AsyncDiffusionEngine]:
+        """Motor assíncrono do bucket atual (None se indisponível)"""
+        if not self.is_openvino:
+            logger.info("Motor assíncrono ignorado: só se aplica ao OpenVINO")
+            return None
+        
+        if self.static_shape not in self._async_engines:
+            try:
+                engine = AsyncDiffusionEngine(self.pipeline, self.async_requests or 0)
+            except Exception as e:
+                logger.warning(f"Motor assíncrono indisponível, usando o pipeline síncrono: {e}")
+                engine = None
+            self._async_engines[self.static_shape] = engine
+        return self._async_engines[self.static_shape]
+    
+    def generate_images_batch(self,
+                              prompts: List[str],
+                              seeds: Optional[List[Optional[int]]] = None,
+                              negative_prompt: str = "",
+                              width: int = 512,
+                              height: int = 512,
+                              num_inference_steps: int = 20,
+                              guidance_scale: float = 7.5,
+                              max_batch_size: int = Config.MAX_BATCH_SIZE,
+                              use_async: Optional[bool] = None) -> List[Image.Image]:
+        """
+        Gera várias imagens independentes (txt2img) em lotes na UNet
+        
+        Cada imagem usa seu próprio gerador, então o resultado é o mesmo de
+        chamar generate_initial_image uma vez por prompt/seed.
+        
+        Com OpenVINO e async_requests definido, as imagens passam pelo motor
+        assíncrono (vários pedidos de inferência em voo, ver
+        openvino_async.py) em vez de lotes síncronos.
+        
+        Args:
+            prompts: Lista de prompts, um por imagem
+            seeds: Lista de seeds (mesmo tamanho de prompts) ou None
+            negative_prompt: Prompt negativo comum a todas as imagens
+            width: Largura das imagens
+            height: Altura das imagens
+            num_inference_steps: Número de passos de inferência
+            guidance_scale: Escala de orientação
+            max_batch_size: Número máximo de imagens por passada da UNet
+                (padrão: Config.MAX_BATCH_SIZE; limitado ao lote compilado quando a forma é estática)
+            use_async: Forçar (True) ou desativar (False) o motor assíncrono;
+                None usa-o quando async_requests estiver definido
+            
+        Returns:
+            Lista de imagens PIL, na mesma ordem dos prompts
+        """
+        if seeds is None:
+            seeds = [None] * len(prompts)
+        if len(seeds) != len(prompts):
+            raise ValueError("prompts e seeds devem ter o mesmo tamanho")
+        
+        width, height = self.use_resolution(width, height)
+        
+        if use_async is None:
+            use_async = self.async_requests is not None
+        
+        if use_async:
+            engine = self._async_engine()
+            if engine is not None and hasattr(self.pipeline, "encode_prompt"):
+                logger.info(f"Gerando {len(prompts)} imagens no motor assíncrono "
+                            f"({engine.num_requests} pedidos em voo)")
+                embeds = []
+                for prompt in prompts:
+                    prompt_embeds, negative_prompt_embeds = self.encode_prompt(prompt, negative_prompt)
+                    embeds.append(torch.cat([negative_prompt_embeds, prompt_embeds]).numpy())
+                return engine.generate(
+                    embeds,
+                    seeds,
+                    width=width,
+                    height=height,
+                    num_inference_steps=num_inference_steps,
+                    guidance_scale=guidance_scale
+                )
+        
+        max_batch_size = max(1, max_batch_size)
+        if self.static_batch_size is not None and max_batch_size > self.static_batch_size:
+            logger.info(f"UNet compilada com forma estática para lote {self.static_batch_size}; "
+                        f"gerando {self.static_batch_size} imagem(ns) por passada")
+            max_batch_size = self.static_batch_size
+        images = []
+        
+        for start in range(0, len(prompts), max_batch_size):
+            batch_prompts = prompts[start:start + max_batch_size]
+            batch_seeds = seeds[start:start + max_batch_size]
+            logger.info(f"Gerando lote de {len(batch_prompts)} imagens ({start + len(batch_prompts)}/{len(prompts)})")
+            
+            # Um gerador por imagem para manter a reprodutibilidade individual
+            generator = None
+            if any(s is not None for s in batch_seeds):
+                generator = []
+                for s in batch_seeds:
+                    image_generator = torch.Generator()
+                    if s is not None:
+                        image_generator.manual_seed(s)
+                    else:
+                        # Seed aleatória só neste gerador, sem mexer no RNG global do torch
+                        image_generator.seed()
+                    generator.append(image_generator)
+            
+            if hasattr(self.pipeline, "encode_prompt"):
+                embeds = [self.encode_prompt(p, negative_prompt) for p in batch_prompts]
+                prompt_kwargs = {
+                    "prompt_embeds": torch.cat([e[0] for e in embeds]),
+                    "negative_prompt_embeds": torch.cat([e[1] for e in embeds])
+                }
+            else:
+                prompt_kwargs = {
+                    "prompt": batch_prompts,
+                    "negative_prompt": [negative_prompt] * len(batch_prompts)
+                }
+            
+            images.extend(self.pipeline(
+                **prompt_kwargs,
+                width=width,
+                height=height,
+                num_inference_steps=num_inference_steps,
+                guidance_scale=guidance_scale,
+                generator=generator
+            ).images)
+        
+        return images
+    
     def generate_next_frame(self,
                           previous_image: Image.Image,
                           prompt: str,
@@ -157,57 +726,495 @@ class StableDiffusionVideoGenerator:
         if seed is not None:
             generator = torch.Generator().manual_seed(seed)
         
-        # Gerar próximo frame usando img2img
-        if hasattr(self.pipeline, 'img2img'):
-            # Pipeline com suporte a img2img
-            image = self.pipeline.img2img(
-                prompt=prompt,
-                negative_prompt=negative_prompt,
-                image=previous_image,
-                strength=strength,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                generator=generator
-            ).images[0]
-        else:
-            # Fallback: usar o pipeline principal com a imagem anterior como condição
-            # Converter imagem para tensor
-            image_tensor = self._pil_to_tensor(previous_image)
-            
-            # Gerar com a imagem anterior como condição
-            image = self.pipeline(
-                prompt=prompt,
-                negative_prompt=negative_prompt,
-                image=image_tensor,
-                strength=strength,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                generator=generator
-            ).images[0]
+        # Gerar próximo frame usando img2img (mesmos pesos do txt2img)
+        image = self.img2img_pipeline(
+            **self._prompt_kwargs(prompt, negative_prompt),
+            image=previous_image,
+            strength=strength,
+            num_inference_steps=num_inference_steps,
+            guidance_scale=guidance_scale,
+            generator=generator,
+            **self._step_callback_kwargs(self.img2img_pipeline)
+        ).images[0]
         
         logger.info("Próximo frame gerado com sucesso")
         return image
     
-    def _pil_to_tensor(self, image: Image.Image) -> torch.Tensor:
-        """Converte imagem PIL para tensor"""
-        # Converter para RGB se necessário
-        if image.mode != "RGB":
-            image = image.convert("RGB")
+    @property
+    def supports_latent_feedback(self) -> bool:
+        """Se o backend aceita latentes como entrada do img2img (apenas PyTorch)"""
+        return not self.is_openvino
+    
+    def generate_initial_latents(self, 
+                                 prompt: str,
+                                 negative_prompt: str = "",
+                                 width: int = 512,
+                                 height: int = 512,
+                                 num_inference_steps: int = 20,
+                                 guidance_scale: float = 7.5,
+                                 seed: Optional[int] = None) -> torch.Tensor:
+        """
+        Gera os latentes da imagem inicial, sem decodificar com o VAE
+        
+        Args:
+            prompt: Prompt textual para geração
+            negative_prompt: Prompt negativo
+            width: Largura da imagem
+            height: Altura da imagem
+            num_inference_steps: Número de passos de inferência
+            guidance_scale: Escala de orientação
+            seed: Semente para reprodutibilidade
+            
+        Returns:
+            Tensor de latentes (1, 4, height/8, width/8)
+        """
+        logger.info(f"Gerando latentes iniciais com prompt: {prompt}")
         
-        # Converter para numpy array
-        image_array = np.array(image)
+        generator = None
+        if seed is not None:
+            generator = torch.Generator().manual_seed(seed)
         
-        # Normalizar para [0, 1]
-        image_array = image_array.astype(np.float32) / 255.0
+        return self.pipeline(
+            **self._prompt_kwargs(prompt, negative_prompt),
+            width=width,
+            height=height,
+            num_inference_steps=num_inference_steps,
+            guidance_scale=guidance_scale,
+            generator=generator,
+            output_type="latent",
+            **self._step_callback_kwargs(self.pipeline)
+        ).images
+    
+    def generate_next_latents(self,
+                              previous_latents: Union[torch.Tensor, Image.Image],
+                              prompt: str,
+                              negative_prompt: str = "",
+                              strength: float = 0.7,
+                              num_inference_steps: int = 20,
+                              guidance_scale: float = 7.5,
+                              seed: Optional[int] = None) -> torch.Tensor:
+        """
+        Gera os latentes do próximo frame a partir dos latentes anteriores
         
-        # Converter para tensor e adicionar dimensão do batch
-        image_tensor = torch.from_numpy(image_array).permute(2, 0, 1).unsqueeze(0)
+        Os latentes anteriores são ruidosos até o nível dado por strength e
+        desruidosos pelo img2img, sem o ciclo decode/encode do VAE.
         
-        return image_tensor
+        Args:
+            previous_latents: Latentes do frame anterior (ou uma imagem PIL,
+                codificada pelo VAE apenas nesta chamada)
+            prompt: Prompt textual para o novo frame
+            negative_prompt: Prompt negativo
+            strength: Força da transformação (0.0 a 1.0)
+            num_inference_steps: Número de passos de inferência
+            guidance_scale: Escala de orientação
+            seed: Semente para reprodutibilidade
+            
+        Returns:
+            Tensor de latentes do novo frame
+        """
+        generator = None
+        if seed is not None:
+            generator = torch.Generator().manual_seed(seed)
+        
+        return self.img2img_pipeline(
+            **self._prompt_kwargs(prompt, negative_prompt),
+            image=previous_latents,
+            strength=strength,
+            num_inference_steps=num_inference_steps,
+            guidance_scale=guidance_scale,
+            generator=generator,
+            output_type="latent",
+            **self._step_callback_kwargs(self.img2img_pipeline)
+        ).images
+    
+    def decode_latents(self, latents: torch.Tensor) -> Image.Image:
+        """
+        Decodifica latentes para imagem PIL com o VAE
+        
+        Args:
+            latents: Tensor de latentes (1, 4, h, w)
+            
+        Returns:
+            Imagem PIL
+        """
+        vae = self.pipeline.vae
+        with torch.no_grad():
+            image = vae.decode(latents.to(vae.dtype) / vae.config.scaling_factor, return_dict=False)[0]
+        return self.pipeline.image_processor.postprocess(image, output_type="pil")[0]
+    
+    @staticmethod
+    def keyframe_indices(num_frames: int, keyframe_interval: int = 1) -> List[int]:
+        """
+        Índices dos frames que passam pela difusão
+        
+        Um a cada keyframe_interval frames, e sempre o último frame do vídeo.
+        
+        Args:
+            num_frames: Número total de frames
+            keyframe_interval: Distância entre keyframes (1 = todos os frames)
+            
+        Returns:
+            Lista ordenada de índices
+        """
+        if num_frames <= 0:
+            return []
+        
+        keyframe_interval = max(1, keyframe_interval)
+        indices = list(range(0, num_frames, keyframe_interval))
+        if indices[-1] != num_frames - 1:
+            indices.append(num_frames - 1)
+        return indices
+    
+    def iter_video_frames(self,
+                          initial_prompt: str,
+                          frame_prompts: List[Prompt],
+                          num_frames: int = 30,
+                          negative_prompt: str = "",
+                          width: int = 512,
+                          height: int = 512,
+                          strength: float = 0.7,
+                          num_inference_steps: int = 20,
+                          guidance_scale: float = 7.5,
+                          seed: Optional[int] = None,
+                          latent_feedback: bool = False,
+                          async_decode: bool = False,
+                          keyframe_interval: int = 1,
+                          interpolation: str = "flow",
+                          init_image: Optional[Image.Image] = None,
+                          progress_callback: Optional[ProgressCallback] = None,
+                          checkpoint: Optional[GenerationCheckpoint] = None,
+                          resume_from: int = 0,
+                          effective_steps: Optional[int] = None,
+                          schedule: Optional[FrameSchedule] = None) -> Iterator[Image.Image]:
+        """
+        Gera a sequência de frames do vídeo de forma incremental
+        
+        Cada frame é entregue assim que fica pronto, e apenas o frame anterior
+        é mantido em memória para a retroalimentação. Isso permite que o
+        consumidor (ex: StreamingVideoWriter) codifique o vídeo durante a geração.
+        
+        Com keyframe_interval > 1 apenas os keyframes passam pela difusão
+        (encadeados entre si por img2img); os frames intermediários são
+        sintetizados por interpolação, que custa uma fração de uma difusão.
+        
+        Com o cache de frames ativo e seed fixa, os keyframes iniciais já
+        gerados por outro job com o mesmo começo (mesma imagem, modelo,
+        scheduler, parâmetros e prompts até ali) são lidos do cache, e só o
+        restante passa pela difusão; um pedido idêntico não difunde nada.
+        
+        Os frames img2img executam apenas strength * num_inference_steps
+        passos; o progresso e o ETA contam esses passos reais (ver
+        step_plan.py). Com effective_steps, os passos do img2img são
+        ajustados para que cada frame execute esse número de passos.
+        
+        Com um cronograma (ver frame_schedule.py), prompt, strength,
+        guidance e seed de cada keyframe vêm dele em vez de initial_prompt,
+        frame_prompts, strength, guidance_scale e seed.
+        
+        Args:
+            initial_prompt: Prompt para a imagem inicial
+            frame_prompts: Lista de prompts para cada frame (texto ou {texto: peso})
+            num_frames: Número total de frames
+            negative_prompt: Prompt negativo
+            width: Largura das imagens
+            height: Altura das imagens (com buckets, o tamanho é ajustado ao
+                bucket mais próximo; ver use_resolution)
+            strength: Força da transformação entre frames (ou entre keyframes)
+            num_inference_steps: Número de passos de inferência (todos
+                executados no txt2img do primeiro frame)
+            guidance_scale: Escala de orientação
+            seed: Semente inicial
+            latent_feedback: Retroalimentar com os latentes do frame anterior,
+                decodificando com o VAE apenas para a saída
+            async_decode: Com latent_feedback, decodificar numa thread de fundo
+            keyframe_interval: Difundir apenas 1 a cada N frames
+            interpolation: Método para os frames intermediários ('flow' ou 'slerp')
+            init_image: Imagem de partida; o primeiro frame passa a ser um
+                img2img dela (com initial_prompt) em vez de um txt2img
+            progress_callback: Função chamada com eventos de passo e de frame
+                (ver progress.py); pode levantar GenerationCancelled
+            checkpoint: Grava o estado da cadeia após cada keyframe (ver checkpoint.py)
+            resume_from: Índice do primeiro frame a entregar; com checkpoint a
+                cadeia retoma do último keyframe salvo antes dele, senão é
+                regenerada desde o início e os frames anteriores descartados
+            effective_steps: Passos reais por frame img2img (None: usar
+                num_inference_steps, subindo-o só se nenhum passo rodaria)
+            schedule: Cronograma por frame (com pelo menos num_frames frames)
+            
+        Yields:
+            Imagens PIL, uma por frame, em ordem (a partir de resume_from)
+        """
+        logger.info(f"Iniciando geração de {num_frames} frames")
+        
+        if num_frames <= 0:
+            return
+        
+        if interpolation not in INTERPOLATION_METHODS:
+            raise ValueError(f"Interpolação não suportada: {interpolation}. Disponíveis: {INTERPOLATION_METHODS}")
+        
+        width, height = self.use_resolution(width, height)
+        
+        keyframes = self.keyframe_indices(num_frames, keyframe_interval)
+        if len(keyframes) < num_frames:
+            logger.info(f"Modo keyframe: {len(keyframes)} difusões, "
+                        f"{num_frames - len(keyframes)} frames interpolados ({interpolation})")
+        
+        # slerp interpola latentes, então exige a cadeia em espaço latente
+        if interpolation == "slerp" and len(keyframes) < num_frames:
+            if self.supports_latent_feedback:
+                latent_feedback = True
+            else:
+                logger.warning("Interpolação slerp requer latentes (indisponível com OpenVINO), usando flow")
+                interpolation = "flow"
+        
+        use_latents = latent_feedback and self.supports_latent_feedback
+        if latent_feedback and not use_latents:
+            logger.warning("Retroalimentação latente não suportada com OpenVINO, usando imagens")
+        
+        if schedule is not None and len(schedule) < num_frames:
+            raise ValueError(f"Cronograma com {len(schedule)} frames para um vídeo de {num_frames}")
+        
+        def frame_settings(index: int) -> Dict[str, Any]:
+            """Prompt, strength, guidance e seed de um keyframe"""
+            if schedule is not None:
+                return schedule.frame_settings(index)
+            return {
+                "prompt": initial_prompt if index == 0 or index >= len(frame_prompts) else frame_prompts[index],
+                "strength": strength,
+                "guidance": guidance_scale,
+                # Seed de cada keyframe segue o índice do frame (seed + i)
+                "seed": seed + index if seed is not None else None
+            }
+        
+        settings = {index: frame_settings(index) for index in keyframes}
+        
+        # Passos do img2img: strength * passos precisa dar pelo menos um passo real
+        keyframe_steps = plan_keyframe_steps(keyframes, num_inference_steps,
+                                             [settings[index]["strength"] for index in keyframes],
+                                             effective_steps, init_image is not None)
+        if len(keyframes) > 1:
+            img2img_steps = [keyframe_steps[index][1] for index in keyframes[1:]]
+            steps_range = (f"{min(img2img_steps)}" if min(img2img_steps) == max(img2img_steps)
+                           else f"{min(img2img_steps)}-{max(img2img_steps)}")
+            logger.info(f"Passos por keyframe: {keyframe_steps[keyframes[0]][1]} no primeiro, "
+                        f"{steps_range} nos img2img")
+        
+        # Parâmetros que determinam a cadeia de frames (chave do cache e do checkpoint)
+        chain_params = {
+            "model_id": self.model_id,
+            "quantization": self.quantization,
+            "lora": self.lora,
+            "initial_prompt": initial_prompt,
+            "frame_prompts": frame_prompts[:num_frames],
+            "num_frames": num_frames,
+            "negative_prompt": negative_prompt,
+            "size": [width, height],
+            "strength": strength,
+            "num_inference_steps": num_inference_steps,
+            "effective_steps": effective_steps,
+            "schedule": schedule.digest() if schedule is not None else None,
+            "guidance_scale": guidance_scale,
+            "seed": seed,
+            "latent_feedback": use_latents,
+            "keyframe_interval": keyframe_interval,
+            "interpolation": interpolation,
+            "init_image": image_digest(init_image)
+        }
+        
+        decoder = None
+        if use_latents:
+            decoder = _LatentDecoder(self.decode_latents, background=async_decode)
+        
+        previous = None
+        previous_image = None
+        previous_index = 0
+        
+        if checkpoint is not None:
+            checkpoint.begin(params_hash(chain_params), self.scheduler_config(), resume=resume_from > 0)
+        
+        if resume_from > 0:
+            restored = checkpoint.load_keyframe(resume_from) if checkpoint is not None else None
+            if restored is not None:
+                self._restore_scheduler(checkpoint.load_state()["scheduler"])
+                torch.set_rng_state(restored["rng_state"])
+                previous = restored["latents"] if use_latents else restored["image"]
+                previous_index = restored["frame_index"]
+                if not use_latents:
+                    previous_image = previous
+                elif interpolation == "flow" and len(keyframes) < num_frames:
+                    previous_image = self.decode_latents(previous)
+                logger.info(f"Retomando do keyframe {previous_index} (checkpoint); "
+                            f"entrega a partir do frame {resume_from}")
+            else:
+                logger.warning(f"Sem checkpoint antes do frame {resume_from}; "
+                               f"regenerando desde o início e descartando os frames já feitos")
+        
+        # Keyframes ainda por fazer (após um checkpoint restaurado)
+        if previous is not None:
+            keyframes_left = [index for index in keyframes if index > previous_index]
+        else:
+            keyframes_left = keyframes
+        
+        # Segmentos de keyframe em cache, com chaves encadeadas (ver frame_cache.py):
+        # jobs com o mesmo início reaproveitam o prefixo e só difundem o restante.
+        # Sem seed a geração não é reprodutível, então não há o que reaproveitar
+        segment_keys = {}
+        cached_keyframes = set()
+        if self.frame_cache is not None and all(settings[index]["seed"] is not None for index in keyframes):
+            base_params = {name: value for name, value in chain_params.items()
+                           if name not in ("frame_prompts", "num_frames", "schedule")}
+            base_params["scheduler"] = self.scheduler_config()
+            # Com cronograma, cada elo da cadeia leva todos os valores do keyframe:
+            # cronogramas com o mesmo começo compartilham o prefixo
+            prompts = [settings[index] if schedule is not None else settings[index]["prompt"]
+                       for index in keyframes]
+            keys = self.frame_cache.chain_keys(base_params, keyframes, prompts)
+            segment_keys = dict(zip(keyframes, keys))
+            cached_keyframes = set(keyframes[:self.frame_cache.prefix_length(keys)])
+            if cached_keyframes:
+                logger.info(f"Prefixo em cache: {len(cached_keyframes)}/{len(keyframes)} keyframes")
+        
+        diffused = [index for index in keyframes_left if index not in cached_keyframes]
+        tracker = ProgressTracker(num_frames, sum(keyframe_steps[index][1] for index in diffused),
+                                  progress_callback, frames_done=min(resume_from, num_frames))
+        
+        # Índice do próximo frame a sair da cadeia; os anteriores a resume_from já existem
+        next_index = previous_index + 1 if previous is not None else 0
+        # Frames do segmento em formação e latentes dos keyframes gerados nesta execução
+        segment_frames = []
+        pending_segments = {}
+        
+        def deliver(frames):
+            nonlocal next_index, segment_frames
+            for frame in frames:
+                index = next_index
+                next_index += 1
+                if segment_keys:
+                    segment_frames.append(frame)
+                    if index in segment_keys:
+                        if index in pending_segments:
+                            self.frame_cache.put_segment(segment_keys[index], segment_frames,
+                                                         pending_segments.pop(index))
+                        segment_frames = []
+                if index < resume_from:
+                    continue
+                tracker.frame_done()
+                yield frame
+        
+        self._progress = tracker
+        try:
+            for frame_index in keyframes_left:
+                if frame_index in cached_keyframes:
+                    segment = self.frame_cache.get_segment(segment_keys[frame_index])
+                    if segment is not None:
+                        for image in segment["frames"]:
+                            yield from deliver(decoder.submit_ready(image) if decoder is not None else [image])
+                        # O último frame do segmento é o próprio keyframe
+                        previous = segment["latents"] if use_latents else segment["frames"][-1]
+                        previous_image = segment["frames"][-1]
+                        previous_index = frame_index
+                        continue
+                    # Removido do cache neste meio tempo: gerar normalmente
+                
+                keyframe = settings[frame_index]
+                frame_seed = keyframe["seed"]
+                scheduled_steps, executed_steps = keyframe_steps[frame_index]
+                tracker.start_keyframe(frame_index, executed_steps)
+                
+                # Gerar keyframe (imagem ou latentes)
+                if previous is None and init_image is not None:
+                    start_image = self.fit_input_image(init_image, width, height)
+                    current = (self.generate_next_latents if use_latents else self.generate_next_frame)(
+                        start_image,
+                        prompt=keyframe["prompt"],
+                        negative_prompt=negative_prompt,
+                        strength=keyframe["strength"],
+                        num_inference_steps=scheduled_steps,
+                        guidance_scale=keyframe["guidance"],
+                        seed=frame_seed
+                    )
+                elif previous is None:
+                    current = (self.generate_initial_latents if use_latents else self.generate_initial_image)(
+                        prompt=keyframe["prompt"],
+                        negative_prompt=negative_prompt,
+                        width=width,
+                        height=height,
+                        num_inference_steps=scheduled_steps,
+                        guidance_scale=keyframe["guidance"],
+                        seed=frame_seed
+                    )
+                elif use_latents:
+                    current = self.generate_next_latents(
+                        previous_latents=previous,
+                        prompt=keyframe["prompt"],
+                        negative_prompt=negative_prompt,
+                        strength=keyframe["strength"],
+                        num_inference_steps=scheduled_steps,
+                        guidance_scale=keyframe["guidance"],
+                        seed=frame_seed
+                    )
+                else:
+                    current = self.generate_next_frame(
+                        previous_image=previous,
+                        prompt=keyframe["prompt"],
+                        negative_prompt=negative_prompt,
+                        strength=keyframe["strength"],
+                        num_inference_steps=scheduled_steps,
+                        guidance_scale=keyframe["guidance"],
+                        seed=frame_seed
+                    )
+                
+                if checkpoint is not None:
+                    checkpoint.save_keyframe(frame_index, current, frame_seed)
+                if segment_keys:
+                    pending_segments[frame_index] = current if use_latents else None
+                
+                # Flow precisa dos pixels do keyframe; decodificar uma única vez
+                current_image = None
+                if not use_latents:
+                    current_image = current
+                elif interpolation == "flow" and len(keyframes) < num_frames:
+                    current_image = self.decode_latents(current)
+                
+                # Sintetizar frames intermediários entre o keyframe anterior e este
+                between = range(previous_index + 1, frame_index)
+                if previous is not None and len(between) > 0:
+                    span = frame_index - previous_index
+                    positions = [(i - previous_index) / span for i in between]
+                    
+                    if interpolation == "slerp":
+                        for t in positions:
+                            yield from deliver(decoder.submit(slerp(previous, current, t)))
+                    else:
+                        for image in flow_interpolate(previous_image, current_image, positions):
+                            yield from deliver(decoder.submit_ready(image) if decoder is not None else [image])
+                
+                # Entregar o keyframe
+                if decoder is None:
+                    yield from deliver([current])
+                elif current_image is not None:
+                    yield from deliver(decoder.submit_ready(current_image))
+                else:
+                    yield from deliver(decoder.submit(current))
+                
+                logger.info(f"Frame {frame_index+1}/{num_frames} gerado")
+                
+                previous = current
+                previous_image = current_image
+                previous_index = frame_index
+            
+            if decoder is not None:
+                yield from deliver(decoder.flush())
+        finally:
+            self._progress = None
+            if decoder is not None:
+                decoder.shutdown()
+        
+        logger.info("Geração de frames concluída")
     
     def generate_video_frames(self,
                             initial_prompt: str,
-                            frame_prompts: List[str],
+                            frame_prompts: List[Prompt],
                             num_frames: int = 30,
                             negative_prompt: str = "",
                             width: int = 512,
@@ -215,10 +1222,23 @@ class StableDiffusionVideoGenerator:
                             strength: float = 0.7,
                             num_inference_steps: int = 20,
                             guidance_scale: float = 7.5,
-                            seed: Optional[int] = None) -> List[Image.Image]:
+                            seed: Optional[int] = None,
+                            latent_feedback: bool = False,
+                            async_decode: bool = False,
+                            keyframe_interval: int = 1,
+                            interpolation: str = "flow",
+                            init_image: Optional[Image.Image] = None,
+                            progress_callback: Optional[ProgressCallback] = None,
+                            checkpoint: Optional[GenerationCheckpoint] = None,
+                            resume_from: int = 0,
+                            effective_steps: Optional[int] = None,
+                            schedule: Optional[FrameSchedule] = None) -> List[Image.Image]:
         """
         Gera uma sequência de frames para o vídeo
         
+        Mantém todos os frames em memória; para vídeos longos prefira
+        iter_video_frames junto com um StreamingVideoWriter.
+        
         Args:
             initial_prompt: Prompt para a imagem inicial
             frame_prompts: Lista de prompts para cada frame
@@ -230,59 +1250,48 @@ class StableDiffusionVideoGenerator:
             num_inference_steps: Número de passos de inferência
             guidance_scale: Escala de orientação
             seed: Semente inicial
+            latent_feedback: Retroalimentar com latentes em vez de imagens
+            async_decode: Decodificar latentes numa thread de fundo
+            keyframe_interval: Difundir apenas 1 a cada N frames
+            interpolation: Método para os frames intermediários ('flow' ou 'slerp')
+            init_image: Imagem de partida opcional para o primeiro frame
+            progress_callback: Função chamada com eventos de progresso
+            checkpoint: Checkpoint da cadeia de keyframes (ver checkpoint.py)
+            resume_from: Primeiro frame a gerar ao retomar um checkpoint
+            effective_steps: Passos reais por frame img2img (ver step_plan.py)
+            schedule: Cronograma por frame (ver frame_schedule.py)
             
         Returns:
-            Lista de imagens PIL
+            Lista de imagens PIL (a partir de resume_from)
         """
-        logger.info(f"Iniciando geração de {num_frames} frames")
-        
-        frames = []
-        
-        # Gerar imagem inicial
-        initial_image = self.generate_initial_image(
-            prompt=initial_prompt,
+        return list(self.iter_video_frames(
+            initial_prompt=initial_prompt,
+            frame_prompts=frame_prompts,
+            num_frames=num_frames,
             negative_prompt=negative_prompt,
             width=width,
             height=height,
+            strength=strength,
             num_inference_steps=num_inference_steps,
             guidance_scale=guidance_scale,
-            seed=seed
-        )
-        frames.append(initial_image)
-        
-        # Gerar frames subsequentes
-        current_image = initial_image
-        current_seed = seed
-        
-        for i in range(1, num_frames):
-            # Usar prompt específico ou o inicial
-            frame_prompt = frame_prompts[i] if i < len(frame_prompts) else initial_prompt
-            
-            # Incrementar seed para variação
-            if current_seed is not None:
-                current_seed += 1
-            
-            # Gerar próximo frame
-            next_frame = self.generate_next_frame(
-                previous_image=current_image,
-                prompt=frame_prompt,
-                negative_prompt=negative_prompt,
-                strength=strength,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                seed=current_seed
-            )
-            
-            frames.append(next_frame)
-            current_image = next_frame
-            
-            logger.info(f"Frame {i+1}/{num_frames} gerado")
-        
-        logger.info("Geração de frames concluída")
-        return frames
+            seed=seed,
+            latent_feedback=latent_feedback,
+            async_decode=async_decode,
+            keyframe_interval=keyframe_interval,
+            interpolation=interpolation,
+            init_image=init_image,
+            progress_callback=progress_callback,
+            checkpoint=checkpoint,
+            resume_from=resume_from,
+            effective_steps=effective_steps,
+            schedule=schedule
+        ))
     
     def cleanup(self):
         """Limpa recursos do pipeline"""
+        if self.img2img_pipeline is not None:
+            del self.img2img_pipeline
+            self.img2img_pipeline = None
         if self.pipeline is not None:
             del self.pipeline
             self.pipeline = None
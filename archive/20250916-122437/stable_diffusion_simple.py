@@ -10,6 +10,8 @@ import cv2
 from typing import Optional, Tuple, List
 import logging
 
+from config import Config
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -105,6 +107,70 @@ class StableDiffusionVideoGenerator:
         logger.info("Imagem inicial gerada com sucesso")
         return image
     
+    def generate_images_batch(self,
+                              prompts: List[str],
+                              seeds: Optional[List[Optional[int]]] = None,
+                              negative_prompt: str = "",
+                              width: int = 512,
+                              height: int = 512,
+                              num_inference_steps: int = 20,
+                              guidance_scale: float = 7.5,
+                              max_batch_size: int = Config.MAX_BATCH_SIZE) -> List[Image.Image]:
+        """
+        Gera várias imagens independentes em lotes na UNet
+        
+        Args:
+            prompts: Lista de prompts, um por imagem
+            seeds: Lista de seeds (mesmo tamanho de prompts) ou None
+            negative_prompt: Prompt negativo comum a todas as imagens
+            width: Largura das imagens
+            height: Altura das imagens
+            num_inference_steps: Número de passos de inferência
+            guidance_scale: Escala de orientação
+            max_batch_size: Número máximo de imagens por passada da UNet
+                (padrão: Config.MAX_BATCH_SIZE)
+            
+        Returns:
+            Lista de imagens PIL, na mesma ordem dos prompts
+        """
+        if seeds is None:
+            seeds = [None] * len(prompts)
+        if len(seeds) != len(prompts):
+            raise ValueError("prompts e seeds devem ter o mesmo tamanho")
+        
+        max_batch_size = max(1, max_batch_size)
+        images = []
+        
+        for start in range(0, len(prompts), max_batch_size):
+            batch_prompts = prompts[start:start + max_batch_size]
+            batch_seeds = seeds[start:start + max_batch_size]
+            logger.info(f"Gerando lote de {len(batch_prompts)} imagens ({start + len(batch_prompts)}/{len(prompts)})")
+            
+            # Um gerador por imagem para manter a reprodutibilidade individual
+            generator = None
+            if any(s is not None for s in batch_seeds):
+                generator = []
+                for s in batch_seeds:
+                    image_generator = torch.Generator()
+                    if s is not None:
+                        image_generator.manual_seed(s)
+                    else:
+                        # Seed aleatória só neste gerador, sem mexer no RNG global do torch
+                        image_generator.seed()
+                    generator.append(image_generator)
+            
+            images.extend(self.pipeline(
+                prompt=batch_prompts,
+                negative_prompt=[negative_prompt] * len(batch_prompts),
+                width=width,
+                height=height,
+                num_inference_steps=num_inference_steps,
+                guidance_scale=guidance_scale,
+                generator=generator
+            ).images)
+        
+        return images
+    
     def generate_next_frame(self,
                           previous_image: Image.Image,
                           prompt: str,
@@ -158,10 +224,14 @@ class StableDiffusionVideoGenerator:
                             strength: float = 0.7,
                             num_inference_steps: int = 20,
                             guidance_scale: float = 7.5,
-                            seed: Optional[int] = None) -> List[Image.Image]:
+                            seed: Optional[int] = None,
+                            max_batch_size: int = Config.MAX_BATCH_SIZE) -> List[Image.Image]:
         """
         Gera uma sequência de frames para o vídeo
         
+        Nesta versão os frames não dependem do anterior, então são gerados
+        em lotes de até max_batch_size imagens.
+        
         Args:
             initial_prompt: Prompt para a imagem inicial
             frame_prompts: Lista de prompts para cada frame
@@ -169,57 +239,34 @@ class StableDiffusionVideoGenerator:
             negative_prompt: Prompt negativo
             width: Largura das imagens
             height: Altura das imagens
-            strength: Força da transformação entre frames
+            strength: Força da transformação entre frames (não usado nesta versão)
             num_inference_steps: Número de passos de inferência
             guidance_scale: Escala de orientação
             seed: Semente inicial
+            max_batch_size: Número máximo de frames por lote (padrão: Config.MAX_BATCH_SIZE)
             
         Returns:
             Lista de imagens PIL
         """
         logger.info(f"Iniciando geração de {num_frames} frames")
         
-        frames = []
+        # Frame 0 usa o prompt inicial; os demais o prompt específico ou o inicial
+        prompts = [initial_prompt] + [
+            frame_prompts[i] if i < len(frame_prompts) else initial_prompt
+            for i in range(1, num_frames)
+        ]
+        seeds = [seed + i if seed is not None else None for i in range(num_frames)]
         
-        # Gerar imagem inicial
-        initial_image = self.generate_initial_image(
-            prompt=initial_prompt,
+        frames = self.generate_images_batch(
+            prompts=prompts[:num_frames],
+            seeds=seeds,
             negative_prompt=negative_prompt,
             width=width,
             height=height,
             num_inference_steps=num_inference_steps,
             guidance_scale=guidance_scale,
-            seed=seed
+            max_batch_size=max_batch_size
         )
-        frames.append(initial_image)
-        
-        # Gerar frames subsequentes
-        current_image = initial_image
-        current_seed = seed
-        
-        for i in range(1, num_frames):
-            # Usar prompt específico ou o inicial
-            frame_prompt = frame_prompts[i] if i < len(frame_prompts) else initial_prompt
-            
-            # Incrementar seed para variação
-            if current_seed is not None:
-                current_seed += 1
-            
-            # Gerar próximo frame
-            next_frame = self.generate_next_frame(
-                previous_image=current_image,
-                prompt=frame_prompt,
-                negative_prompt=negative_prompt,
-                strength=strength,
-                num_inference_steps=num_inference_steps,
-                guidance_scale=guidance_scale,
-                seed=current_seed
-            )
-            
-            frames.append(next_frame)
-            current_image = next_frame
-            
-            logger.info(f"Frame {i+1}/{num_frames} gerado")
         
         logger.info("Geração de frames concluída")
         return frames
@@ -0,0 +1,103 @@
+"""
+Contagem dos passos de difusão que realmente rodam em cada frame
+
+No img2img o diffusers ruidosa a imagem de entrada até o nível dado por
+strength e só executa o final da agenda: com num_inference_steps=20 e
+strength=0.35 rodam int(20 * 0.35) = 7 passos, não 20. Só o primeiro frame
+(txt2img) paga todos os passos. Este módulo:
+
+- calcula os passos efetivos de cada keyframe, para o ETA, os eventos de
+  progresso e o planejamento de capacidade (main.py --plan)
+- escolhe num_inference_steps para que cada frame img2img rode um número
+  fixo de passos reais (effective_steps), qualquer que seja a strength
+- evita frames sem nenhum passo (strength * steps < 1), que o diffusers
+  rejeita, subindo os passos até haver pelo menos um
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+def img2img_steps(num_inference_steps: int, strength: float) -> int:
+    """Passos que o img2img executa (mesma conta do get_timesteps do diffusers)"""
+    return min(int(num_inference_steps * strength), num_inference_steps)
+
+def steps_for_strength(effective_steps: int, strength: float) -> int:
+    """
+    Menor num_inference_steps com o qual o img2img executa effective_steps passos
+
+    Args:
+        effective_steps: Passos reais desejados por frame
+        strength: Força do img2img (0.0 a 1.0)
+
+    Returns:
+        Valor de num_inference_steps a passar ao pipeline
+    """
+    if strength <= 0:
+        raise ValueError(f"strength deve ser maior que 0 para o img2img: {strength}")
+
+    effective_steps = max(1, effective_steps)
+    steps = max(effective_steps, math.ceil(effective_steps / min(strength, 1.0)) - 1)
+    # Arredondamento de ponto flutuante: conferir com a mesma conta do pipeline
+    while img2img_steps(steps, strength) < effective_steps:
+        steps += 1
+    return steps
+
+def resolve_img2img_steps(num_inference_steps: int, strength: float,
+                          effective_steps: Optional[int] = None) -> int:
+    """
+    num_inference_steps usado nos frames img2img
+
+    Args:
+        num_inference_steps: Passos configurados (usados também no txt2img)
+        strength: Força do img2img
+        effective_steps: Passos reais desejados por frame (None: manter
+            num_inference_steps, subindo apenas se nenhum passo rodaria)
+
+    Returns:
+        Passos a passar ao pipeline de img2img
+    """
+    if effective_steps:
+        return steps_for_strength(effective_steps, strength)
+
+    if img2img_steps(num_inference_steps, strength) < 1:
+        raised = steps_for_strength(1, strength)
+        logger.warning(f"strength {strength} com {num_inference_steps} passos não executaria nenhum passo "
+                       f"no img2img; usando {raised} passos")
+        return raised
+
+    return num_inference_steps
+
+def plan_keyframe_steps(keyframes: List[int],
+                        num_inference_steps: int,
+                        strengths: Sequence[float],
+                        effective_steps: Optional[int] = None,
+                        init_image: bool = False) -> Dict[int, Tuple[int, int]]:
+    """
+    Passos de difusão de cada keyframe
+
+    O primeiro keyframe é um txt2img com todos os passos (ou, com imagem de
+    partida, um img2img); os demais são img2img do keyframe anterior.
+
+    Args:
+        keyframes: Índices dos keyframes
+        num_inference_steps: Passos configurados
+        strengths: Strength de cada keyframe (um cronograma pode variá-la)
+        effective_steps: Passos reais desejados por frame img2img
+        init_image: Se o primeiro keyframe parte de uma imagem
+
+    Returns:
+        {índice do keyframe: (passos a passar ao pipeline, passos executados)}
+    """
+    plan = {}
+    scheduled_steps = {}
+    for position, (index, strength) in enumerate(zip(keyframes, strengths)):
+        if position == 0 and not init_image:
+            plan[index] = (num_inference_steps, num_inference_steps)
+            continue
+        if strength not in scheduled_steps:
+            scheduled_steps[strength] = resolve_img2img_steps(num_inference_steps, strength, effective_steps)
+        plan[index] = (scheduled_steps[strength], img2img_steps(scheduled_steps[strength], strength))
+    return plan
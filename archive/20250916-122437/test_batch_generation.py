@@ -0,0 +1,55 @@
+"""
+Testes da geração de imagens em lote (generate_images_batch)
+"""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+class FakePipeline:
+    """Pipeline txt2img que registra o tamanho de cada lote"""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, prompt, negative_prompt, width, height, generator=None, **kwargs):
+        self.batches.append(len(prompt))
+        return SimpleNamespace(images=[Image.new("RGB", (width, height)) for _ in prompt])
+
+def batch_generator(fake_generator, is_openvino, static_shape):
+    generator = fake_generator()
+    generator.pipeline = FakePipeline()
+    generator.async_requests = None
+    generator.is_openvino = is_openvino
+    generator.static_shape = static_shape
+    return generator
+
+def test_static_shape_clamps_batch(fake_generator):
+    generator = batch_generator(fake_generator, is_openvino=True, static_shape=(64, 64))
+    images = generator.generate_images_batch(["a"] * 5, seeds=list(range(5)), width=64, height=64,
+                                             max_batch_size=4)
+
+    assert generator.static_batch_size == 1
+    assert generator.pipeline.batches == [1] * 5
+    assert len(images) == 5
+
+@pytest.mark.parametrize("is_openvino, static_shape", [(True, None), (False, (64, 64))])
+def test_dynamic_shape_keeps_batch(fake_generator, is_openvino, static_shape):
+    generator = batch_generator(fake_generator, is_openvino, static_shape)
+    generator.generate_images_batch(["a"] * 5, width=64, height=64, max_batch_size=4)
+
+    assert generator.static_batch_size is None
+    assert generator.pipeline.batches == [4, 1]
+
+def test_default_batch_comes_from_config(fake_generator):
+    from config import Config
+
+    generator = batch_generator(fake_generator, is_openvino=False, static_shape=None)
+    generator.generate_images_batch(["a"] * (Config.MAX_BATCH_SIZE + 1), width=64, height=64)
+
+    assert generator.pipeline.batches == [Config.MAX_BATCH_SIZE, 1]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
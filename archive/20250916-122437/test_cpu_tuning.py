@@ -0,0 +1,49 @@
+"""
+Testes da afinidade e divisão de núcleos (cpu_tuning.py)
+"""
+
+import sys
+
+import pytest
+
+import cpu_tuning
+from cpu_tuning import parse_cpu_list, partition_cpus, resolve_affinity
+
+@pytest.mark.parametrize("text, cpus", [
+    ("0", [0]),
+    ("0-3", [0, 1, 2, 3]),
+    ("0-3,8,10-11", [0, 1, 2, 3, 8, 10, 11]),
+    (" 4, 0-1 ,\n", [0, 1, 4]),
+    ("2-3,0-3", [0, 1, 2, 3]),
+    ("", []),
+])
+def test_parse_cpu_list(text, cpus):
+    assert parse_cpu_list(text) == cpus
+
+@pytest.mark.parametrize("text", ["a", "0-", "1-2-3", "-1", "0;1", "5-3"])
+def test_parse_cpu_list_invalid(text):
+    with pytest.raises(ValueError):
+        parse_cpu_list(text)
+
+def test_resolve_affinity(monkeypatch):
+    monkeypatch.setattr(cpu_tuning, "numa_nodes", lambda: {0: [0, 1], 1: [2, 3]})
+    assert resolve_affinity(None) is None
+    assert resolve_affinity("none") is None
+    assert resolve_affinity("numa:1") == [2, 3]
+    assert resolve_affinity("0-1,3") == [0, 1, 3]
+    with pytest.raises(ValueError):
+        resolve_affinity("numa:2")
+
+def test_partition_cpus_single_node(monkeypatch):
+    monkeypatch.setattr(cpu_tuning, "numa_nodes", lambda: {0: list(range(8))})
+    assert partition_cpus(2, list(range(8))) == [[0, 1, 2, 3], [4, 5, 6, 7]]
+    # Mais workers que núcleos: cada um recebe ao menos um núcleo
+    assert partition_cpus(3, [0, 1]) == [[0], [1], [0, 1]]
+
+def test_partition_cpus_does_not_cross_numa_nodes(monkeypatch):
+    monkeypatch.setattr(cpu_tuning, "numa_nodes", lambda: {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]})
+    blocks = partition_cpus(4, list(range(8)))
+    assert blocks == [[0, 1], [2, 3], [4, 5], [6, 7]]
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,153 @@
+"""
+Testes do cache de frames (chaves de prefixo encadeadas) e da retomada por checkpoint
+
+A cadeia roda num gerador sem modelo (FakeGenerator, em conftest.py). O
+teste de ponta a ponta com um modelo real só roda com um modelo pequeno do
+Stable Diffusion em SD_TEST_MODEL (diretório local ou ID do Hugging Face).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from checkpoint import GenerationCheckpoint
+from frame_cache import FrameCache
+
+VIDEO = {
+    "initial_prompt": "a cat",
+    "num_frames": 4,
+    "width": 64,
+    "height": 64,
+    "num_inference_steps": 4,
+    "strength": 0.5,
+    "seed": 42
+}
+PROMPTS = ["a cat", "a cat walking", "a cat running", "a cat jumping"]
+
+def run(generator, frame_prompts=PROMPTS, **kwargs):
+    """Gera o vídeo e devolve (frames como arrays, difusões executadas)"""
+    generator.calls = []
+    params = dict(VIDEO, **kwargs)
+    frames = [np.array(frame) for frame in generator.iter_video_frames(frame_prompts=frame_prompts, **params)]
+    return frames, len(generator.calls)
+
+def same_frames(first, second):
+    return len(first) == len(second) and all(np.array_equal(a, b) for a, b in zip(first, second))
+
+def test_chain_keys_depend_on_prefix():
+    base = {"model_id": "m", "seed": 1}
+    keys = FrameCache.chain_keys(base, [0, 1, 2], ["a", "b", "c"])
+    changed_tail = FrameCache.chain_keys(base, [0, 1, 2], ["a", "b", "x"])
+    changed_head = FrameCache.chain_keys(base, [0, 1, 2], ["x", "b", "c"])
+    other_base = FrameCache.chain_keys(dict(base, seed=2), [0, 1, 2], ["a", "b", "c"])
+
+    assert len(set(keys)) == 3
+    assert keys == FrameCache.chain_keys(dict(base), [0, 1, 2], ["a", "b", "c"])
+    assert changed_tail[:2] == keys[:2] and changed_tail[2] != keys[2]
+    # Um elo diferente invalida todos os seguintes
+    assert all(a != b for a, b in zip(changed_head, keys))
+    assert all(a != b for a, b in zip(other_base, keys))
+
+def test_prefix_length(tmp_path):
+    cache = FrameCache(str(tmp_path))
+    keys = FrameCache.chain_keys({"seed": 1}, [0, 1, 2], ["a", "b", "c"])
+    frame = Image.new("RGB", (8, 8))
+
+    assert cache.prefix_length(keys) == 0
+    cache.put_segment(keys[0], [frame])
+    cache.put_segment(keys[2], [frame])
+    assert cache.prefix_length(keys) == 1
+    cache.put_segment(keys[1], [frame])
+    assert cache.prefix_length(keys) == 3
+
+@pytest.mark.parametrize("latent_feedback", [False, True])
+def test_identical_run_hits_cache(fake_generator, latent_feedback):
+    """A segunda execução idêntica não difunde nada"""
+    generator = fake_generator(frame_cache=True)
+    first, first_calls = run(generator, latent_feedback=latent_feedback)
+    assert first_calls == VIDEO["num_frames"]
+
+    second, second_calls = run(generator, latent_feedback=latent_feedback)
+    assert second_calls == 0
+    assert same_frames(first, second)
+
+@pytest.mark.parametrize("latent_feedback", [False, True])
+def test_changed_tail_prompt_misses_only_suffix(fake_generator, latent_feedback):
+    """Mudar só o prompt do último frame regenera apenas esse keyframe"""
+    generator = fake_generator(frame_cache=True)
+    first, _ = run(generator, latent_feedback=latent_feedback)
+
+    changed, calls = run(generator, frame_prompts=PROMPTS[:-1] + ["a dog jumping"],
+                         latent_feedback=latent_feedback)
+    assert generator.calls == [("img2img", "a dog jumping", VIDEO["seed"] + 3)]
+    assert same_frames(first[:-1], changed[:-1])
+    assert not np.array_equal(first[-1], changed[-1])
+
+def test_interpolated_segments_are_cached(fake_generator):
+    """Com keyframes, o segmento inclui os frames interpolados até o keyframe"""
+    generator = fake_generator(frame_cache=True)
+    first, first_calls = run(generator, num_frames=7, keyframe_interval=3, frame_prompts=[])
+    assert first_calls == 3
+
+    second, second_calls = run(generator, num_frames=7, keyframe_interval=3, frame_prompts=[])
+    assert second_calls == 0
+    assert same_frames(first, second)
+
+def test_unseeded_run_skips_cache(fake_generator):
+    generator = fake_generator(frame_cache=True)
+    run(generator, seed=None)
+    _, calls = run(generator, seed=None)
+    assert calls == VIDEO["num_frames"]
+
+@pytest.mark.parametrize("latent_feedback", [False, True])
+def test_resume_matches_full_run(fake_generator, tmp_path, latent_feedback):
+    """Retomar do checkpoint entrega os mesmos frames que a execução completa"""
+    generator = fake_generator()
+    checkpoint = GenerationCheckpoint(str(tmp_path / "checkpoint"))
+    full, _ = run(generator, checkpoint=checkpoint, latent_feedback=latent_feedback)
+
+    resumed, calls = run(generator, checkpoint=checkpoint, resume_from=2, latent_feedback=latent_feedback)
+    # Só os keyframes 2 e 3 são difundidos: o 1 vem do checkpoint
+    assert [call[0] for call in generator.calls] == ["img2img", "img2img"]
+    assert same_frames(full[2:], resumed)
+
+def test_resume_rejects_changed_params(fake_generator, tmp_path):
+    generator = fake_generator()
+    checkpoint = GenerationCheckpoint(str(tmp_path / "checkpoint"))
+    run(generator, checkpoint=checkpoint)
+
+    with pytest.raises(ValueError, match="Checkpoint incompatível"):
+        run(generator, checkpoint=checkpoint, resume_from=2, strength=0.6)
+
+def test_resume_without_checkpoint_regenerates(fake_generator):
+    generator = fake_generator()
+    full, _ = run(generator)
+
+    resumed, calls = run(generator, resume_from=2)
+    assert calls == VIDEO["num_frames"]
+    assert same_frames(full[2:], resumed)
+
+@pytest.mark.skipif(not os.environ.get("SD_TEST_MODEL"), reason="SD_TEST_MODEL não definido")
+def test_end_to_end_with_model(tmp_path):
+    """Cache e retomada com um modelo real: mesma cadeia, sem difusões repetidas"""
+    from stable_diffusion_pipeline import StableDiffusionVideoGenerator
+
+    generator = StableDiffusionVideoGenerator(model_id=os.environ["SD_TEST_MODEL"], use_openvino=False,
+                                              frame_cache_dir=str(tmp_path / "frames"))
+    try:
+        frames = lambda **kwargs: [np.array(frame) for frame in generator.iter_video_frames(
+            frame_prompts=PROMPTS, **dict(VIDEO, **kwargs))]
+        checkpoint = GenerationCheckpoint(str(tmp_path / "checkpoint"))
+        full = frames(checkpoint=checkpoint)
+        assert same_frames(full, frames())
+
+        generator.frame_cache = None
+        assert same_frames(full[2:], frames(checkpoint=checkpoint, resume_from=2))
+    finally:
+        generator.cleanup()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
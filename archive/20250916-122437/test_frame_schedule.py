@@ -0,0 +1,141 @@
+"""
+Testes do cronograma por frame (frame_schedule.py)
+"""
+
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from frame_schedule import FrameSchedule, interpolate_keyframes, read_schedule_file, schedule_defaults
+
+def schedule(keyframes, **data):
+    return FrameSchedule.from_dict(dict(data, keyframes=keyframes))
+
+def test_values_at_and_between_keyframes():
+    result = schedule([
+        {"frame": 0, "prompt": "a", "strength": 0.3, "guidance": 7.0},
+        {"frame": 10, "prompt": "a", "strength": 0.5, "guidance": 9.0}
+    ], frames=15)
+
+    assert len(result) == 15
+    assert result.strength[0] == pytest.approx(0.3)
+    assert result.strength[10] == pytest.approx(0.5)
+    assert result.strength[5] == pytest.approx(0.4)
+    assert result.guidance[5] == pytest.approx(8.0)
+    # Constante depois do último keyframe
+    assert result.strength[14] == pytest.approx(0.5)
+
+def test_interpolation_curves():
+    frames = np.array([0, 4])
+    values = np.array([0.0, 1.0])
+    np.testing.assert_allclose(interpolate_keyframes(5, frames, values, "linear"), [0, 0.25, 0.5, 0.75, 1])
+    np.testing.assert_allclose(interpolate_keyframes(5, frames, values, "step"), [0, 0, 0, 0, 1])
+    smooth = interpolate_keyframes(5, frames, values, "smooth")
+    assert smooth[0] == 0 and smooth[4] == 1 and smooth[2] == pytest.approx(0.5)
+    assert smooth[1] < 0.25
+
+def test_prompt_weights_are_normalised():
+    result = FrameSchedule.from_dict({"keyframes": [
+        {"frame": 0, "prompt": {"a": 2.0, "b": 2.0}},
+        {"frame": 4, "prompt": "b"}
+    ]}, strength=0.5, guidance=7.5)
+
+    np.testing.assert_allclose(result.weights.sum(axis=1), 1.0)
+    assert result.prompt(0) == {"a": 0.5, "b": 0.5}
+    assert result.prompt(2) == {"a": 0.25, "b": 0.75}
+    assert result.prompt(4) == "b"
+
+def test_unsorted_keyframes_match_sorted():
+    keyframes = [
+        {"frame": 0, "prompt": "a", "strength": 0.3, "guidance": 7.5, "seed": 1},
+        {"frame": 6, "prompt": "b", "strength": 0.6}
+    ]
+    assert schedule(keyframes[::-1]).digest() == schedule(keyframes).digest()
+
+def test_command_line_values_fill_frame_zero():
+    result = FrameSchedule.from_dict({"keyframes": [{"frame": 4, "prompt": "b", "seed": 10}]},
+                                     num_frames=6, prompt="a", strength=0.4, guidance=7.5, seed=1)
+
+    assert result.prompt(0) == "a"
+    assert result.strength[5] == pytest.approx(0.4)
+    assert [result.seed(i) for i in range(6)] == [1, 2, 3, 4, 10, 11]
+    assert result.reproducible
+
+def test_seeds_missing_before_first_seed_keyframe():
+    result = schedule([
+        {"frame": 0, "prompt": "a", "strength": 0.3, "guidance": 7.5},
+        {"frame": 2, "prompt": "a", "seed": 5}
+    ], frames=4)
+
+    assert [result.seed(i) for i in range(4)] == [None, None, 5, 6]
+    assert not result.reproducible
+
+@pytest.mark.parametrize("keyframes, message", [
+    ([{"frame": 0, "prompt": "a"}, {"frame": 0, "prompt": "b"}], "mesmo frame"),
+    ([{"frame": -1, "prompt": "a"}], "Keyframe inválido"),
+    ([{"frame": 1.5, "prompt": "a"}], "Keyframe inválido"),
+    ([{"prompt": "a"}], "Keyframe inválido"),
+    ([{"frame": 0, "prompt": "a", "strength": 1.5}], "fora do intervalo"),
+    ([{"frame": 0, "prompt": {"a": 0.0}}], "somam zero"),
+    ([{"frame": 0, "prompt": {"a": -1.0}}], "Prompt inválido"),
+    ([{"frame": 0, "prompt": "a", "seed": -3}], "Seeds"),
+    ([{"frame": 0, "strength": 0.5}], "nenhum prompt"),
+])
+def test_invalid_keyframes(keyframes, message):
+    with pytest.raises(ValueError, match=message):
+        FrameSchedule.from_dict({"keyframes": keyframes}, strength=0.5, guidance=7.5)
+
+def test_invalid_interpolation():
+    with pytest.raises(ValueError, match="Interpolação"):
+        schedule([{"frame": 0, "prompt": "a"}], interpolation="cubic")
+
+def test_read_json(tmp_path):
+    path = tmp_path / "schedule.json"
+    path.write_text(json.dumps({"frames": 8, "negative_prompt": "blurry",
+                                "keyframes": [{"frame": 0, "prompt": "a"}]}))
+
+    data = read_schedule_file(str(path))
+    assert schedule_defaults(data) == {"frames": 8, "negative_prompt": "blurry"}
+
+def test_read_txt(tmp_path):
+    path = tmp_path / "frame_prompts.txt"
+    path.write_text("# comentário\na\n\nb\n", encoding="utf-8")
+
+    result = FrameSchedule.load(str(path), num_frames=3, strength=0.5, guidance=7.5)
+    assert [result.prompt(i) for i in range(3)] == ["a", "b", "b"]
+
+@pytest.mark.parametrize("content", [
+    "{\"keyframes\": [",
+    "[{\"frame\": 0, \"prompt\": \"a\"}]",
+    "{\"frames\": 10}",
+])
+def test_read_invalid_json(tmp_path, content):
+    path = tmp_path / "schedule.json"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        read_schedule_file(str(path))
+
+def test_read_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "schedule.yaml"
+    path.write_text("keyframes:\n  - frame: 0\n    prompt: a\n  - frame: 4\n    prompt: b\n")
+
+    result = FrameSchedule.load(str(path), strength=0.5, guidance=7.5)
+    assert len(result) == 5
+    assert result.prompt(4) == "b"
+
+@pytest.mark.parametrize("content", [
+    "keyframes: [frame: 0",
+    "- frame: 0\n  prompt: a\n",
+])
+def test_read_invalid_yaml(tmp_path, content):
+    pytest.importorskip("yaml")
+    path = tmp_path / "schedule.yml"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        read_schedule_file(str(path))
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,28 @@
+"""
+Testes da chave de vídeo dos jobs (job_scheduler.py)
+"""
+
+import sys
+
+import pytest
+
+from job_scheduler import video_cache_key
+
+JOB = {"prompt": "a cat", "frames": 4, "seed": 42}
+
+def key(**job):
+    return video_cache_key(dict(JOB, **job), "fake-model", backend="cpu")
+
+def test_identical_jobs_share_key():
+    assert key() == key()
+    assert key(bucket_fit="crop") == key()
+
+def test_bucket_fit_changes_key():
+    # crop e pad geram pixels diferentes a partir da mesma imagem de entrada
+    assert key(bucket_fit="crop") != key(bucket_fit="pad")
+
+def test_unseeded_job_has_no_key():
+    assert key(seed=None) is None
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
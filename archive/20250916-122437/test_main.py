@@ -0,0 +1,42 @@
+"""
+Testes da linha de comando (main.py)
+"""
+
+import sys
+
+import pytest
+
+import main
+
+def parse(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["main.py", *argv])
+    return main.parse_arguments()
+
+def test_legacy_frame_prompts_file(fake_generator, monkeypatch, tmp_path):
+    """frame_prompts.txt no diretório atual mantém a semântica de --frame-prompts"""
+    (tmp_path / "frame_prompts.txt").write_text("ignored line 0\nline 1\n\nline 2\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    args = parse(monkeypatch, "--prompt", "a cat", "--frames", "5", "--seed", "1")
+    assert args.schedule is None
+    assert args.frame_prompts == ["ignored line 0", "line 1", "line 2"]
+    assert main.load_schedule(args) is None
+
+    generator = fake_generator()
+    list(generator.iter_video_frames(args.prompt, args.frame_prompts, num_frames=5, width=64, height=64,
+                                     seed=args.seed))
+    # Frame 0 usa --prompt, a linha i o frame i, e --prompt de novo após a última linha
+    assert [prompt for _, prompt, _ in generator.calls] == ["a cat", "line 1", "line 2", "a cat", "a cat"]
+
+def test_explicit_options_skip_legacy_file(monkeypatch, tmp_path):
+    (tmp_path / "frame_prompts.txt").write_text("a\nb\n", encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+
+    assert parse(monkeypatch, "--prompt", "a cat", "--frame-prompts", "x", "y").frame_prompts == ["x", "y"]
+
+def test_without_legacy_file(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert not parse(monkeypatch, "--prompt", "a cat").frame_prompts
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
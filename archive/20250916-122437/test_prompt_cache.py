@@ -0,0 +1,31 @@
+"""
+Testes do cache de embeddings de prompt (prompt_cache.py)
+"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from prompt_cache import PromptEmbeddingCache
+
+def test_key_separates_text_encoder_variants():
+    keys = {
+        PromptEmbeddingCache.make_key("m", "a cat", "", quantization, backend)
+        for quantization in (None, "int8")
+        for backend in ("cpu", "cuda", "openvino")
+    }
+    assert len(keys) == 6
+
+def test_disk_entries_are_not_shared_between_variants(tmp_path):
+    embeds = np.ones((2, 4, 8), dtype=np.float32)
+    PromptEmbeddingCache(str(tmp_path)).put("m", "a cat", "", embeds, quantization="int8", backend="cpu")
+
+    # Nova instância: só o disco é compartilhado
+    cache = PromptEmbeddingCache(str(tmp_path))
+    assert cache.get("m", "a cat", "", quantization=None, backend="cpu") is None
+    assert cache.get("m", "a cat", "", quantization="int8", backend="openvino") is None
+    np.testing.assert_array_equal(cache.get("m", "a cat", "", quantization="int8", backend="cpu"), embeds)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
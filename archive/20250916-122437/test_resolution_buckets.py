@@ -0,0 +1,42 @@
+"""
+Testes dos buckets de resolução (resolution_buckets.py)
+"""
+
+import sys
+
+import pytest
+from PIL import Image
+
+from resolution_buckets import fit_image, nearest_bucket, parse_buckets, parse_size
+
+BUCKETS = [(256, 256), (512, 512), (768, 512), (512, 768)]
+
+def test_parse_buckets():
+    assert parse_buckets(["512x512", " 768X512 "]) == [(512, 512), (768, 512)]
+    with pytest.raises(ValueError):
+        parse_size("512")
+
+@pytest.mark.parametrize("size, bucket", [
+    ((512, 512), (512, 512)),
+    ((300, 300), (256, 256)),
+    ((1024, 1024), (512, 512)),
+    ((1920, 1080), (768, 512)),
+    ((600, 900), (512, 768)),
+])
+def test_nearest_bucket(size, bucket):
+    assert nearest_bucket(*size, BUCKETS) == bucket
+
+def test_nearest_bucket_without_buckets():
+    assert nearest_bucket(640, 480, []) == (640, 480)
+
+@pytest.mark.parametrize("mode", ["crop", "pad"])
+def test_fit_image(mode):
+    image = Image.new("RGB", (1920, 1080), (200, 10, 10))
+    assert fit_image(image, (768, 512), mode).size == (768, 512)
+
+def test_fit_image_invalid_mode():
+    with pytest.raises(ValueError):
+        fit_image(Image.new("RGB", (8, 8)), (4, 4), "stretch")
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,45 @@
+"""
+Testes da contagem de passos do img2img (step_plan.py)
+"""
+
+import sys
+
+import pytest
+
+from step_plan import img2img_steps, plan_keyframe_steps, resolve_img2img_steps, steps_for_strength
+
+def test_img2img_steps():
+    assert img2img_steps(20, 0.35) == 7
+    assert img2img_steps(20, 1.0) == 20
+    assert img2img_steps(2, 0.35) == 0
+
+@pytest.mark.parametrize("strength", [0.25, 0.3, 0.35, 0.45, 0.5, 0.7, 0.75, 1.0])
+@pytest.mark.parametrize("effective_steps", [1, 4, 7, 20])
+def test_steps_for_strength_is_minimal(effective_steps, strength):
+    steps = steps_for_strength(effective_steps, strength)
+    assert img2img_steps(steps, strength) >= effective_steps
+    assert steps == effective_steps or img2img_steps(steps - 1, strength) < effective_steps
+
+def test_steps_for_strength_rejects_zero_strength():
+    with pytest.raises(ValueError):
+        steps_for_strength(4, 0.0)
+
+def test_resolve_img2img_steps():
+    # Mantém os passos configurados quando algum passo roda
+    assert resolve_img2img_steps(20, 0.35) == 20
+    # Sobe os passos quando nenhum rodaria
+    assert resolve_img2img_steps(2, 0.35) == 3
+    # effective_steps fixa os passos reais
+    assert img2img_steps(resolve_img2img_steps(20, 0.35, effective_steps=4), 0.35) == 4
+
+def test_plan_keyframe_steps():
+    plan = plan_keyframe_steps([0, 2, 4], 20, [0.35, 0.35, 0.5])
+    assert plan == {0: (20, 20), 2: (20, 7), 4: (20, 10)}
+
+def test_plan_keyframe_steps_with_init_image_and_effective_steps():
+    plan = plan_keyframe_steps([0, 1], 20, [0.5, 0.25], effective_steps=5, init_image=True)
+    assert [executed for _, executed in plan.values()] == [5, 5]
+    assert plan[0][0] == 10
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
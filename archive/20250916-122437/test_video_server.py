@@ -0,0 +1,63 @@
+"""
+Testes do estado dos jobs do servidor (video_server.py)
+"""
+
+import os
+import sys
+
+import pytest
+
+from video_server import VideoJobService, derive_seed
+
+def add_job(service, job_id, status, finished=None):
+    os.makedirs(os.path.join(service.jobs_dir, job_id))
+    service.jobs[job_id] = {"job_id": job_id, "status": status, "created": 0.0}
+    if finished is not None:
+        service.jobs[job_id]["finished"] = finished
+
+def test_cleanup_removes_expired_jobs(tmp_path):
+    service = VideoJobService(None, str(tmp_path), job_ttl=100)
+    add_job(service, "old", "done", finished=0.0)
+    add_job(service, "failed", "failed", finished=10.0)
+    add_job(service, "recent", "cancelled", finished=950.0)
+    add_job(service, "running", "running")
+
+    assert service.cleanup_jobs(now=1000.0) == 2
+    assert set(service.jobs) == {"recent", "running"}
+    assert sorted(os.listdir(tmp_path)) == ["recent", "running"]
+
+def test_cleanup_limits_finished_jobs(tmp_path):
+    service = VideoJobService(None, str(tmp_path), job_ttl=1e9, max_finished_jobs=2)
+    for index in range(4):
+        add_job(service, f"job{index}", "done", finished=float(index))
+    add_job(service, "queued", "queued")
+
+    service.cleanup_jobs(now=10.0)
+    assert set(service.jobs) == {"job2", "job3", "queued"}
+    assert sorted(os.listdir(tmp_path)) == ["job2", "job3", "queued"]
+
+def test_cleanup_removes_stale_unknown_dirs(tmp_path):
+    service = VideoJobService(None, str(tmp_path), job_ttl=100)
+    os.makedirs(tmp_path / "previous_run")
+    os.utime(tmp_path / "previous_run", (0, 0))
+    os.makedirs(tmp_path / "being_submitted")
+
+    service.cleanup_jobs()
+    assert os.listdir(tmp_path) == ["being_submitted"]
+
+def test_wait_for_update_ends_for_removed_job(tmp_path):
+    service = VideoJobService(None, str(tmp_path), job_ttl=0)
+    add_job(service, "done", "done", finished=0.0)
+    service.jobs["done"]["version"] = 3
+
+    service.cleanup_jobs(now=1.0)
+    assert service.wait_for_update("done", 3, timeout=0.1) is None
+
+def test_derive_seed_is_deterministic():
+    seed = derive_seed("abc", {"frames": 30})
+    assert seed == derive_seed("abc", {"frames": 30})
+    assert seed != derive_seed("abc", {"frames": 31})
+    assert 0 <= seed < 2 ** 31
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
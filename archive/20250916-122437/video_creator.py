@@ -6,39 +6,624 @@ import cv2
 import numpy as np
 from PIL import Image
 import imageio
+import json
 import os
-from typing import List, Optional, Tuple
+import queue
+import shutil
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+def find_ffmpeg() -> str:
+    """
+    Caminho do executável do FFmpeg
+    
+    Usa o ffmpeg do PATH e, na falta dele, o binário distribuído com o
+    imageio-ffmpeg (dependência do projeto).
+    """
+    path = shutil.which('ffmpeg')
+    if path:
+        return path
+    
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception:
+        return 'ffmpeg'
+
+def quality_to_crf(quality: int) -> int:
+    """
+    Converte a qualidade (1-10) no CRF do libx264
+    
+    10 -> 17 (visualmente sem perdas), 8 -> 21, 5 -> 27, 1 -> 35.
+    """
+    quality = max(1, min(10, int(quality)))
+    return 37 - 2 * quality
+
+def ffmpeg_pipe_command(output_path: str, 
+                        width: int, 
+                        height: int, 
+                        fps: int, 
+                        quality: int,
+                        preset: str = 'medium') -> List[str]:
+    """
+    Comando do FFmpeg que lê frames RGB24 crus pela entrada padrão
+    
+    Args:
+        output_path: Caminho do arquivo de saída
+        width: Largura dos frames
+        height: Altura dos frames
+        fps: Frames por segundo
+        quality: Qualidade do vídeo (1-10)
+        preset: Preset de velocidade do libx264 (ultrafast ... veryslow)
+        
+    Returns:
+        Lista de argumentos para subprocess
+    """
+    return [
+        find_ffmpeg(),
+        '-y',  # Sobrescrever arquivo existente
+        '-loglevel', 'error',
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        '-s', f"{width}x{height}",
+        '-framerate', str(fps),
+        '-i', '-',
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-pix_fmt', 'yuv420p',
+        '-crf', str(quality_to_crf(quality)),
+        output_path
+    ]
+
+def _frame_to_array(frame: Image.Image) -> np.ndarray:
+    """
+    Converte um frame PIL em array RGB HxWx3 uint8 com uma única cópia
+    
+    O PIL guarda RGB com 4 bytes por pixel, então alguma cópia para o
+    layout HxWx3 é inevitável: np.asarray faz exatamente uma (pela
+    interface de array do PIL), enquanto np.array copiaria de novo. O
+    array resultante é somente leitura.
+    """
+    if frame.mode != 'RGB':
+        frame = frame.convert('RGB')
+    return np.asarray(frame)
+
+def _frame_to_bgr(frame: Image.Image, size: Tuple[int, int]) -> np.ndarray:
+    """Converte um frame PIL para BGR (formato do OpenCV) no tamanho do vídeo"""
+    if frame.size != size:
+        frame = frame.resize(size)
+    return cv2.cvtColor(_frame_to_array(frame), cv2.COLOR_RGB2BGR)
+
+class PipelinedOpenCVWriter:
+    """
+    Escritor OpenCV em pipeline: conversão em paralelo, escrita em ordem
+    
+    write() apenas agenda a conversão PIL -> BGR num pool de threads (cv2 e
+    NumPy liberam o GIL) e volta; uma única thread de escrita consome os
+    frames convertidos na ordem de chegada e chama VideoWriter.write. A fila
+    entre as etapas é limitada, então um codificador lento segura o produtor
+    em vez de acumular frames em memória.
+    """
+    
+    def __init__(self, 
+                 output_path: str,
+                 fps: int = 24,
+                 codec: str = 'mp4v',
+                 workers: int = 2,
+                 max_pending: int = 8):
+        """
+        Inicializa o escritor (o vídeo é aberto no primeiro frame)
+        
+        Args:
+            output_path: Caminho do arquivo de saída
+            fps: Frames por segundo do vídeo
+            codec: Codec de vídeo (fourcc)
+            workers: Threads de conversão
+            max_pending: Máximo de frames entre write() e a escrita em disco
+        """
+        self.output_path = output_path
+        self.fps = fps
+        self.codec = codec
+        self.frame_size = None
+        self.frame_count = 0
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._pending = queue.Queue(maxsize=max(1, max_pending))
+        self._writer = None
+        self._thread = None
+        self._error = None
+        self._closed = False
+    
+    def write(self, frame: Image.Image):
+        """
+        Agenda a conversão e a escrita de um frame
+        
+        Args:
+            frame: Imagem PIL
+        """
+        if self._closed:
+            raise RuntimeError("PipelinedOpenCVWriter já foi fechado")
+        if self._error is not None:
+            raise RuntimeError(f"Erro na escrita do vídeo: {self._error}")
+        
+        if self.frame_size is None:
+            self.frame_size = frame.size
+            fourcc = cv2.VideoWriter_fourcc(*self.codec)
+            self._writer = cv2.VideoWriter(self.output_path, fourcc, self.fps, self.frame_size)
+            if not self._writer.isOpened():
+                raise RuntimeError(f"Não foi possível abrir o vídeo: {self.output_path}")
+            self._thread = threading.Thread(target=self._write_loop, daemon=True)
+            self._thread.start()
+        
+        # Bloqueia quando a fila está cheia (contrapressão do codificador)
+        self._pending.put(self._executor.submit(_frame_to_bgr, frame, self.frame_size))
+        self.frame_count += 1
+    
+    def _write_loop(self):
+        """Thread de escrita: grava os frames convertidos na ordem de envio"""
+        while True:
+            future = self._pending.get()
+            if future is None:
+                return
+            if self._error is not None:
+                # Após um erro, apenas drenar a fila para não travar o produtor
+                continue
+            try:
+                self._writer.write(future.result())
+            except Exception as e:
+                self._error = e
+    
+    def close(self) -> bool:
+        """
+        Aguarda os frames pendentes e finaliza o arquivo
+        
+        Returns:
+            True se sucesso, False caso contrário
+        """
+        if self._closed:
+            return self._error is None and self.frame_count > 0
+        self._closed = True
+        
+        if self._thread is not None:
+            self._pending.put(None)
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+        
+        if self._writer is not None:
+            self._writer.release()
+        
+        if self._error is not None:
+            logger.error(f"Erro ao escrever vídeo com OpenCV: {self._error}")
+            return False
+        return self.frame_count > 0
+
+class StreamingVideoWriter:
+    """
+    Escritor de vídeo incremental: codifica cada frame assim que ele chega,
+    sem acumular a sequência inteira em memória
+    """
+    
+    METHODS = ('opencv', 'imageio', 'ffmpeg', 'auto')
+    
+    def __init__(self, 
+                 output_path: str,
+                 fps: int = 24,
+                 quality: int = 8,
+                 method: str = 'imageio',
+                 preset: str = 'medium',
+                 calibration_file: Optional[str] = None):
+        """
+        Inicializa o escritor
+        
+        Args:
+            output_path: Caminho do arquivo de saída
+            fps: Frames por segundo do vídeo
+            quality: Qualidade do vídeo (1-10)
+            method: Método a usar ('opencv', 'imageio', 'ffmpeg' ou 'auto')
+            preset: Preset do libx264 (apenas método 'ffmpeg')
+            calibration_file: Cache de calibração do método 'auto'
+                (padrão: Config.ENCODER_CALIBRATION_FILE)
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Método não suportado: {method}")
+        
+        self.output_path = output_path
+        self.fps = fps
+        self.quality = quality
+        self.method = method
+        self.preset = preset
+        self.calibration_file = calibration_file
+        self.frame_count = 0
+        self.frame_size = None
+        self._writer = None
+        self._closed = False
+        self._success = False
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+    
+    def _open(self, width: int, height: int):
+        """Abre o writer do backend escolhido (dimensões vêm do primeiro frame)"""
+        self.frame_size = (width, height)
+        
+        if self.method == 'auto':
+            # Escolha depende da resolução, então só acontece no primeiro frame
+            from encoder_selection import EncoderCalibration
+            choice = EncoderCalibration(self.calibration_file).select(width, height, self.fps, self.quality)
+            self.method = choice["method"]
+            self.preset = choice.get("preset") or self.preset
+        
+        if self.method == 'opencv':
+            # Conversão e codificação em threads, sobrepostas à difusão do próximo frame
+            self._writer = PipelinedOpenCVWriter(self.output_path, fps=self.fps)
+        elif self.method == 'imageio':
+            self._writer = imageio.get_writer(self.output_path, fps=self.fps, quality=self.quality)
+        elif self.method == 'ffmpeg':
+            # Frames crus vão direto para a entrada padrão do FFmpeg, sem arquivos temporários
+            self._writer = subprocess.Popen(
+                ffmpeg_pipe_command(self.output_path, width, height, self.fps, self.quality, self.preset),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+        
+        method = f"{self.method}/{self.preset}" if self.method == 'ffmpeg' else self.method
+        logger.info(f"Escrita incremental iniciada ({method}): {self.output_path}")
+    
+    def write(self, frame: Image.Image):
+        """
+        Codifica um frame
+        
+        Args:
+            frame: Imagem PIL
+        """
+        if self._closed:
+            raise RuntimeError("StreamingVideoWriter já foi fechado")
+        
+        if frame.mode != 'RGB':
+            frame = frame.convert('RGB')
+        
+        if self.frame_size is None:
+            self._open(*frame.size)
+        elif frame.size != self.frame_size:
+            frame = frame.resize(self.frame_size)
+        
+        if self.method == 'opencv':
+            self._writer.write(frame)
+        elif self.method == 'imageio':
+            self._writer.append_data(_frame_to_array(frame))
+        elif self.method == 'ffmpeg':
+            try:
+                self._writer.stdin.write(frame.tobytes())
+            except BrokenPipeError:
+                # FFmpeg encerrou antes da hora; o motivo está no stderr
+                stderr = self._writer.stderr.read().decode(errors='replace')
+                self._writer.wait()
+                self._closed = True
+                raise RuntimeError(f"FFmpeg encerrou inesperadamente: {stderr.strip()}")
+        
+        self.frame_count += 1
+        
+        if self.frame_count % 10 == 0:
+            logger.info(f"Codificados {self.frame_count} frames")
+    
+    def close(self) -> bool:
+        """
+        Finaliza o arquivo de vídeo
+        
+        Returns:
+            True se sucesso, False caso contrário
+        """
+        if self._closed:
+            return self._success
+        self._closed = True
+        
+        if self.frame_count == 0:
+            logger.error("Nenhum frame recebido")
+            return False
+        
+        try:
+            if self.method == 'opencv':
+                if not self._writer.close():
+                    return False
+            elif self.method == 'imageio':
+                self._writer.close()
+            elif self.method == 'ffmpeg':
+                # Fechar a entrada padrão sinaliza o fim do vídeo
+                _, stderr = self._writer.communicate()
+                
+                if self._writer.returncode != 0:
+                    logger.error(f"Erro no FFmpeg: {stderr.decode(errors='replace')}")
+                    return False
+            
+            logger.info(f"Vídeo salvo em: {self.output_path} ({self.frame_count} frames)")
+            self._success = True
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erro ao finalizar vídeo: {e}")
+            return False
+
+class SegmentedVideoWriter:
+    """
+    Escritor em segmentos: grava um arquivo a cada segment_frames frames
+    
+    Cada segmento fechado é um MP4 completo (já pode ser assistido) e fica
+    registrado num manifest.json junto dos segmentos. close() junta os
+    segmentos no arquivo final com o concat demuxer do FFmpeg (-c copy, sem
+    recodificar). Com resume=True os segmentos completos de uma execução
+    interrompida são mantidos e frames_done indica de onde continuar.
+    """
+    
+    MANIFEST_NAME = "manifest.json"
+    
+    def __init__(self, 
+                 output_path: str,
+                 fps: int = 24,
+                 quality: int = 8,
+                 method: str = 'imageio',
+                 segment_frames: int = 24,
+                 segments_dir: Optional[str] = None,
+                 resume: bool = False,
+                 keep_segments: bool = False,
+                 calibration_file: Optional[str] = None):
+        """
+        Inicializa o escritor
+        
+        Args:
+            output_path: Caminho do arquivo final
+            fps: Frames por segundo do vídeo
+            quality: Qualidade do vídeo (1-10)
+            method: Método de cada segmento ('opencv', 'imageio', 'ffmpeg' ou 'auto')
+            segment_frames: Frames por segmento
+            segments_dir: Diretório dos segmentos (padrão: <output>.segments)
+            resume: Reaproveitar os segmentos completos de uma execução anterior
+            keep_segments: Manter os segmentos após juntar o arquivo final
+            calibration_file: Cache de calibração do método 'auto'
+        """
+        self.output_path = output_path
+        self.fps = fps
+        self.quality = quality
+        self.method = method
+        self.preset = 'medium'
+        self.segment_frames = max(1, segment_frames)
+        self.segments_dir = segments_dir or f"{os.path.splitext(output_path)[0]}.segments"
+        self.keep_segments = keep_segments
+        self.calibration_file = calibration_file
+        self.manifest_path = os.path.join(self.segments_dir, self.MANIFEST_NAME)
+        self.frame_size = None
+        self.segments = []
+        self._current = None
+        self._closed = False
+        self._success = False
+        
+        os.makedirs(self.segments_dir, exist_ok=True)
+        if resume:
+            self._load_manifest()
+        else:
+            self._remove_segments()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            # Execução interrompida: fechar o segmento atual sem juntar o vídeo,
+            # para uma próxima execução continuar dos segmentos completos
+            self._abort_current()
+        return False
+    
+    @property
+    def frames_done(self) -> int:
+        """Frames em segmentos completos (onde uma retomada deve continuar)"""
+        return sum(segment["frames"] for segment in self.segments)
+    
+    @property
+    def frame_count(self) -> int:
+        """Total de frames recebidos, incluindo o segmento em andamento"""
+        current = self._current.frame_count if self._current is not None else 0
+        return self.frames_done + current
+    
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.segments_dir, f"segment_{index:04d}.mp4")
+    
+    def _load_manifest(self):
+        """Carrega os segmentos completos de uma execução anterior"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if manifest.get("fps") != self.fps or manifest.get("segment_frames") != self.segment_frames:
+            logger.warning("Manifesto de segmentos incompatível; recomeçando do zero")
+            self._remove_segments()
+            return
+        
+        # Mesmos codec/preset para o concat sem recodificação funcionar
+        self.method = manifest.get("method", self.method)
+        self.preset = manifest.get("preset", self.preset)
+        self.frame_size = tuple(manifest["frame_size"]) if manifest.get("frame_size") else None
+        self.segments = [
+            segment for segment in manifest.get("segments", [])
+            if os.path.exists(os.path.join(self.segments_dir, segment["file"]))
+        ]
+        logger.info(f"Retomando de {len(self.segments)} segmentos ({self.frames_done} frames)")
+    
+    def _save_manifest(self, complete: bool = False):
+        """Grava o manifesto de forma atômica"""
+        manifest = {
+            "output": self.output_path,
+            "fps": self.fps,
+            "quality": self.quality,
+            "method": self.method,
+            "preset": self.preset,
+            "segment_frames": self.segment_frames,
+            "frame_size": list(self.frame_size) if self.frame_size else None,
+            "segments": self.segments,
+            "complete": complete
+        }
+        temp_path = f"{self.manifest_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+    
+    def _remove_segments(self):
+        for name in os.listdir(self.segments_dir):
+            if name.startswith("segment_") or name in (self.MANIFEST_NAME, "concat.txt"):
+                os.remove(os.path.join(self.segments_dir, name))
+        self.segments = []
+    
+    def _start_segment(self, frame_size: Tuple[int, int]):
+        if self.method == 'auto':
+            from encoder_selection import EncoderCalibration
+            choice = EncoderCalibration(self.calibration_file).select(*frame_size, self.fps, self.quality)
+            self.method = choice["method"]
+            self.preset = choice.get("preset") or self.preset
+        
+        self.frame_size = frame_size
+        self._current = StreamingVideoWriter(
+            self._segment_path(len(self.segments)),
+            fps=self.fps,
+            quality=self.quality,
+            method=self.method,
+            preset=self.preset
+        )
+    
+    def _finish_segment(self) -> bool:
+        """Fecha o segmento atual e o registra no manifesto"""
+        writer, self._current = self._current, None
+        if not writer.close():
+            return False
+        
+        self.segments.append({
+            "file": os.path.basename(writer.output_path),
+            "start_frame": self.frames_done,
+            "frames": writer.frame_count
+        })
+        self._save_manifest()
+        logger.info(f"Segmento {len(self.segments)} concluído ({self.frames_done} frames)")
+        return True
+    
+    def _abort_current(self):
+        if self._current is not None:
+            self._current.close()
+            if os.path.exists(self._current.output_path):
+                os.remove(self._current.output_path)
+            self._current = None
+        self._closed = True
+    
+    def write(self, frame: Image.Image):
+        """
+        Codifica um frame, fechando o segmento quando ele completa
+        
+        Args:
+            frame: Imagem PIL
+        """
+        if self._closed:
+            raise RuntimeError("SegmentedVideoWriter já foi fechado")
+        
+        if self._current is None:
+            self._start_segment(self.frame_size or frame.size)
+        
+        self._current.write(frame)
+        
+        if self._current.frame_count >= self.segment_frames:
+            if not self._finish_segment():
+                raise RuntimeError(f"Falha ao gravar segmento {len(self.segments)}")
+    
+    def close(self) -> bool:
+        """
+        Fecha o último segmento e junta todos no arquivo final
+        
+        Returns:
+            True se sucesso, False caso contrário
+        """
+        if self._closed:
+            return self._success
+        self._closed = True
+        
+        try:
+            if self._current is not None and not self._finish_segment():
+                return False
+            
+            if not self.segments:
+                logger.error("Nenhum frame recebido")
+                return False
+            
+            list_path = os.path.join(self.segments_dir, "concat.txt")
+            with open(list_path, 'w', encoding='utf-8') as f:
+                for segment in self.segments:
+                    f.write(f"file '{segment['file']}'\n")
+            
+            cmd = [
+                find_ffmpeg(), '-y', '-loglevel', 'error',
+                '-f', 'concat', '-safe', '0',
+                '-i', list_path,
+                '-c', 'copy',
+                self.output_path
+            ]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                logger.error(f"Erro ao juntar segmentos: {result.stderr}")
+                return False
+            
+            self._save_manifest(complete=True)
+            if not self.keep_segments:
+                shutil.rmtree(self.segments_dir, ignore_errors=True)
+            
+            logger.info(f"Vídeo salvo em: {self.output_path} ({self.frames_done} frames, {len(self.segments)} segmentos)")
+            self._success = True
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erro ao finalizar vídeo segmentado: {e}")
+            return False
+
 class VideoCreator:
     """
     Classe para criar vídeos a partir de frames de imagens
     """
     
-    def __init__(self, fps: int = 24, quality: int = 8):
+    def __init__(self, fps: int = 24, quality: int = 8, calibration_file: Optional[str] = None):
         """
         Inicializa o criador de vídeo
         
         Args:
             fps: Frames por segundo do vídeo
             quality: Qualidade do vídeo (1-10, onde 10 é melhor qualidade)
+            calibration_file: Cache de calibração do método 'auto'
         """
         self.fps = fps
         self.quality = quality
+        self.calibration_file = calibration_file
     
     def frames_to_video_opencv(self, 
                               frames: List[Image.Image], 
                               output_path: str,
-                              codec: str = 'mp4v') -> bool:
+                              codec: str = 'mp4v',
+                              workers: int = 2) -> bool:
         """
         Cria vídeo usando OpenCV
         
+        A conversão PIL -> BGR roda em paralelo com a codificação
+        (ver PipelinedOpenCVWriter).
+        
         Args:
             frames: Lista de imagens PIL
             output_path: Caminho do arquivo de saída
             codec: Codec de vídeo
+            workers: Threads de conversão
             
         Returns:
             True se sucesso, False caso contrário
@@ -48,26 +633,21 @@ class VideoCreator:
                 logger.error("Lista de frames vazia")
                 return False
             
-            # Obter dimensões da primeira imagem
-            width, height = frames[0].size
-            
-            # Configurar codec e writer
-            fourcc = cv2.VideoWriter_fourcc(*codec)
-            out = cv2.VideoWriter(output_path, fourcc, self.fps, (width, height))
-            
             logger.info(f"Criando vídeo com {len(frames)} frames, {self.fps} FPS")
             
-            for i, frame in enumerate(frames):
-                # Converter PIL para OpenCV
-                frame_cv = self._pil_to_opencv(frame)
-                out.write(frame_cv)
-                
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Processado {i + 1}/{len(frames)} frames")
+            writer = PipelinedOpenCVWriter(output_path, fps=self.fps, codec=codec, workers=workers)
+            try:
+                for i, frame in enumerate(frames):
+                    writer.write(frame)
+                    
+                    if (i + 1) % 10 == 0:
+                        logger.info(f"Processado {i + 1}/{len(frames)} frames")
+            finally:
+                success = writer.close()
             
-            out.release()
-            logger.info(f"Vídeo salvo em: {output_path}")
-            return True
+            if success:
+                logger.info(f"Vídeo salvo em: {output_path}")
+            return success
             
         except Exception as e:
             logger.error(f"Erro ao criar vídeo com OpenCV: {e}")
@@ -95,24 +675,13 @@ class VideoCreator:
             
             logger.info(f"Criando vídeo com imageio: {len(frames)} frames")
             
-            # Converter frames PIL para numpy arrays
-            frame_arrays = []
-            for i, frame in enumerate(frames):
-                # Converter para RGB se necessário
-                if frame.mode != 'RGB':
-                    frame = frame.convert('RGB')
-                
-                # Converter para numpy array
-                frame_array = np.array(frame)
-                frame_arrays.append(frame_array)
-                
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Convertido {i + 1}/{len(frames)} frames")
-            
-            # Criar vídeo
+            # Converter e codificar juntos: só um frame convertido existe por vez
             with imageio.get_writer(output_path, fps=self.fps, quality=self.quality) as writer:
-                for frame_array in frame_arrays:
-                    writer.append_data(frame_array)
+                for i, frame in enumerate(frames):
+                    writer.append_data(_frame_to_array(frame))
+                    
+                    if (i + 1) % 10 == 0:
+                        logger.info(f"Processado {i + 1}/{len(frames)} frames")
             
             logger.info(f"Vídeo salvo em: {output_path}")
             return True
@@ -124,14 +693,17 @@ class VideoCreator:
     def frames_to_video_ffmpeg(self, 
                               frames: List[Image.Image], 
                               output_path: str,
-                              temp_dir: str = "temp_frames") -> bool:
+                              preset: str = 'medium') -> bool:
         """
-        Cria vídeo usando FFmpeg (salva frames temporários)
+        Cria vídeo usando FFmpeg
+        
+        Os frames são enviados como RGB24 cru pela entrada padrão do FFmpeg
+        (-f rawvideo), sem salvar PNGs temporários em disco.
         
         Args:
             frames: Lista de imagens PIL
             output_path: Caminho do arquivo de saída
-            temp_dir: Diretório temporário para frames
+            preset: Preset de velocidade do libx264
             
         Returns:
             True se sucesso, False caso contrário
@@ -141,75 +713,19 @@ class VideoCreator:
                 logger.error("Lista de frames vazia")
                 return False
             
-            # Criar diretório temporário
-            os.makedirs(temp_dir, exist_ok=True)
+            logger.info(f"Enviando {len(frames)} frames para o FFmpeg")
             
-            logger.info(f"Salvando {len(frames)} frames temporários")
+            with StreamingVideoWriter(output_path, fps=self.fps, quality=self.quality,
+                                      method='ffmpeg', preset=preset) as writer:
+                for frame in frames:
+                    writer.write(frame)
             
-            # Salvar frames como imagens temporárias
-            for i, frame in enumerate(frames):
-                frame_path = os.path.join(temp_dir, f"frame_{i:04d}.png")
-                frame.save(frame_path)
-                
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Salvo {i + 1}/{len(frames)} frames")
-            
-            # Usar FFmpeg para criar vídeo
-            import subprocess
-            
-            # Comando FFmpeg
-            cmd = [
-                'ffmpeg',
-                '-y',  # Sobrescrever arquivo existente
-                '-framerate', str(self.fps),
-                '-i', os.path.join(temp_dir, 'frame_%04d.png'),
-                '-c:v', 'libx264',
-                '-pix_fmt', 'yuv420p',
-                '-crf', str(23 - self.quality),  # CRF inversamente proporcional à qualidade
-                output_path
-            ]
-            
-            logger.info("Executando FFmpeg...")
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                logger.info(f"Vídeo criado com sucesso: {output_path}")
-                
-                # Limpar arquivos temporários
-                self._cleanup_temp_files(temp_dir)
-                return True
-            else:
-                logger.error(f"Erro no FFmpeg: {result.stderr}")
-                return False
+            return writer.close()
                 
         except Exception as e:
             logger.error(f"Erro ao criar vídeo com FFmpeg: {e}")
             return False
     
-    def _pil_to_opencv(self, pil_image: Image.Image) -> np.ndarray:
-        """Converte imagem PIL para formato OpenCV"""
-        # Converter para RGB se necessário
-        if pil_image.mode != 'RGB':
-            pil_image = pil_image.convert('RGB')
-        
-        # Converter para numpy array
-        opencv_image = np.array(pil_image)
-        
-        # OpenCV usa BGR, PIL usa RGB
-        opencv_image = cv2.cvtColor(opencv_image, cv2.COLOR_RGB2BGR)
-        
-        return opencv_image
-    
-    def _cleanup_temp_files(self, temp_dir: str):
-        """Remove arquivos temporários"""
-        try:
-            import shutil
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-                logger.info(f"Arquivos temporários removidos: {temp_dir}")
-        except Exception as e:
-            logger.warning(f"Erro ao limpar arquivos temporários: {e}")
-    
     def create_video(self, 
                     frames: List[Image.Image], 
                     output_path: str,
@@ -220,11 +736,18 @@ class VideoCreator:
         Args:
             frames: Lista de imagens PIL
             output_path: Caminho do arquivo de saída
-            method: Método a usar ('opencv', 'imageio', 'ffmpeg')
+            method: Método a usar ('opencv', 'imageio', 'ffmpeg' ou 'auto',
+                que escolhe o mais rápido calibrado para esta máquina)
             
         Returns:
             True se sucesso, False caso contrário
         """
+        preset = 'medium'
+        if method == 'auto' and frames:
+            choice = self.select_encoder(*frames[0].size)
+            method = choice["method"]
+            preset = choice.get("preset") or preset
+        
         logger.info(f"Criando vídeo usando método: {method}")
         
         if method == 'opencv':
@@ -232,11 +755,100 @@ class VideoCreator:
         elif method == 'imageio':
             return self.frames_to_video_imageio(frames, output_path)
         elif method == 'ffmpeg':
-            return self.frames_to_video_ffmpeg(frames, output_path)
+            return self.frames_to_video_ffmpeg(frames, output_path, preset=preset)
         else:
             logger.error(f"Método não suportado: {method}")
             return False
     
+    def open_stream(self, 
+                    output_path: str,
+                    method: str = 'imageio',
+                    segment_frames: int = 0,
+                    resume: bool = False):
+        """
+        Abre um escritor incremental com as configurações deste criador
+        
+        Args:
+            output_path: Caminho do arquivo de saída
+            method: Método a usar ('opencv', 'imageio', 'ffmpeg' ou 'auto')
+            segment_frames: Se > 0, gravar em segmentos deste tamanho
+                (SegmentedVideoWriter) em vez de um único arquivo
+            resume: Com segmentos, reaproveitar os de uma execução anterior
+            
+        Returns:
+            StreamingVideoWriter (ou SegmentedVideoWriter) pronto para receber frames
+        """
+        if segment_frames > 0:
+            return SegmentedVideoWriter(output_path, fps=self.fps, quality=self.quality, method=method,
+                                        segment_frames=segment_frames, resume=resume,
+                                        calibration_file=self.calibration_file)
+        
+        return StreamingVideoWriter(output_path, fps=self.fps, quality=self.quality, method=method,
+                                    calibration_file=self.calibration_file)
+    
+    def select_encoder(self, width: int, height: int) -> Dict[str, Any]:
+        """
+        Escolhe o codificador mais rápido que atende à qualidade configurada
+        
+        Usa a calibração em cache desta máquina (ver encoder_selection.py),
+        calibrando na primeira vez para esta resolução e qualidade.
+        
+        Returns:
+            Dicionário com "method" e, para o FFmpeg, "preset"
+        """
+        from encoder_selection import EncoderCalibration
+        return EncoderCalibration(self.calibration_file).select(width, height, self.fps, self.quality)
+    
+    def create_video_streaming(self, 
+                               frames: Iterable[Image.Image], 
+                               output_path: str,
+                               method: str = 'imageio') -> bool:
+        """
+        Cria vídeo consumindo frames à medida que são produzidos
+        
+        Args:
+            frames: Iterável de imagens PIL (ex: iter_video_frames)
+            output_path: Caminho do arquivo de saída
+            method: Método a usar ('opencv', 'imageio', 'ffmpeg' ou 'auto')
+            
+        Returns:
+            True se sucesso, False caso contrário
+        """
+        logger.info(f"Criando vídeo (streaming) usando método: {method}")
+        
+        try:
+            with self.open_stream(output_path, method=method) as writer:
+                for frame in frames:
+                    writer.write(frame)
+            
+            return writer.close()
+            
+        except Exception as e:
+            logger.error(f"Erro ao criar vídeo (streaming): {e}")
+            return False
+    
+    def save_frame(self, 
+                   frame: Image.Image, 
+                   output_dir: str,
+                   index: int,
+                   prefix: str = "frame") -> str:
+        """
+        Salva um único frame como imagem
+        
+        Args:
+            frame: Imagem PIL
+            output_dir: Diretório de saída
+            index: Índice do frame no vídeo
+            prefix: Prefixo do nome do arquivo
+            
+        Returns:
+            Caminho do arquivo salvo
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        filepath = os.path.join(output_dir, f"{prefix}_{index:04d}.png")
+        frame.save(filepath)
+        return filepath
+    
     def save_frames_as_images(self, 
                             frames: List[Image.Image], 
                             output_dir: str,
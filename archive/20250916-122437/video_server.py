@@ -0,0 +1,617 @@
+"""
+Servidor HTTP local com o modelo Stable Diffusion sempre carregado
+
+Substitui a função de demonstração do Netlify (web_app/netlify/functions):
+recebe o mesmo payload {image, version, frames, fps, quality}, enfileira o
+job nos workers do JobScheduler (que mantêm o pipeline aquecido) e devolve
+um job_id. O progresso real (passo, frame, latências, ETA) é transmitido por
+Server-Sent Events e o MP4 final é baixado por job.
+
+Uso:
+  python video_server.py --port 8080 --workers 1
+
+Endpoints:
+  POST /api/generate-video      -> 202 {success, job_id, status_url, video_url}
+                                   (200 e status "done" se o vídeo já estava em cache)
+  GET  /api/jobs/<id>           -> estado do job (frames concluídos, status)
+  GET  /api/jobs/<id>/events    -> stream SSE com o estado a cada passo/frame
+  POST /api/jobs/<id>/cancel    -> cancela o job (na fila ou em execução)
+  GET  /api/jobs/<id>/video     -> MP4 final (409 enquanto não termina)
+  GET  /api/health              -> estado do servidor
+"""
+
+import argparse
+import base64
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+from PIL import Image
+
+from checkpoint import image_digest, params_hash
+from config import Config
+from frame_cache import FrameCache
+from job_scheduler import JobScheduler, expected_backend, new_job_id, video_cache_key
+from schedulers import SCHEDULERS
+
+logger = logging.getLogger(__name__)
+
+# Limite do corpo da requisição (imagem em base64)
+MAX_BODY_BYTES = 25 * 1024 * 1024
+MAX_FRAMES = 240
+
+# Intervalo máximo sem mensagens no stream SSE (mantém proxies conectados)
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# Estados finais de um job
+FINAL_STATUSES = ("done", "failed", "cancelled")
+
+# Retenção de jobs finalizados (estado em memória e arquivos em jobs_dir)
+JOB_TTL_SECONDS = 3600.0
+MAX_FINISHED_JOBS = 100
+CLEANUP_INTERVAL_SECONDS = 60.0
+
+# Versões oferecidas pela interface web
+WEB_VERSIONS = {
+    # Continuidade + Movimento: cada frame é um img2img suave do anterior
+    "version1": {
+        "prompt": "same scene, same subject, subtle natural movement, consistent lighting, high quality",
+        "strength": 0.35
+    },
+    # Interpolação Avançada: keyframes mais espaçados e fluxo óptico entre eles
+    "version2": {
+        "prompt": "same scene, same subject, expressive movement, cinematic, high quality",
+        "strength": 0.45,
+        "keyframe_interval": 4,
+        "interpolation": "flow"
+    }
+}
+
+# Opções de qualidade da interface web
+WEB_QUALITY = {
+    "fast": {"width": 256, "height": 256, "steps": 10, "quality": 6},
+    "balanced": {"width": 512, "height": 512, "steps": 20, "quality": 8},
+    "high": {"width": 768, "height": 768, "steps": 30, "quality": 10}
+}
+
+DEFAULT_NEGATIVE_PROMPT = "blurry, distorted, deformed, low quality, artifacts"
+
+class PayloadError(ValueError):
+    """Payload de geração inválido"""
+
+def decode_image(data: str) -> Image.Image:
+    """Decodifica uma imagem em data URL ou base64 puro"""
+    if data.startswith("data:"):
+        data = data.split(",", 1)[-1]
+    try:
+        return Image.open(io.BytesIO(base64.b64decode(data))).convert("RGB")
+    except Exception as e:
+        raise PayloadError(f"Imagem inválida: {e}")
+
+def derive_seed(image_hash: str, params: Dict[str, Any]) -> int:
+    """
+    Seed determinística de um pedido sem seed
+
+    A interface web não envia seed; derivá-la da imagem e dos parâmetros faz
+    com que reenviar o mesmo pedido gere o mesmo vídeo (e use o cache).
+    """
+    return int(params_hash({"image": image_hash, "params": params})[:8], 16) & 0x7FFFFFFF
+
+class VideoJobService:
+    """
+    Estado dos jobs do servidor sobre um JobScheduler já aquecido
+
+    Uma thread de fundo consome as mensagens dos workers e atualiza o estado
+    de cada job (queued -> running -> done/failed/cancelled). Cada mudança
+    incrementa a "version" do job e acorda quem espera em wait_for_update.
+
+    Com frame_cache, um pedido idêntico a um já concluído (mesma imagem e
+    parâmetros; sem seed no pedido, ela é derivada de ambos) termina na
+    hora com o vídeo do cache, sem passar pelos workers.
+
+    Jobs finalizados são esquecidos, e seus diretórios apagados, após
+    job_ttl segundos ou quando passam de max_finished_jobs (os mais
+    antigos primeiro); ver cleanup_jobs.
+    """
+
+    def __init__(self, scheduler: JobScheduler, jobs_dir: str,
+                 frame_cache: Optional[FrameCache] = None,
+                 job_ttl: float = JOB_TTL_SECONDS,
+                 max_finished_jobs: int = MAX_FINISHED_JOBS):
+        self.scheduler = scheduler
+        self.jobs_dir = jobs_dir
+        self.frame_cache = frame_cache
+        self.job_ttl = job_ttl
+        self.max_finished_jobs = max(0, max_finished_jobs)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._stop = threading.Event()
+        self._dispatcher = threading.Thread(target=self._consume_messages, daemon=True)
+
+        os.makedirs(jobs_dir, exist_ok=True)
+
+    def start(self):
+        self._dispatcher.start()
+
+    def stop(self):
+        self._stop.set()
+        self._dispatcher.join(timeout=5)
+
+    def payload_to_job(self, payload: Dict[str, Any], job_id: str) -> Dict[str, Any]:
+        """
+        Converte o payload da interface web em um job do JobScheduler
+
+        Args:
+            payload: {image, version, frames, fps, quality} (+ prompt e seed opcionais)
+            job_id: ID do job
+
+        Returns:
+            Parâmetros do job
+        """
+        if not payload.get("image"):
+            raise PayloadError("Nenhuma imagem enviada")
+
+        version = payload.get("version", "version1")
+        if version not in WEB_VERSIONS:
+            raise PayloadError(f"Versão desconhecida: {version}")
+
+        quality = payload.get("quality", "balanced")
+        if quality not in WEB_QUALITY:
+            raise PayloadError(f"Qualidade desconhecida: {quality}")
+
+        try:
+            frames = int(payload.get("frames", 30))
+            fps = int(payload.get("fps", 12))
+            seed = int(payload["seed"]) if payload.get("seed") is not None else None
+        except (TypeError, ValueError):
+            raise PayloadError("frames, fps e seed devem ser inteiros")
+
+        image = decode_image(payload["image"])
+        job_dir = os.path.join(self.jobs_dir, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+        image_path = os.path.join(job_dir, "input.png")
+        image.save(image_path)
+
+        job = {
+            "job_id": job_id,
+            "negative_prompt": DEFAULT_NEGATIVE_PROMPT,
+            "frames": max(1, min(frames, MAX_FRAMES)),
+            "fps": max(1, min(fps, 60)),
+            "init_image": image_path,
+            "output": os.path.join(job_dir, "video.mp4"),
+            # H.264 (libx264) para o vídeo tocar no navegador; mp4v do OpenCV não toca
+            "method": "ffmpeg",
+            "seed": seed
+        }
+        job.update(WEB_VERSIONS[version])
+        job.update(WEB_QUALITY[quality])
+        if payload.get("prompt"):
+            job["prompt"] = str(payload["prompt"])
+
+        if job["seed"] is None:
+            content = {name: value for name, value in job.items()
+                       if name not in ("job_id", "init_image", "output", "seed")}
+            job["seed"] = derive_seed(image_digest(image), content)
+
+        return job
+
+    def submit(self, payload: Dict[str, Any]) -> str:
+        """Valida o payload, registra e enfileira o job"""
+        job_id = new_job_id()
+        try:
+            job = self.scheduler.with_defaults(self.payload_to_job(payload, job_id))
+        except PayloadError:
+            shutil.rmtree(os.path.join(self.jobs_dir, job_id), ignore_errors=True)
+            raise
+
+        cached = self._copy_cached_video(job)
+
+        with self._lock:
+            self.jobs[job_id] = {
+                "job_id": job_id,
+                "status": "done" if cached else "queued",
+                "cached": cached,
+                "version": 0,
+                "frames": job["frames"],
+                "frames_done": job["frames"] if cached else 0,
+                "frame": None,
+                "step": None,
+                "steps": None,
+                "steps_done": 0,
+                "planned_steps": None,
+                "step_latency": None,
+                "frame_latency": None,
+                "eta": None,
+                "created": time.time(),
+                "output": job["output"],
+                "error": None
+            }
+            if cached:
+                self.jobs[job_id]["finished"] = self.jobs[job_id]["created"]
+
+        if cached:
+            logger.info(f"Job {job_id} atendido pelo cache ({job['frames']} frames)")
+            return job_id
+
+        self.scheduler.submit(job)
+        logger.info(f"Job {job_id} enfileirado ({job['frames']} frames)")
+        return job_id
+
+    def _copy_cached_video(self, job: Dict[str, Any]) -> bool:
+        """Copia o vídeo de um pedido idêntico já concluído para a saída do job"""
+        if self.frame_cache is None:
+            return False
+
+        key = video_cache_key(job, self.scheduler.generator_kwargs["model_id"],
+                              self.scheduler.generator_kwargs.get("quantization"),
+                              expected_backend(self.scheduler.generator_kwargs["use_openvino"]))
+        cached_path = self.frame_cache.get_video(key) if key is not None else None
+        if cached_path is None:
+            return False
+
+        try:
+            shutil.copyfile(cached_path, job["output"])
+        except OSError as e:
+            # Removido pela política LRU entre a busca e a cópia
+            logger.warning(f"Erro ao copiar vídeo do cache: {e}")
+            return False
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait_for_update(self, job_id: str, version: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        Aguarda o job sair da versão informada
+
+        Returns:
+            Cópia do estado do job (com a mesma versão se o timeout expirar)
+            ou None se o job não existir
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: job_id not in self.jobs or self.jobs[job_id]["version"] != version,
+                timeout=timeout
+            )
+            job = self.jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Pede o cancelamento de um job
+
+        Returns:
+            True se o pedido foi enviado, False se o job já terminou
+        """
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] in FINAL_STATUSES:
+                return False
+            job["cancel_requested"] = True
+
+        self.scheduler.cancel(job_id)
+        logger.info(f"Cancelamento do job {job_id} solicitado")
+        return True
+
+    def cleanup_jobs(self, now: Optional[float] = None) -> int:
+        """
+        Remove jobs finalizados expirados ou excedentes e seus arquivos
+
+        Também apaga diretórios de jobs desconhecidos (ex: de uma execução
+        anterior do servidor) mais antigos que job_ttl.
+
+        Returns:
+            Número de diretórios removidos
+        """
+        now = time.time() if now is None else now
+        with self._changed:
+            finished = sorted((job for job in self.jobs.values() if job["status"] in FINAL_STATUSES),
+                              key=lambda job: job.get("finished", job["created"]))
+            excess = max(0, len(finished) - self.max_finished_jobs)
+            expired = [job["job_id"] for position, job in enumerate(finished)
+                       if position < excess or now - job.get("finished", job["created"]) > self.job_ttl]
+            for job_id in expired:
+                del self.jobs[job_id]
+            if expired:
+                # Quem espera num job removido (SSE) recebe None e encerra
+                self._changed.notify_all()
+            known = set(self.jobs)
+
+        removed = set(expired)
+        try:
+            for name in os.listdir(self.jobs_dir):
+                path = os.path.join(self.jobs_dir, name)
+                if name not in known and name not in removed and os.path.isdir(path) \
+                        and now - os.path.getmtime(path) > self.job_ttl:
+                    removed.add(name)
+        except OSError as e:
+            logger.warning(f"Erro ao listar {self.jobs_dir}: {e}")
+
+        for job_id in removed:
+            shutil.rmtree(os.path.join(self.jobs_dir, job_id), ignore_errors=True)
+        if removed:
+            logger.info(f"Removidos {len(removed)} jobs finalizados de {self.jobs_dir}")
+        return len(removed)
+
+    def _consume_messages(self):
+        last_cleanup = 0.0
+        while not self._stop.is_set():
+            if time.time() - last_cleanup >= CLEANUP_INTERVAL_SECONDS:
+                self.cleanup_jobs()
+                last_cleanup = time.time()
+
+            message = self.scheduler.get_message(timeout=0.5)
+            if message is None or "job_id" not in message:
+                continue
+
+            with self._changed:
+                job = self.jobs.get(message["job_id"])
+                if job is None:
+                    continue
+
+                if message["type"] == "started":
+                    job["status"] = "running"
+                    job["started"] = time.time()
+                elif message["type"] == "step":
+                    job["frame"] = message["frame"]
+                    job["step"] = message["step"]
+                    job["steps"] = message["steps"]
+                    job["step_latency"] = message["step_latency"]
+                    job["steps_done"] = message["steps_done"]
+                    job["planned_steps"] = message["planned_steps"]
+                    job["eta"] = message["eta"]
+                elif message["type"] == "frame":
+                    job["frames_done"] = message["frame"]
+                    job["frame_latency"] = message["frame_latency"]
+                    job["steps_done"] = message["steps_done"]
+                    job["planned_steps"] = message["planned_steps"]
+                    job["eta"] = message["eta"]
+                elif message["type"] == "result":
+                    job["status"] = message["status"]
+                    job["error"] = message.get("error")
+                    job["cached"] = message.get("cached", False)
+                    job["finished"] = time.time()
+                    logger.info(f"Job {job['job_id']}: {job['status']}")
+                else:
+                    continue
+
+                job["version"] += 1
+                self._changed.notify_all()
+
+class VideoRequestHandler(BaseHTTPRequestHandler):
+    """Rotas HTTP do servidor de vídeo"""
+
+    server_version = "SDVideoServer/1.0"
+
+    JOB_ROUTE = re.compile(r"^/api/jobs/([0-9a-f]+)(/video|/events|/cancel)?/?$")
+
+    @property
+    def service(self) -> VideoJobService:
+        return self.server.service
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s" % (self.address_string(), format % args))
+
+    def _send_cors_headers(self):
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+
+    def _send_json(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self._send_cors_headers()
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_OPTIONS(self):
+        self.send_response(HTTPStatus.NO_CONTENT)
+        self._send_cors_headers()
+        self.end_headers()
+
+    def do_POST(self):
+        match = self.JOB_ROUTE.match(self.path)
+        if match and match.group(2) == "/cancel":
+            if self.service.get(match.group(1)) is None:
+                self._send_json(HTTPStatus.NOT_FOUND, {"success": False, "error": "Job não encontrado"})
+            elif self.service.cancel(match.group(1)):
+                self._send_json(HTTPStatus.ACCEPTED, {"success": True, "job_id": match.group(1)})
+            else:
+                self._send_json(HTTPStatus.CONFLICT, {"success": False, "error": "Job já finalizado"})
+            return
+
+        # A rota do Netlify é aceita para a interface funcionar sem mudanças de URL
+        if self.path.rstrip("/") not in ("/api/generate-video", "/.netlify/functions/generate-video"):
+            self._send_json(HTTPStatus.NOT_FOUND, {"success": False, "error": "Rota não encontrada"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(HTTPStatus.REQUEST_ENTITY_TOO_LARGE if length > 0 else HTTPStatus.BAD_REQUEST,
+                            {"success": False, "error": "Corpo da requisição ausente ou grande demais"})
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(length))
+            job_id = self.service.submit(payload)
+        except (json.JSONDecodeError, PayloadError) as e:
+            self._send_json(HTTPStatus.BAD_REQUEST, {"success": False, "error": str(e)})
+            return
+
+        job = self.service.get(job_id)
+        self._send_json(HTTPStatus.OK if job["cached"] else HTTPStatus.ACCEPTED, {
+            "success": True,
+            "job_id": job_id,
+            "status": job["status"],
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events",
+            "cancel_url": f"/api/jobs/{job_id}/cancel",
+            "video_url": f"/api/jobs/{job_id}/video"
+        })
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/health":
+            self._send_json(HTTPStatus.OK, {"status": "ok", "workers": self.service.scheduler.num_workers})
+            return
+
+        match = self.JOB_ROUTE.match(self.path)
+        if not match or match.group(2) == "/cancel":
+            self._send_json(HTTPStatus.NOT_FOUND, {"success": False, "error": "Rota não encontrada"})
+            return
+
+        job = self.service.get(match.group(1))
+        if job is None:
+            self._send_json(HTTPStatus.NOT_FOUND, {"success": False, "error": "Job não encontrado"})
+            return
+
+        if match.group(2) == "/video":
+            self._send_video(job)
+        elif match.group(2) == "/events":
+            self._send_events(job)
+        else:
+            job.pop("output", None)
+            self._send_json(HTTPStatus.OK, job)
+
+    def _send_events(self, job: Dict[str, Any]):
+        """
+        Transmite o estado do job por Server-Sent Events até ele terminar
+
+        Cada mudança gera um evento "progress" com o estado completo; eventos
+        mais rápidos que a conexão são agrupados (o cliente sempre recebe o
+        estado mais recente). O último evento se chama como o estado final
+        (done, failed ou cancelled).
+        """
+        self.send_response(HTTPStatus.OK)
+        self._send_cors_headers()
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        job_id = job["job_id"]
+        version = None
+        try:
+            while True:
+                if version is not None:
+                    job = self.service.wait_for_update(job_id, version, timeout=SSE_KEEPALIVE_SECONDS)
+                    if job is None:
+                        return
+                    if job["version"] == version:
+                        self.wfile.write(b": keepalive\n\n")
+                        self.wfile.flush()
+                        continue
+
+                version = job["version"]
+                job.pop("output", None)
+                event = job["status"] if job["status"] in FINAL_STATUSES else "progress"
+                data = json.dumps(job, ensure_ascii=False)
+                self.wfile.write(f"event: {event}\ndata: {data}\n\n".encode("utf-8"))
+                self.wfile.flush()
+
+                if event != "progress":
+                    return
+        except (BrokenPipeError, ConnectionResetError):
+            # Cliente fechou o EventSource
+            return
+
+    def _send_video(self, job: Dict[str, Any]):
+        """Envia o MP4 final em blocos, sem carregá-lo inteiro em memória"""
+        if job["status"] != "done" or not os.path.exists(job["output"]):
+            self._send_json(HTTPStatus.CONFLICT, {"success": False, "error": f"Job em estado '{job['status']}'"})
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self._send_cors_headers()
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(os.path.getsize(job["output"])))
+        self.end_headers()
+
+        with open(job["output"], "rb") as f:
+            shutil.copyfileobj(f, self.wfile, 64 * 1024)
+
+def parse_arguments():
+    """Parse dos argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Servidor HTTP de geração de vídeo com Stable Diffusion")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Endereço de escuta")
+    parser.add_argument("--port", type=int, default=8080, help="Porta de escuta")
+    parser.add_argument("--workers", type=int, default=1, help="Número de processos worker")
+    parser.add_argument("--jobs-dir", type=str, default="server_jobs", help="Diretório de entradas e vídeos dos jobs")
+    parser.add_argument("--job-ttl", type=float, default=JOB_TTL_SECONDS,
+                        help="Segundos que um job finalizado (e seu vídeo) fica disponível")
+    parser.add_argument("--max-finished-jobs", type=int, default=MAX_FINISHED_JOBS,
+                        help="Máximo de jobs finalizados mantidos; os mais antigos são removidos")
+    parser.add_argument("--model", type=str, default=Config.DEFAULT_MODEL, help="ID do modelo Stable Diffusion")
+    parser.add_argument("--no-openvino", action="store_true", help="Desabilitar otimização OpenVINO")
+    parser.add_argument("--threads-per-worker", type=int, default=None,
+                        help="Threads do torch por worker (padrão: núcleos / workers)")
+    parser.add_argument("--interop-threads", type=int, default=Config.INTER_OP_THREADS or 1,
+                        help="Threads inter-op do torch por worker")
+    parser.add_argument("--ov-hint", type=str, choices=["LATENCY", "THROUGHPUT"],
+                        default=Config.OV_PERFORMANCE_HINT, help="PERFORMANCE_HINT do OpenVINO")
+    parser.add_argument("--ov-streams", type=int, default=Config.OV_NUM_STREAMS,
+                        help="Streams de inferência do OpenVINO por worker (padrão: do hint)")
+    parser.add_argument("--cpu-affinity", type=str, default=Config.CPU_AFFINITY,
+                        help="Núcleos divididos entre os workers: 'numa:N' ou lista ('0-15')")
+    parser.add_argument("--frame-cache-dir", type=str, default=Config.FRAME_CACHE_DIR,
+                        help="Cache de frames e vídeos já gerados")
+    parser.add_argument("--no-frame-cache", action="store_true", help="Desativar o cache de frames e vídeos")
+    parser.add_argument("--scheduler", type=str, choices=list(SCHEDULERS.keys()), default=Config.SCHEDULER,
+                        help="Sampler dos jobs (ver schedulers.py)")
+    parser.add_argument("--quantize", type=str, choices=["none", "int8"], default=Config.QUANTIZATION or "none",
+                        help="Quantização INT8 dos pesos da UNet e do text encoder")
+    return parser.parse_args()
+
+def main():
+    """Função principal"""
+    logging.basicConfig(level=logging.INFO, format=Config.LOG_FORMAT)
+    args = parse_arguments()
+
+    frame_cache_dir = None if args.no_frame_cache else args.frame_cache_dir
+    scheduler = JobScheduler(
+        num_workers=args.workers,
+        model_id=args.model,
+        use_openvino=not args.no_openvino,
+        threads_per_worker=args.threads_per_worker,
+        frame_cache_dir=frame_cache_dir,
+        quantization=None if args.quantize == "none" else args.quantize,
+        inter_op_threads=args.interop_threads,
+        ov_performance_hint=args.ov_hint,
+        ov_num_streams=args.ov_streams,
+        cpu_affinity=args.cpu_affinity,
+        scheduler=args.scheduler
+    )
+    # Carregar o modelo antes de aceitar requisições
+    scheduler.start(wait_ready=True)
+
+    frame_cache = FrameCache(frame_cache_dir, Config.FRAME_CACHE_SIZE_MB) if frame_cache_dir else None
+    service = VideoJobService(scheduler, args.jobs_dir, frame_cache=frame_cache,
+                              job_ttl=args.job_ttl, max_finished_jobs=args.max_finished_jobs)
+    service.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), VideoRequestHandler)
+    server.service = service
+    logger.info(f"Servidor ouvindo em http://{args.host}:{args.port}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Interrompido pelo usuário")
+    finally:
+        server.server_close()
+        service.stop()
+        scheduler.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,11 @@
 let selectedVersion = 'version1';
 let selectedFile = null;
 let isGenerating = false;
+let isDemoResult = false;
+let currentJob = null;
+
+// Backend Python (archive/20250916-122437/video_server.py); pode ser sobrescrito com window.SD_API_URL
+const API_BASE_URL = window.SD_API_URL || 'http://localhost:8080';
 
 // DOM Elements
 const dropZone = document.getElementById('dropZone');
@@ -13,6 +18,7 @@ const generateBtn = document.getElementById('generateBtn');
 const progress = document.getElementById('progress');
 const progressFill = document.getElementById('progressFill');
 const progressText = document.getElementById('progressText');
+const cancelBtn = document.getElementById('cancelBtn');
 const results = document.getElementById('results');
 const generatedVideo = document.getElementById('generatedVideo');
 const downloadBtn = document.getElementById('downloadBtn');
@@ -56,14 +62,15 @@ function initializeApp() {
     // Download button
     downloadBtn.addEventListener('click', downloadVideo);
     
+    // Cancel button
+    cancelBtn.addEventListener('click', cancelGeneration);
+    
     updateGenerateButton();
     
     // Show demo notification if running locally
     const isLocal = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
     if (isLocal) {
-        showNotification('🎬 Modo Demo: Interface funcionando localmente. Para funcionalidade completa, faça deploy no Netlify.', 'info');
-        // Update button text for demo mode
-        generateBtn.innerHTML = '<i class="fas fa-video"></i> Gerar Vídeo (Demo)';
+        showNotification('🎬 Interface local: inicie o video_server.py para geração real; sem ele a interface roda em modo demo.', 'info');
     }
 }
 
@@ -167,9 +174,6 @@ async function generateVideo() {
     results.style.display = 'none';
     
     try {
-        // Simulate progress
-        await simulateProgress();
-        
         // Prepare form data
         const formData = new FormData();
         formData.append('image', selectedFile);
@@ -182,12 +186,17 @@ async function generateVideo() {
         const response = await callGenerationAPI(formData);
         
         if (response.success) {
+            isDemoResult = Boolean(response.demo);
             showResults(response.videoUrl);
         } else {
             throw new Error(response.error || 'Erro na geração do vídeo');
         }
         
     } catch (error) {
+        if (error.cancelled) {
+            showNotification('Geração cancelada.', 'info');
+            return;
+        }
         console.error('Erro na geração:', error);
         alert('Erro na geração do vídeo: ' + error.message);
     } finally {
@@ -197,75 +206,217 @@ async function generateVideo() {
     }
 }
 
-async function simulateProgress() {
-    const steps = [
-        { progress: 20, text: 'Carregando imagem...' },
-        { progress: 40, text: 'Inicializando Stable Diffusion...' },
-        { progress: 60, text: 'Gerando frames...' },
-        { progress: 80, text: 'Processando vídeo...' },
-        { progress: 100, text: 'Finalizando...' }
-    ];
-    
-    for (const step of steps) {
-        progressFill.style.width = step.progress + '%';
-        progressText.textContent = step.text;
-        await new Promise(resolve => setTimeout(resolve, 1000));
+async function callGenerationAPI(formData) {
+    const imageBase64 = await fileToBase64(selectedFile);
+    
+    const requestData = {
+        image: imageBase64,
+        version: selectedVersion,
+        frames: parseInt(framesSlider.value),
+        fps: parseInt(fpsSlider.value),
+        quality: qualitySelect.value
+    };
+    
+    let job;
+    try {
+        job = await submitBackendJob(requestData);
+    } catch (error) {
+        if (!error.backendUnavailable) {
+            // Backend no ar recusou o pedido (ex: 400 de validação): mostrar o erro real
+            throw error;
+        }
+        // Backend fora do ar: manter o comportamento de demonstração
+        console.warn('Backend indisponível, usando modo demo:', error);
+        return callDemoAPI(requestData);
     }
+    
+    return waitForBackendJob(job);
 }
 
-async function callGenerationAPI(formData) {
+function backendUnavailableError(message) {
+    const error = new Error(message);
+    error.backendUnavailable = true;
+    return error;
+}
+
+async function submitBackendJob(requestData) {
+    let response;
     try {
-        // Check if we're running locally (no Netlify functions)
-        const isLocal = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
-        
-        if (isLocal) {
-            // Local demo mode - simulate API call
-            console.log('Running in local demo mode');
-            await new Promise(resolve => setTimeout(resolve, 2000)); // Simulate processing
-            
-            return {
-                success: true,
-                videoUrl: 'https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/BigBuckBunny.mp4' // Demo video
-            };
-        }
-        
-        // Production mode - call Netlify function
-        const imageBase64 = await fileToBase64(selectedFile);
-        
-        const requestData = {
-            image: imageBase64,
-            version: selectedVersion,
-            frames: parseInt(framesSlider.value),
-            fps: parseInt(fpsSlider.value),
-            quality: qualitySelect.value
-        };
-        
-        const response = await fetch('/.netlify/functions/generate-video', {
+        response = await fetch(`${API_BASE_URL}/api/generate-video`, {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
             },
             body: JSON.stringify(requestData)
         });
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
+    } catch (error) {
+        // fetch só rejeita (TypeError) em falha de rede ou conexão recusada
+        throw backendUnavailableError(error.message);
+    }
+    
+    // Sem rota da API (ex: servidor só de arquivos estáticos)
+    if (response.status === 404 || response.status === 405) {
+        throw backendUnavailableError(`HTTP error! status: ${response.status}`);
+    }
+    
+    let result;
+    try {
+        result = await response.json();
+    } catch (error) {
+        if (response.ok) {
+            throw backendUnavailableError('Resposta do backend não é JSON');
         }
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    if (!response.ok || !result.success) {
+        throw new Error(result.error || `HTTP error! status: ${response.status}`);
+    }
+    
+    return result;
+}
+
+function waitForBackendJob(job) {
+    progressText.textContent = 'Na fila...';
+    currentJob = job;
+    cancelBtn.style.display = 'block';
+    cancelBtn.disabled = false;
+    
+    // Progresso real do servidor (passos de difusão e frames) via Server-Sent Events
+    return new Promise((resolve, reject) => {
+        const events = new EventSource(`${API_BASE_URL}${job.events_url}`);
         
-        const result = await response.json();
+        const finish = () => {
+            events.close();
+            currentJob = null;
+            cancelBtn.style.display = 'none';
+        };
         
-        if (!result.success) {
-            throw new Error(result.error || 'Erro na geração do vídeo');
-        }
+        events.addEventListener('progress', (e) => {
+            updateProgress(JSON.parse(e.data));
+        });
         
-        return result;
+        events.addEventListener('done', () => {
+            finish();
+            progressFill.style.width = '100%';
+            progressText.textContent = 'Finalizando...';
+            resolve({
+                success: true,
+                videoUrl: `${API_BASE_URL}${job.video_url}`
+            });
+        });
         
+        events.addEventListener('failed', (e) => {
+            finish();
+            reject(new Error(JSON.parse(e.data).error || 'Erro na geração do vídeo'));
+        });
+        
+        events.addEventListener('cancelled', () => {
+            finish();
+            const error = new Error('Geração cancelada');
+            error.cancelled = true;
+            reject(error);
+        });
+        
+        events.onerror = () => {
+            // EventSource reconecta sozinho; só desistir se o servidor fechou de vez
+            if (events.readyState === EventSource.CLOSED) {
+                finish();
+                reject(new Error('Conexão com o servidor perdida'));
+            }
+        };
+    });
+}
+
+function updateProgress(status) {
+    if (status.status === 'queued') {
+        progressText.textContent = 'Na fila...';
+        return;
+    }
+    
+    // Frames entregues + fração do keyframe em difusão
+    let done = status.frames_done;
+    if (status.step && status.steps) {
+        done = Math.max(done, status.frame + status.step / status.steps);
+    }
+    const percent = Math.min(100, Math.round(100 * done / status.frames));
+    progressFill.style.width = percent + '%';
+    
+    let text = `Gerando frames... ${status.frames_done}/${status.frames}`;
+    if (status.step && status.steps) {
+        text += ` (passo ${status.step}/${status.steps}`;
+        if (status.step_latency) {
+            text += `, ${status.step_latency.toFixed(2)}s/passo`;
+        }
+        text += ')';
+    }
+    if (status.eta !== null && status.eta !== undefined) {
+        text += ` - restam ~${formatSeconds(status.eta)}`;
+    }
+    progressText.textContent = text;
+}
+
+function formatSeconds(seconds) {
+    seconds = Math.round(seconds);
+    if (seconds < 60) return `${seconds}s`;
+    return `${Math.floor(seconds / 60)}min ${seconds % 60}s`;
+}
+
+async function cancelGeneration() {
+    if (!currentJob) return;
+    
+    cancelBtn.disabled = true;
+    progressText.textContent = 'Cancelando...';
+    
+    try {
+        await fetch(`${API_BASE_URL}${currentJob.cancel_url}`, { method: 'POST' });
     } catch (error) {
-        console.error('API Error:', error);
-        throw error;
+        console.error('Erro ao cancelar:', error);
+        cancelBtn.disabled = false;
     }
 }
 
+async function callDemoAPI(requestData) {
+    progressFill.style.width = '100%';
+    progressText.textContent = 'Servidor de geração indisponível, usando modo demonstração...';
+    
+    // Check if we're running locally (no Netlify functions)
+    const isLocal = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
+    
+    if (isLocal) {
+        // Local demo mode - simulate API call
+        console.log('Running in local demo mode');
+        await new Promise(resolve => setTimeout(resolve, 2000)); // Simulate processing
+        
+        return {
+            success: true,
+            demo: true,
+            videoUrl: 'https://commondatastorage.googleapis.com/gtv-videos-bucket/sample/BigBuckBunny.mp4' // Demo video
+        };
+    }
+    
+    // Production mode - call Netlify function
+    const response = await fetch('/.netlify/functions/generate-video', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(requestData)
+    });
+    
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    
+    const result = await response.json();
+    
+    if (!result.success) {
+        throw new Error(result.error || 'Erro na geração do vídeo');
+    }
+    
+    return result;
+}
+
 function fileToBase64(file) {
     return new Promise((resolve, reject) => {
         const reader = new FileReader();
@@ -278,7 +429,7 @@ function fileToBase64(file) {
 function showResults(videoUrl) {
     const isLocal = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
     
-    if (isLocal) {
+    if (isLocal && isDemoResult) {
         // Demo mode - show demo content
         results.innerHTML = `
             <h3>Vídeo Gerado (Demo):</h3>
@@ -436,7 +587,7 @@ function showResults(videoUrl) {
 function downloadVideo() {
     const isLocal = window.location.hostname === 'localhost' || window.location.hostname === '127.0.0.1';
     
-    if (isLocal) {
+    if (isLocal && isDemoResult) {
         showNotification('🎬 Modo Demo: Em produção, aqui seria baixado o vídeo gerado pelo Stable Diffusion!', 'info');
         return;
     }